@@ -10,5 +10,10 @@ from .addressScraper import (
     get_street_prefix,
     get_street_suffix,
     is_complete,
-    formalize_address
-)
\ No newline at end of file
+    formalize_address,
+    address_fingerprint,
+    token_cache_info,
+    clear_token_cache,
+    warning_categories
+)
+from .batch import parse_addresses, parse_addresses_columnar
@@ -1,16 +1,271 @@
+import hashlib
 import re
+import threading
+from types import MappingProxyType
 from .street_suffix_mapping import street_suffix_mapping, formal_street_suffix_mapping
 
-def parse_address(address, warningsEnabled=False):
-    if not isinstance(address, str) or not address.strip():
-        return None
+# Thread safety: every table and pattern the parser reads is built once at
+# import time and never mutated afterwards, and parse_address keeps all of its
+# working state in locals. The one shared mutable structure is the token
+# classification cache, which only ever gains entries (immutable tuples) via
+# single dict stores, safe on both GIL and free-threaded builds. The suffix
+# tables are snapshotted here, so changes made to the public dicts after
+# import are not seen by the parser.
+_street_suffix_table = MappingProxyType(dict(street_suffix_mapping))
+_formal_street_suffix_table = MappingProxyType(dict(formal_street_suffix_mapping))
+_street_types = frozenset(_street_suffix_table.keys()) | frozenset(_street_suffix_table.values())
+
+_directionals = frozenset({'N', 'S', 'E', 'W', 'NE', 'NW', 'SE', 'SW', 'NORTH', 'SOUTH', 'EAST', 'WEST', 'NORTHEAST', 'NORTHWEST', 'SOUTHEAST', 'SOUTHWEST'})
+# Highway designators and the road types (as USPS abbreviations) that follow them to
+# form a multi-word street type, e.g. STATE RD, US HWY. Any variant of the road type
+# in street_suffix_mapping matches: STATE ROAD 7 -> STATE RD 7.
+_highway_designators = MappingProxyType({
+    'STATE': ('RD', 'HWY', 'RTE'),
+    'COUNTY': ('RD', 'HWY', 'RTE'),
+    'US': ('HWY', 'RTE'),
+})
+_street_type_phrases = frozenset(
+    f'{designator} {road_type}' for designator, road_types in _highway_designators.items() for road_type in road_types
+)
+# Street types followed by a route number (e.g. "240 HWY 441")
+_multi_word_street_types = frozenset({'HWY', 'RTE'}) | _street_type_phrases
+
+_unit_identifiers = ('APARTMENT', 'APT', 'BASEMENT', 'BSMT', 'BUILDING', 'BLDG', 'DEPARTMENT', 'DEPT',
+                     'FLOOR', 'FL', 'HANGER', 'HNGR', 'KEY', 'LOBBY', 'LBBY', 'LOT', 'OFFICE', 'OFC', 'PENTHOUSE', 'PH',
+                     'PIER', 'ROOM', 'RM', 'SUITE', 'STE', 'TRAILER', 'TRLR', 'UNIT', 'SPACE', 'SPC')
+
+# '#' stands in for a unit designator (USPS: '# 4' when the designator is unknown)
+_HASH = '#'
+# Unit designator (every one of _unit_identifiers, and '#') -> USPS abbreviation
+_unit_designators = MappingProxyType({
+    'APARTMENT': 'APT', 'APT': 'APT', 'BASEMENT': 'BSMT', 'BSMT': 'BSMT', 'BUILDING': 'BLDG', 'BLDG': 'BLDG',
+    'DEPARTMENT': 'DEPT', 'DEPT': 'DEPT', 'FLOOR': 'FL', 'FL': 'FL', 'HANGER': 'HNGR', 'HNGR': 'HNGR', 'KEY': 'KEY',
+    'LOBBY': 'LBBY', 'LBBY': 'LBBY', 'LOT': 'LOT', 'OFFICE': 'OFC', 'OFC': 'OFC', 'PENTHOUSE': 'PH', 'PH': 'PH',
+    'PIER': 'PIER', 'ROOM': 'RM', 'RM': 'RM', 'SUITE': 'STE', 'STE': 'STE', 'TRAILER': 'TRLR', 'TRLR': 'TRLR',
+    'UNIT': 'UNIT', 'SPACE': 'SPC', 'SPC': 'SPC', _HASH: _HASH,
+})
+
+_non_word_re = re.compile(r'[^\w\s/#-]')
+# Deletes the same characters as _non_word_re from ASCII text, for str.translate. Deletions
+# only: a multi-character replacement (such as spacing out '#') drops translate off its fast path
+_ascii_non_word_table = {code: None for code in range(128) if _non_word_re.match(chr(code))}
+# Joins a batch for preprocessing; batches whose addresses contain it are preprocessed one by one
+_BATCH_SEPARATOR = '\n'
+_street_number_re = re.compile(r'^(?:\d+(-[A-Z\d]+)?|\d+[A-Z]?|\d+/\d+)$')
+_fraction_re = re.compile(r'^\d+/\d+$')
+_digits_re = re.compile(r'^\d+$')
+# A word that can be the unit number after a '#': one letter, or any word with a digit
+_unit_number_word_re = re.compile(r'^(?:[A-Z]|[A-Z\d/-]*\d[A-Z\d/-]*)$')
+# '\d[A-Z\d\-]*' rather than '\d+[A-Z\d\-]*': same matches, but no quadratic
+# backtracking over long digit runs
+_duplicate_unit_re = re.compile(
+    r'(\b(?:APT|UNIT|STE|SUITE|#)\s*\d[A-Z\d\-]*)\s+'
+    r'(APT|UNIT|STE|SUITE|#)\s*'
+    r'(\d[A-Z\d\-]*)'
+)
+_alphanumeric_re = re.compile(r'[A-Z0-9]')
+# Per-identifier lookaround patterns for _check_for_edge_cases, compiled once
+# instead of being assembled from the matched text on every call. Only whether
+# they match is used, so the 'number before' test looks for a single digit:
+# '\d+' would rescan a long digit run from every starting position.
+def _unit_number_patterns(identifiers):
+    pre = MappingProxyType({
+        identifier: re.compile(r'\d\s*(?=' + re.escape(identifier) + ')') for identifier in identifiers
+    })
+    post = MappingProxyType({
+        identifier: re.compile(r'(?<=' + re.escape(identifier) + r')\s*\d+[A-Z]?') for identifier in identifiers
+    })
+    return pre, post
+
+_pre_unit_number_res, _post_unit_number_res = _unit_number_patterns(_unit_designators)
+
+def _designator_trie(words):
+    """
+    Regex alternation for a set of words laid out as a trie of their letters, so the
+    regex engine follows at most one branch per character instead of trying every
+    word at every position.
+
+    Ex: _designator_trie(['APT', 'APARTMENT', 'FL', 'FLOOR']) -> '(?:AP(?:ARTMENT|T)|FL(?:OOR)?)'
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for character in word:
+            node = node.setdefault(character, {})
+        node[''] = None
+
+    def alternation(node):
+        branches = [re.escape(character) + alternation(child) for character, child in sorted(node.items()) if character]
+        if not branches:
+            return ''
+        optional = '' in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')' + ('?' if optional else '')
+
+    return alternation(trie)
+
+def _unit_patterns(designators):
+    """
+    Compile the unit designators into the designator regex and the unit regex: a
+    designator, then its number past any '#'. The lookarounds match whole words
+    as word boundaries would, and also '#', which preprocessing spaces out.
+    """
+    designator = r'(?<!\w)(' + _designator_trie(designators) + r')(?!\w)'
+    return re.compile(designator), re.compile(designator + r'\s*(?:(#)\s*)?([A-Z\d\-]+)')
+
+_unit_identifier_re, _unit_re = _unit_patterns(_unit_designators)
+
+# Keys of a parse_address result, in order
+RESULT_FIELDS = (
+    'streetNumber',
+    'streetDirectionPrefix',
+    'streetName',
+    'streetType',
+    'streetDirectionSuffix',
+    'unitNumber',
+    'unitNumberStripped',
+    'street',
+    'address',
+    'addressUnit',
+    'isComplete',
+)
+
+# Longer inputs are not parsed at all. Real addresses are well under 200
+# characters; the cap bounds the cost of a single pasted blob no matter which
+# string operations the Python version implements in what time.
+MAX_ADDRESS_LENGTH = 1000
+
+# Categories of the warnings parse_address prints (see warning_categories)
+WARNING_ADDRESS_TOO_LONG = 'addressTooLong'
+WARNING_NO_STREET_TYPE = 'noStreetType'
+WARNING_NO_STREET_NUMBER = 'noStreetNumber'
+WARNING_DUPLICATE_UNIT = 'duplicateUnit'
+WARNING_MISSING_UNIT_NUMBER = 'missingUnitNumber'
+WARNING_NUMBER_AROUND_UNIT = 'numberBeforeAndAfterUnit'
+WARNING_CATEGORIES = (
+    WARNING_ADDRESS_TOO_LONG,
+    WARNING_NO_STREET_TYPE,
+    WARNING_NO_STREET_NUMBER,
+    WARNING_DUPLICATE_UNIT,
+    WARNING_MISSING_UNIT_NUMBER,
+    WARNING_NUMBER_AROUND_UNIT,
+)
+
+_warning_lock = threading.Lock()
+
+def _warn(message):
+    """
+    Print a warning as a single uninterleaved line, even when several threads warn at once.
+    """
+    with _warning_lock:
+        print(message, flush=True)
 
-    # Preprocess the address
+def _replace_ampersands(address):
+    r"""
+    Replace each '&' and the whitespace around it with ' AND '.
+
+    Same result as re.sub(r'\s*&\s*', ' AND ', address), but linear: the regex
+    rescans a long whitespace run from every position in it.
+    """
+    if '&' not in address:
+        return address
+    parts = address.split('&')
+    last = len(parts) - 1
+    return ' AND '.join(
+        part.rstrip() if i == 0 else part.lstrip() if i == last else part.strip()
+        for i, part in enumerate(parts)
+    )
+
+def _preprocess(address):
+    """
+    Uppercase, trim, spell out '&', space out '#' and drop punctuation other than '/' and '-'.
+    """
     address = address.upper().strip()
-    address = re.sub(r'\s*&\s*', ' AND ', address)
-    address = re.sub(r'[^\w\s/-]', '', address)
+    address = _replace_ampersands(address)
+    if _HASH in address:
+        return _non_word_re.sub('', address.replace(_HASH, f' {_HASH} ')).strip()
+    return _non_word_re.sub('', address)
+
+def preprocess_addresses(addresses):
+    """
+    Preprocess a batch of addresses the way parse_address does, in one pass.
+
+    Addresses that are ASCII without '&' or embedded newlines (nearly all) are
+    joined into one buffer that is uppercased and cleaned with a single
+    str.translate, then split again. The others are preprocessed one by one.
+
+    Returns:
+        list: The preprocessed string for each address, or None where parse_address
+        returns None before preprocessing (non-strings, blanks, oversize input).
+    """
+    prepared = [None] * len(addresses)
+    indexes = []
+    stripped = []
+    for i, address in enumerate(addresses):
+        if isinstance(address, str) and len(address) <= MAX_ADDRESS_LENGTH:
+            address = address.strip()
+            if not address:
+                continue
+            if address.isascii() and '&' not in address and _BATCH_SEPARATOR not in address:
+                indexes.append(i)
+                stripped.append(address)
+            else:
+                prepared[i] = _preprocess(address)
+    if not stripped:
+        return prepared
+
+    joined = _BATCH_SEPARATOR.join(stripped)
+    cleaned = joined.upper().translate(_ascii_non_word_table)
+    if _HASH in joined:
+        parts = cleaned.replace(_HASH, f' {_HASH} ').split(_BATCH_SEPARATOR)
+        parts = [part.strip() if _HASH in part else part for part in parts]
+    else:
+        parts = cleaned.split(_BATCH_SEPARATOR)
+    for i, part in zip(indexes, parts):
+        prepared[i] = part
+    return prepared
+
+def parse_addresses_preprocessed(addresses, warningsEnabled=False, fingerprintBits=None, config=None):
+    """
+    parse_address over a list of addresses, with preprocessing done once for the batch
+    (see preprocess_addresses). Results are identical to calling parse_address on each.
+    """
+    tables = config if config is not None else _base_tables
+    return [
+        _parse_preprocessed(prepared, warningsEnabled, fingerprintBits, tables) if prepared is not None
+        else parse_address(address, warningsEnabled, fingerprintBits)
+        for address, prepared in zip(addresses, preprocess_addresses(addresses))
+    ]
+
+def parse_address(address, warningsEnabled=False, fingerprintBits=None, config=None):
+    """
+    Parse an address into its components (see RESULT_FIELDS).
+
+    With fingerprintBits=64 or 128 the result also carries the integer
+    fingerprints listed in FINGERPRINT_FIELDS (see address_fingerprint).
+    `config` is a ParserConfig from addressScraper.config; the default uses
+    the base tables.
+
+    Ex: 1234 Main Street, Unit 5 -> {'streetNumber': '1234', 'streetName': 'MAIN', 'streetType': 'ST', ...}
+    """
+    if not isinstance(address, str):
+        return None
+    if len(address) > MAX_ADDRESS_LENGTH:
+        if warningsEnabled: _warn(f"AddressScraper Warning: Skipped an address of {len(address)} characters (limit {MAX_ADDRESS_LENGTH}) starting '{address[:40]}'.")
+        return None
+    if not address.strip():
+        return None
+    return _parse_preprocessed(_preprocess(address), warningsEnabled, fingerprintBits,
+                               config if config is not None else _base_tables)
+
+def _parse_preprocessed(address, warningsEnabled, fingerprintBits, tables):
+    """
+    Parse an address that has already been through _preprocess, reading the given _ParserTables.
+    """
     original_address = address
     words = address.split()
+    tokens = tables.classify_tokens(words)
 
     street_number = None
     street_number_pos = None
@@ -19,44 +274,69 @@ def parse_address(address, warningsEnabled=False):
     street_direction_prefix = None
     street_direction_suffix = None
 
-    # List of directionals
-    directionals = {'N', 'S', 'E', 'W', 'NE', 'NW', 'SE', 'SW', 'NORTH', 'SOUTH', 'EAST', 'WEST', 'NORTHEAST', 'NORTHWEST', 'SOUTHEAST', 'SOUTHWEST'}
-
-    # Step 1: Locate the street type from the right
-    street_types = set(street_suffix_mapping.keys()).union(set(street_suffix_mapping.values()))
-    i = len(words) - 1
-    while i >= 0:
-        word = words[i]
-        if word in street_types:
-            street_type = street_suffix_mapping.get(word, word)
-            street_type_pos = i
-            # Step 1a: Check for street direction suffix
-            if i + 1 < len(words) and words[i + 1] in directionals:
-                street_direction_suffix = words[i + 1]
-                i += 1  # Include the directional suffix in the street type position
-            break
-        i -= 1
+    # Step 1: With a street gazetteer, find the longest known street after the street number
+    known_street = _match_known_street(tables.gazetteer, words, tokens) if tables.gazetteer is not None else None
+    if known_street:
+        street_start, street_end, skipped_prefix = known_street
+        street_type_pos = street_end - 1
+        flags, canonical = tokens[street_type_pos]
+        if flags & _TOKEN_STREET_TYPE and street_type_pos > street_start:
+            street_type = canonical
+            street_type_start = street_type_pos
+        else:
+            # A known street without a street type (e.g., "BROADWAY", "AVENUE OF THE AMERICAS")
+            street_type_start = street_end
+        if street_end < len(words) and tokens[street_end][0] & _TOKEN_DIRECTIONAL:
+            street_direction_suffix = words[street_end]
+    else:
+        # Otherwise locate the street type from the right
+        i = len(words) - 1
+        while i >= 0:
+            flags, canonical = tokens[i]
+            if flags & _TOKEN_STREET_TYPE:
+                street_type = canonical
+                street_type_pos = i
+                street_type_start = i
+                # Extend it to the longest multi-word street type ending here (e.g. "STATE RD"), which
+                # is only a route when a route number follows; "COUNTY RD" alone is a name and a type
+                if i + 1 < len(words) and tokens[i + 1][0] & _TOKEN_DIGITS:
+                    phrase = _match_phrase(tables.street_type_phrases, tokens, i)
+                    if phrase:
+                        street_type_start, street_type = phrase
+                # Step 1a: Check for street direction suffix
+                if i + 1 < len(words) and tokens[i + 1][0] & _TOKEN_DIRECTIONAL:
+                    street_direction_suffix = words[i + 1]
+                    i += 1  # Include the directional suffix in the street type position
+                break
+            i -= 1
+
+    # A '#' that starts no unit (123 #MAIN ST, 123 MAIN # ST) is dropped, as every other punctuation mark is
+    if _HASH in words:
+        stray = _stray_hashes(words, tokens, street_type_start if street_type_pos is not None else None)
+        if stray:
+            kept = ' '.join(word for i, word in enumerate(words) if i not in stray)
+            return _parse_preprocessed(kept, warningsEnabled, fingerprintBits, tables)
 
     if street_type_pos is None:
-        # No street type found; assume the last word is the street type
-        if warningsEnabled: print(f"AddressScraper Warning: No standard street type found in '{address}', please review this address.")
-        street_type_pos = len(words) - 1
+        if warningsEnabled: _warn(f"AddressScraper Warning: No standard street type found in '{address}', please review this address.")
+        street_type_pos, street_type_start = _assumed_street_type(words, tables)
 
     # Step 2: Locate the street number from the right, starting at the street type's position
-    i = street_type_pos - 1
+    i = (street_start if known_street else street_type_start) - 1
     while i >= 0:
-        word = words[i]
         # Match the street number pattern (e.g., '123', '123-4', '123-4A', '123A', '123/125', but not '5TH', '1ST', '3RD', etc.)
-        if re.match(r'^\d+(-[A-Z\d]+)?$', word) or re.match(r'^\d+[A-Z]?$', word) or re.match(r'^\d+/\d+$', word):
-            street_number = word
+        if tokens[i][0] & _TOKEN_STREET_NUMBER:
+            street_number = words[i]
             street_number_pos = i
             # Handle fractional street numbers, adding the next word if it's a fraction
-            if i + 1 < len(words) and re.match(r'^\d+/\d+$', words[i + 1]):
+            if i + 1 < len(words) and tokens[i + 1][0] & _TOKEN_FRACTION:
                 street_number += ' ' + words[i + 1]
                 i += 1
                 # Pop the fraction from the list of words, and update the rest of the words positions
                 words.pop(i)
+                tokens.pop(i)
                 street_type_pos -= 1
+                street_type_start -= 1
                 if street_direction_suffix:
                     street_type_pos -= 1
                 
@@ -65,34 +345,42 @@ def parse_address(address, warningsEnabled=False):
 
     if street_number_pos is None:
         # No street number found, set its position to the beginning of the address
-        if warningsEnabled: print(f"AddressScraper Warning: No street number found in '{address}', please review this address.")
+        if warningsEnabled: _warn(f"AddressScraper Warning: No street number found in '{address}', please review this address.")
         street_number_pos = -1
 
     # Step 3: Check for the presence of a directional prefix directly after the street number
-    if street_number_pos + 1 < len(words) and words[street_number_pos + 1] in directionals:
-        if street_number_pos + 2 < len(words) and words[street_number_pos + 2] in street_types:
+    if known_street:
+        # A directional is a prefix only if it is not part of the known street (WEST END AVE)
+        if skipped_prefix:
+            street_direction_prefix = tokens[street_number_pos + 1][1]
+    elif street_number_pos + 1 < len(words) and tokens[street_number_pos + 1][0] & _TOKEN_DIRECTIONAL:
+        if street_number_pos + 2 < len(words) and tokens[street_number_pos + 2][0] & _TOKEN_STREET_TYPE:
             street_direction_prefix = None
         else:
-            street_direction_prefix = words[street_number_pos + 1]
-            if street_direction_prefix in _formal_direction_mapping.values():
-                # Convert the formal direction to the USPS standard abbreviation
-                street_direction_prefix = _standardize_directions(street_direction_prefix, _direction_mapping)
+            # The USPS standard abbreviation of the direction
+            street_direction_prefix = tokens[street_number_pos + 1][1]
 
     # Extract street name between street number and street type, excluding directional suffix
     name_start = street_number_pos
     if street_direction_prefix:
         name_start += 1
-    name_end = street_type_pos
+    name_end = street_type_start
     street_name_words = words[name_start + 1:name_end]
+    if tables.canonical_names and not _name_phrase_starts.isdisjoint(street_name_words):
+        street_name_words = _canonical_name_words(street_name_words, street_type is not None)
     street_name = ' '.join(street_name_words)
 
     # Handle multi-word street types (e.g., "240 HWY 441")
-    multi_word_street_types = {'HWY', 'STATE RD', 'COUNTY RD', 'RTE', 'US HWY', 'US RTE'}
-    if street_type in multi_word_street_types:
+    route_number = False
+    if street_type in tables.multi_word_street_types:
         # Include the next word if it's a number
-        if street_type_pos + 1 < len(words) and re.match(r'^\d+$', words[street_type_pos + 1]):
+        if street_type_pos + 1 < len(words) and tokens[street_type_pos + 1][0] & _TOKEN_DIGITS:
             street_type += ' ' + words[street_type_pos + 1]
             street_type_pos += 1
+            route_number = True
+            # A directional suffix follows the route number (e.g., "US HWY 19 N")
+            if not street_direction_suffix and street_type_pos + 1 < len(words) and tokens[street_type_pos + 1][0] & _TOKEN_DIRECTIONAL:
+                street_direction_suffix = words[street_type_pos + 1]
             address_no_unit_words = words[street_number_pos:street_type_pos + 1]
             address_no_unit = ' '.join(address_no_unit_words)
 
@@ -107,22 +395,14 @@ def parse_address(address, warningsEnabled=False):
     remaining_address = original_address.replace(address_no_unit, '', 1).strip()
     unit_info = remaining_address if remaining_address else None
 
-    # Extract unit identifier and number from unit_info
+    # Step 6: Find the unit designator and number in unit_info, and unitNumberStripped without the designator
+    unit_number_stripped = None
     if unit_info:
-        unit_identifiers = r'\b(APARTMENT|APT|BASEMENT|BSMT|BUILDING|BLDG|DEPARTMENT|DEPT|' \
-                           r'FLOOR|FL|HANGER|HNGR|KEY|LOBBY|LBBY|LOT|OFFICE|OFC|PENTHOUSE|PH|' \
-                           r'PIER|ROOM|RM|SUITE|STE|TRAILER|TRLR|UNIT|SPACE|SPC)\b'
-        match = re.search(unit_identifiers + r'\s*[A-Z\d\-]+', unit_info)
-        if match:
-            unit_info = match.group()
-        else:
-            unit_info = unit_info.strip()
-
-    # Step 6: Create unitNumberStripped field, removing unit identifier from unit_info
-    if unit_info:
-        unit_number_stripped = re.sub(unit_identifiers, '', unit_info).strip()
-    else:
-        unit_number_stripped = None
+        unit_info, unit_number_stripped, designator, unit_number = _find_unit(unit_info, tables)
+        if designator is not None and tables.canonical_units:
+            unit_info = f"{designator} {unit_number.lstrip('-') or unit_number}"
+        if not unit_info:
+            unit_info = unit_number_stripped = None
 
     # Step 7: Reconstruct the address
     reconstructed_address_parts = [
@@ -139,7 +419,7 @@ def parse_address(address, warningsEnabled=False):
 
     # Check for formatting issues related to unit identifiers
     if warningsEnabled:
-        _check_for_edge_cases(address, reconstructed_address)
+        _check_for_edge_cases(address, reconstructed_address, tables)
 
     # Step 8: Reconstruction of the address without the unit number
     if unit_info:
@@ -152,6 +432,12 @@ def parse_address(address, warningsEnabled=False):
         street = f"{street_name} {street_type}".strip()
         if street_direction_prefix:
             street = f"{street_direction_prefix} {street}".strip()
+    elif route_number:
+        # A numbered route needs no street name (e.g., "STATE RD 7")
+        street = f"{street_direction_prefix} {street_type}" if street_direction_prefix else street_type
+    elif known_street and street_name:
+        # A known street needs no street type (e.g., "N BROADWAY")
+        street = f"{street_direction_prefix} {street_name}" if street_direction_prefix else street_name
     else:
         street = None
 
@@ -170,32 +456,166 @@ def parse_address(address, warningsEnabled=False):
         'isComplete': all([street_number is not None, street_name is not None, reconstructed_address is not None or address_no_unit, street is not None])
     }
 
+    if fingerprintBits:
+        _add_fingerprints(parsed_address, fingerprintBits)
+
     return parsed_address
 
-def _check_for_edge_cases(address, normalized):
+def _match_known_street(gazetteer, words, tokens):
     """
-    Check for formatting issues related to unit identifiers, such as:
-    - Duplicate unit identifiers in the address.
-    - Unit identifier appearing before the street number and name in the normalized result.
-    - Unit identifier having both a number before and after it, indicating incorrect ordering.
+    Find the longest street in a gazetteer (see addressScraper.gazetteer) that starts
+    right after a street number, trying the rightmost number first and then the start
+    of the address. A directional there is skipped when the street is only known
+    without it.
+
+    Returns:
+        tuple: (position of the street's first word, position after its last word,
+        whether a directional prefix was skipped), or None.
+
+    Ex: _match_known_street(gazetteer, ['601', 'N', 'BROADWAY', 'FL', '15'], tokens) -> (2, 3, True)
     """
+    keys = [canonical if flags & _TOKEN_STREET_TYPE else word for word, (flags, canonical) in zip(words, tokens)]
+    starts = [i + 1 for i in range(len(words) - 2, -1, -1) if tokens[i][0] & _TOKEN_STREET_NUMBER]
+    starts.append(0)
+    for start in starts:
+        end = gazetteer.longest_match(keys, start)
+        if end is not None:
+            return start, end, False
+        if tokens[start][0] & _TOKEN_DIRECTIONAL and start + 1 < len(words):
+            end = gazetteer.longest_match(keys, start + 1)
+            if end is not None:
+                return start + 1, end, True
+    return None
+
+def _assumed_street_type(words, tables):
+    """
+    Where an address without a known street type is taken to end: before a '#' unit
+    (and a designator just before it), which is left to Step 6, or else at the last
+    word, which is assumed to be the street type.
 
-    # Ensure the address is in uppercase for consistency
-    normalized = normalized.upper()
+    Returns:
+        tuple: (street type position, position the street name ends at)
 
-    # Define unit identifiers
-    unit_identifiers = r'\b(APARTMENT|APT|BASEMENT|BSMT|BUILDING|BLDG|DEPARTMENT|DEPT|' \
-                           r'FLOOR|FL|HANGER|HNGR|KEY|LOBBY|LBBY|LOT|OFFICE|OFC|PENTHOUSE|PH|' \
-                           r'PIER|ROOM|RM|SUITE|STE|TRAILER|TRLR|UNIT|SPACE|SPC)\b'
+    Ex: _assumed_street_type(['123', 'BROADWAY', '#', '5'], _base_tables) -> (1, 2)
+    """
+    unit_start = _hash_unit_start(words, tables) if _HASH in words else None
+    if unit_start is not None:
+        return unit_start - 1, unit_start
+    return len(words) - 1, len(words) - 1
 
-    duplicate_unit_pattern = (
-        r'(\b(?:APT|UNIT|STE|SUITE|#)\s*\d+[A-Z\d\-]*)\s+'
-        r'(APT|UNIT|STE|SUITE|#)\s*'
-        r'(\d+[A-Z\d\-]*)'
-    )
+def _stray_hashes(words, tokens, street_end):
+    """
+    Positions of the '#' words that start no unit. A '#' starts a unit when a unit
+    number follows it and it comes after the street (from street_end, the start of
+    the street type; None when there is none), or when it opens the address ahead
+    of the street number (# 5 123 MAIN ST).
+
+    Ex: _stray_hashes(['123', '#', 'MAIN', 'ST', '#', '4'], tokens, 3) -> [1]
+    """
+    stray = []
+    for i, word in enumerate(words):
+        if word != _HASH:
+            continue
+        if i + 1 < len(words) and _unit_number_word_re.match(words[i + 1]):
+            if i == 0:
+                if len(words) > 2 and tokens[2][0] & _TOKEN_STREET_NUMBER and (street_end is None or street_end > 2):
+                    continue
+            elif street_end is None or i >= street_end:
+                continue
+        stray.append(i)
+    return stray
+
+def _hash_unit_start(words, tables):
+    """
+    Position of the unit that a '#' starts in an address without a street type:
+    the first '#' after the first word that a unit number follows, or the unit
+    designator right before it (SUITE # 100). None when there is no such '#', or
+    the address starts with its unit.
+
+    Ex: _hash_unit_start(['123', 'BROADWAY', '#', '5'], _base_tables) -> 2
+    """
+    for start in range(1, len(words) - 1):
+        if words[start] == _HASH and _unit_number_word_re.match(words[start + 1]):
+            if words[start - 1] in tables.unit_designators:
+                start -= 1
+            return start or None
+    return None
+
+def _canonical_name_words(words, typed=False):
+    """
+    Replace the number words, ordinals, SAINT and MOUNT in a street name with their
+    canonical forms, longest phrase first. A number that is the whole name of a
+    street with a street type is the ordinal that streets are numbered with, so
+    FIVE AVE and FIFTH AVE both become 5TH AVE.
+
+    Ex: _canonical_name_words(['ONE', 'HUNDRED', 'TWENTY', 'FIRST']) -> ['121ST']
+    """
+    canonical = []
+    i = 0
+    while i < len(words):
+        if words[i] in _name_phrase_starts:
+            for length in range(min(_NAME_PHRASE_MAX_WORDS, len(words) - i), 0, -1):
+                replacement = _name_phrases.get(tuple(words[i:i + length]))
+                if replacement is not None:
+                    canonical.append(replacement)
+                    i += length
+                    break
+            else:
+                canonical.append(words[i])
+                i += 1
+        else:
+            canonical.append(words[i])
+            i += 1
+    if typed and len(canonical) == 1 and canonical[0].isdigit() and canonical[0] != words[0]:
+        number = int(canonical[0])
+        canonical[0] = f'{number}{_ordinal_suffix(number)}'
+    return canonical
+
+def _find_unit(text, tables):
+    """
+    Find the unit in what is left of an address after the street: the first unit
+    designator followed by a unit number, in one search. A '#' after a designator
+    is dropped (APT # 5 -> APT 5), as USPS does.
+
+    Returns:
+        tuple: (unit, unit without its designators, USPS abbreviation of the designator,
+        unit number). Without a designator followed by a number, the unit is the whole
+        text less any bare '#', and the designator and number are None.
+
+    Ex: _find_unit('APARTMENT 9-316', _base_tables) -> ('APARTMENT 9-316', '9-316', 'APT', '9-316')
+    """
+    designators = tables.unit_designators
+    match = tables.unit_re.search(text)
+    if match is None:
+        stripped = tables.unit_identifier_re.sub('', text).strip()
+        if _HASH in text:
+            text = ' '.join(word for word in text.split() if word != _HASH)
+        return text, stripped, None, None
+
+    word, hashed, number = match.groups()
+    # '#' was spaced out in preprocessing, so units with one are rebuilt with single spaces
+    unit = f"{word} {number}" if hashed or word == _HASH else match.group()
+    # Designators inside the number are not part of what is stripped (APT UNIT -> '')
+    if '-' in number:
+        stripped = '-'.join('' if part in designators else part for part in number.split('-'))
+    else:
+        stripped = '' if number in designators else number
+    return unit, stripped, designators[word], number
+
+def _unit_edge_cases(normalized, tables):
+    """
+    Find formatting issues related to unit identifiers in a reconstructed address.
+
+    Returns:
+        tuple: (list of WARNING_CATEGORIES found, the address with a duplicate unit removed)
+    """
+
+    # Ensure the address is in uppercase for consistency
+    normalized = normalized.upper()
+    found = []
 
     # Find duplicate unit identifier pairs
-    match = re.search(duplicate_unit_pattern, normalized)
+    match = _duplicate_unit_re.search(normalized)
     if match:
         # Extract the units for comparison
         unit1 = match.group(1).strip()
@@ -205,26 +625,66 @@ def _check_for_edge_cases(address, normalized):
         if unit1.split()[-1] == unit2.split()[-1]:
             # Remove the second unit if they are identical
             normalized = normalized.replace(unit2, "").strip()
-            print(f"AddressScraper Warning: The raw address '{address}' has duplicate unit formats. Review cleaned: '{normalized}'")
+            found.append(WARNING_DUPLICATE_UNIT)
 
-    unit_match = re.search(unit_identifiers, normalized)
+    unit_match = tables.unit_identifier_re.search(normalized)
     if unit_match:
+        unit_identifier = unit_match.group()
         unit_identifier_position = unit_match.end()
 
         # Check if there's no valid number or letter following the unit identifier
-        if not re.search(r'[A-Z0-9]', normalized[unit_identifier_position:].strip()):
-            print(f"AddressScraper Warning: The raw address '{address}' contains a unit identifier but may be missing a valid unit after it. Review: '{normalized}'")
-            return True
+        if not _alphanumeric_re.search(normalized[unit_identifier_position:].strip()):
+            found.append(WARNING_MISSING_UNIT_NUMBER)
+            return found, normalized
 
         # Check if there's a number both before and after the unit identifier
-        pre_unit_number_match = re.search(r'\d+\s*(?=' + unit_match.group() + ')', normalized)
-        post_unit_number_match = re.search(r'(?<=' + unit_match.group() + r')\s*\d+[A-Z]?', normalized)
+        pre_unit_number_match = tables.pre_unit_number_res[unit_identifier].search(normalized)
+        post_unit_number_match = tables.post_unit_number_res[unit_identifier].search(normalized)
 
         if pre_unit_number_match and post_unit_number_match:
-            print(f"AddressScraper Warning: The raw address '{address}' has both a number before and after the unit identifier. Review: '{normalized}'")
-            return True
+            found.append(WARNING_NUMBER_AROUND_UNIT)
 
-    return False
+    return found, normalized
+
+def _check_for_edge_cases(address, normalized, tables):
+    """
+    Check for formatting issues related to unit identifiers, such as:
+    - Duplicate unit identifiers in the address.
+    - Unit identifier appearing before the street number and name in the normalized result.
+    - Unit identifier having both a number before and after it, indicating incorrect ordering.
+    """
+    found, normalized = _unit_edge_cases(normalized, tables)
+    for category in found:
+        if category == WARNING_DUPLICATE_UNIT:
+            _warn(f"AddressScraper Warning: The raw address '{address}' has duplicate unit formats. Review cleaned: '{normalized}'")
+        elif category == WARNING_MISSING_UNIT_NUMBER:
+            _warn(f"AddressScraper Warning: The raw address '{address}' contains a unit identifier but may be missing a valid unit after it. Review: '{normalized}'")
+        else:
+            _warn(f"AddressScraper Warning: The raw address '{address}' has both a number before and after the unit identifier. Review: '{normalized}'")
+    return WARNING_MISSING_UNIT_NUMBER in found or WARNING_NUMBER_AROUND_UNIT in found
+
+def warning_categories(address, parsed_address, config=None):
+    """
+    List the WARNING_CATEGORIES parse_address reports for `address` when warnings are enabled,
+    worked out from its result instead of parsing again. Pass the `config` the result was parsed with.
+
+    Ex: warning_categories('123 Main Foo', parse_address('123 Main Foo')) -> ['noStreetType']
+    """
+    if not isinstance(address, str):
+        return []
+    if len(address) > MAX_ADDRESS_LENGTH:
+        return [WARNING_ADDRESS_TOO_LONG]
+    if parsed_address is None:
+        return []
+    found = []
+    if parsed_address['streetType'] is None:
+        found.append(WARNING_NO_STREET_TYPE)
+    if parsed_address['streetNumber'] is None:
+        found.append(WARNING_NO_STREET_NUMBER)
+    reconstructed = parsed_address['addressUnit'] or parsed_address['address']
+    if reconstructed:
+        found.extend(_unit_edge_cases(reconstructed, config if config is not None else _base_tables)[0])
+    return found
 
 # NOT IN USE - FOR FUTURE IMPLEMENTATION
 # def _extract_unit(address):
@@ -283,7 +743,7 @@ def _check_for_edge_cases(address, normalized):
 
 #     return None
 
-_direction_mapping = {
+_direction_mapping = MappingProxyType({
     "NORTH": "N",
     "SOUTH": "S",
     "EAST": "E",
@@ -300,7 +760,222 @@ _direction_mapping = {
     "NW": "NW",
     "SE": "SE",
     "SW": "SW"
-}
+})
+
+# Street name canonicalization (ParserConfig canonical_names): number words and
+# ordinals up to 999 become digits (FIVE -> 5, ONE HUNDRED -> 100, TWENTY-FIRST
+# -> 21ST), and SAINT and MOUNT become ST and MT. Keyed by the words of each
+# phrase, as every spelling is precomputed here instead of being parsed per address.
+_NUMBER_WORDS = ('ONE', 'TWO', 'THREE', 'FOUR', 'FIVE', 'SIX', 'SEVEN', 'EIGHT', 'NINE', 'TEN', 'ELEVEN', 'TWELVE',
+                 'THIRTEEN', 'FOURTEEN', 'FIFTEEN', 'SIXTEEN', 'SEVENTEEN', 'EIGHTEEN', 'NINETEEN')
+_ORDINAL_WORDS = ('FIRST', 'SECOND', 'THIRD', 'FOURTH', 'FIFTH', 'SIXTH', 'SEVENTH', 'EIGHTH', 'NINTH', 'TENTH',
+                  'ELEVENTH', 'TWELFTH', 'THIRTEENTH', 'FOURTEENTH', 'FIFTEENTH', 'SIXTEENTH', 'SEVENTEENTH',
+                  'EIGHTEENTH', 'NINETEENTH')
+_TENS_WORDS = ('TWENTY', 'THIRTY', 'FORTY', 'FIFTY', 'SIXTY', 'SEVENTY', 'EIGHTY', 'NINETY')
+_TENS_ORDINAL_WORDS = ('TWENTIETH', 'THIRTIETH', 'FORTIETH', 'FIFTIETH', 'SIXTIETH', 'SEVENTIETH', 'EIGHTIETH',
+                       'NINETIETH')
+
+def _ordinal_suffix(number):
+    if number % 100 in (11, 12, 13):
+        return 'TH'
+    return {1: 'ST', 2: 'ND', 3: 'RD'}.get(number % 10, 'TH')
+
+def _spellings(number, ordinal):
+    """
+    Every spelling of 1 <= number <= 999 as a tuple of words: with and without AND
+    after HUNDRED, and with the tens and units as two words or one hyphenated word.
+    """
+    hundreds, rest = divmod(number, 100)
+    if rest == 0:
+        return [(_NUMBER_WORDS[hundreds - 1], 'HUNDREDTH' if ordinal else 'HUNDRED')]
+    units_words = _ORDINAL_WORDS if ordinal else _NUMBER_WORDS
+    if rest < 20:
+        tails = [(units_words[rest - 1],)]
+    elif rest % 10 == 0:
+        tails = [((_TENS_ORDINAL_WORDS if ordinal else _TENS_WORDS)[rest // 10 - 2],)]
+    else:
+        tens, units = _TENS_WORDS[rest // 10 - 2], units_words[rest % 10 - 1]
+        tails = [(tens, units), (f'{tens}-{units}',)]
+    if not hundreds:
+        return tails
+    head = (_NUMBER_WORDS[hundreds - 1], 'HUNDRED')
+    return [head + tail for tail in tails] + [head + ('AND',) + tail for tail in tails]
+
+def _name_phrase_table():
+    table = {('SAINT',): 'ST', ('MOUNT',): 'MT'}
+    for number in range(1, 1000):
+        for words in _spellings(number, False):
+            table[words] = str(number)
+        for words in _spellings(number, True):
+            table[words] = f'{number}{_ordinal_suffix(number)}'
+    return table
+
+_name_phrases = MappingProxyType(_name_phrase_table())
+_name_phrase_starts = frozenset(words[0] for words in _name_phrases)
+_NAME_PHRASE_MAX_WORDS = max(map(len, _name_phrases))
+
+# Token classification: flags plus the canonical form (USPS abbreviation for
+# street types and directionals), memoized per word so the parser does one
+# dict lookup per token instead of several set and regex checks.
+_TOKEN_STREET_TYPE = 1
+_TOKEN_DIRECTIONAL = 2
+_TOKEN_STREET_NUMBER = 4
+_TOKEN_FRACTION = 8
+_TOKEN_DIGITS = 16
+_DIGITS_TOKEN = (_TOKEN_STREET_NUMBER | _TOKEN_DIGITS, None)
+
+# Most words the cache holds, prewarmed vocabulary included. Once full, new
+# words are classified without being stored, so the cache never evicts and
+# needs no locking.
+TOKEN_CACHE_SIZE = 100000
+
+def _classify_token(word, street_types=_street_types, street_suffix_table=_street_suffix_table):
+    flags = 0
+    canonical = word
+    if word in street_types:
+        flags |= _TOKEN_STREET_TYPE
+        canonical = street_suffix_table.get(word, word)
+    if word in _directionals:
+        flags |= _TOKEN_DIRECTIONAL
+        canonical = _direction_mapping[word]
+    if _street_number_re.match(word):
+        flags |= _TOKEN_STREET_NUMBER
+    if _fraction_re.match(word):
+        flags |= _TOKEN_FRACTION
+    if _digits_re.match(word):
+        flags |= _TOKEN_DIGITS
+    return flags, canonical
+
+_token_cache_base = MappingProxyType({word: _classify_token(word) for word in _street_types | _directionals})
+_token_cache = dict(_token_cache_base)
+_token_cache_stats = {'lookups': 0, 'misses': 0, 'digits': 0}
+
+def _classify_token_miss(word):
+    # Plain numbers are too varied to cache and cheap to recognise
+    if word.isdecimal():
+        _token_cache_stats['digits'] += 1
+        return _DIGITS_TOKEN
+    _token_cache_stats['misses'] += 1
+    token = _classify_token(word)
+    if len(_token_cache) < TOKEN_CACHE_SIZE:
+        _token_cache[word] = token
+    return token
+
+def _classify_tokens(words):
+    """
+    Classify every word of an address, returning a list of (flags, canonical) tuples.
+    """
+    cache_get = _token_cache.get
+    _token_cache_stats['lookups'] += len(words)
+    return [cache_get(word) or _classify_token_miss(word) for word in words]
+
+def token_cache_info():
+    """
+    Report the size and hit rate of the token classification cache.
+
+    Plain numbers are classified without the cache, so they are counted as 'digits'
+    and left out of 'lookups', 'hits' and 'hitRate'. Counters are updated without
+    locking, so under heavy multi-threaded use they are approximate.
+
+    Ex: token_cache_info() -> {'size': 580, 'maxSize': 100000, 'lookups': 9000, 'hits': 8870, 'misses': 130, 'hitRate': 0.9856, 'digits': 3000}
+    """
+    digits = _token_cache_stats['digits']
+    lookups = _token_cache_stats['lookups'] - digits
+    misses = _token_cache_stats['misses']
+    return {
+        'size': len(_token_cache),
+        'maxSize': TOKEN_CACHE_SIZE,
+        'lookups': lookups,
+        'hits': lookups - misses,
+        'misses': misses,
+        'hitRate': round((lookups - misses) / lookups, 4) if lookups else 0.0,
+        'digits': digits,
+    }
+
+def clear_token_cache():
+    """
+    Reset the token classification cache to its prewarmed vocabulary and zero its counters.
+    """
+    _token_cache.clear()
+    _token_cache.update(_token_cache_base)
+    _token_cache_stats['lookups'] = 0
+    _token_cache_stats['misses'] = 0
+    _token_cache_stats['digits'] = 0
+
+# Key of a phrase trie node holding the phrase that ends there; never a word
+_PHRASE_END = ''
+
+def _build_phrase_trie(phrases):
+    """
+    Build a token trie of multi-word phrases, keyed from each phrase's last word
+    backwards so it can be walked leftwards from the word a match ends on. A node
+    maps a word to the next node; the '' key holds the phrase ending there.
+
+    Ex: _build_phrase_trie({'US HWY'}) -> {'HWY': {'US': {'': 'US HWY'}}}
+    """
+    root = {}
+    for phrase in phrases:
+        node = root
+        for word in reversed(phrase.split()):
+            node = node.setdefault(word, {})
+        node[_PHRASE_END] = phrase
+    return _freeze_trie(root)
+
+def _freeze_trie(node):
+    return MappingProxyType({
+        word: child if word == _PHRASE_END else _freeze_trie(child) for word, child in node.items()
+    })
+
+def _match_phrase(trie, tokens, end):
+    """
+    Find the longest phrase of the trie ending at tokens[end], comparing canonical token forms.
+
+    The walk stops at the first word that does not continue a phrase, so it costs
+    at most one dict lookup per word of the longest phrase however many phrases there are.
+
+    Returns:
+        tuple: (index of the phrase's first token, phrase), or None.
+    """
+    node = trie.get(tokens[end][1])
+    match = None
+    i = end
+    while node is not None:
+        phrase = node.get(_PHRASE_END)
+        if phrase is not None:
+            match = (i, phrase)
+        i -= 1
+        if i < 0:
+            break
+        node = node.get(tokens[i][1])
+    return match
+
+_street_type_phrase_trie = _build_phrase_trie(_street_type_phrases)
+
+class _ParserTables:
+    """
+    Everything one parse reads that a ParserConfig (addressScraper.config) can
+    overlay. _base_tables holds the base tables; parse functions take a config
+    in its place.
+    """
+
+    __slots__ = ('classify_tokens', 'street_type_phrases', 'multi_word_street_types', 'unit_identifiers', 'unit_designators',
+                 'unit_identifier_re', 'unit_re', 'canonical_units', 'pre_unit_number_res', 'post_unit_number_res',
+                 'formal_street_suffix_table', 'gazetteer', 'canonical_names')
+
+_base_tables = _ParserTables()
+_base_tables.classify_tokens = _classify_tokens
+_base_tables.street_type_phrases = _street_type_phrase_trie
+_base_tables.multi_word_street_types = _multi_word_street_types
+_base_tables.unit_identifiers = _unit_identifiers
+_base_tables.unit_designators = _unit_designators
+_base_tables.unit_identifier_re = _unit_identifier_re
+_base_tables.unit_re = _unit_re
+_base_tables.canonical_units = False
+_base_tables.pre_unit_number_res = _pre_unit_number_res
+_base_tables.post_unit_number_res = _post_unit_number_res
+_base_tables.formal_street_suffix_table = _formal_street_suffix_table
+_base_tables.gazetteer = None
+_base_tables.canonical_names = False
 
 def _standardize_directions(address, direction_mapping):
     """
@@ -318,15 +993,20 @@ def _standardize_directions(address, direction_mapping):
     if not isinstance(address, str):
         return address
 
-    # Regex to match standalone directional components (prefix/suffix)
-    direction_pattern = r'\b({})\b'.format('|'.join(direction_mapping.keys()))
+    # Regex to match standalone directional components (prefix/suffix), precompiled for the built-in mappings
+    if direction_mapping is _direction_mapping:
+        direction_re = _direction_re
+    elif direction_mapping is _formal_direction_mapping:
+        direction_re = _formal_direction_re
+    else:
+        direction_re = re.compile(r'\b({})\b'.format('|'.join(direction_mapping.keys())))
 
     def replace_direction(match):
         # Replace using the mapping
         return direction_mapping.get(match.group(0).upper(), match.group(0))
 
     # Apply regex replacement for standalone directions
-    return re.sub(direction_pattern, replace_direction, address)
+    return direction_re.sub(replace_direction, address)
 
 # NOT IN USE - FOR FUTURE IMPLEMENTATION
 # def _replace_street_suffix(address, suffix_mapping):
@@ -345,7 +1025,7 @@ def _standardize_directions(address, direction_mapping):
 
 #     return address, None
 
-_formal_direction_mapping = {
+_formal_direction_mapping = MappingProxyType({
     "N": "NORTH",
     "S": "SOUTH",
     "E": "EAST",
@@ -354,16 +1034,20 @@ _formal_direction_mapping = {
     "NW": "NORTHWEST",
     "SE": "SOUTHEAST",
     "SW": "SOUTHWEST",
-}
+})
 
-def formalize_address(address):
+# Compiled once for the frozen built-in mappings; other mappings compile per call
+_direction_re = re.compile(r'\b({})\b'.format('|'.join(_direction_mapping.keys())))
+_formal_direction_re = re.compile(r'\b({})\b'.format('|'.join(_formal_direction_mapping.keys())))
+
+def formalize_address(address, config=None):
     """
     Formalize an address by first normalizing it, then converting 
     street suffixes and direction abbreviations back to their full forms.
 
     Ex: 123 R ST NE 130 -> 123 R STREET NORTHEAST 130
     """
-    address_info = parse_address(address)
+    address_info = parse_address(address, config=config)
     if not address_info:
         return None
 
@@ -380,7 +1064,8 @@ def formalize_address(address):
     if street_direction_suffix:
         street_direction_suffix = _standardize_directions(street_direction_suffix, _formal_direction_mapping)
     if street_type:
-        street_type = formal_street_suffix_mapping.get(street_type, street_type)
+        formal_table = config.formal_street_suffix_table if config is not None else _formal_street_suffix_table
+        street_type = formal_table.get(street_type, street_type)
 
     # Reconstruct the formalized address
     formalized_address_parts = [
@@ -397,6 +1082,67 @@ def formalize_address(address):
 
     return formalized_address if formalized_address else None
 
+# Result key -> (include unit, include directionals) for each fingerprint variant
+_fingerprint_variants = (
+    ('fingerprint', True, True),
+    ('fingerprintNoUnit', False, True),
+    ('fingerprintNoDirectionals', True, False),
+    ('fingerprintStreet', False, False),
+)
+FINGERPRINT_FIELDS = tuple(field for field, _, _ in _fingerprint_variants)
+FINGERPRINT_BITS = (64, 128)
+# Bumped whenever the canonical form below changes, so stored fingerprints are never silently mixed
+_FINGERPRINT_PERSON = b'addressScraper1'
+
+def address_fingerprint(parsed_address, bits=64, unit=True, directionals=True):
+    """
+    Compute a stable fixed-width fingerprint from the canonical components of a parse result.
+
+    The canonical form is the street number, directional prefix and suffix (USPS
+    abbreviations), street name, street type and the unit with its identifier
+    stripped, so 'APT 5' and 'UNIT 5' match. The value is a BLAKE2b digest and
+    is the same on every platform, process and Python version.
+
+    Parameters:
+        parsed_address (dict): A parse_address result.
+        bits (int): 64 or 128.
+        unit (bool): Include the unit number.
+        directionals (bool): Include the directional prefix and suffix.
+
+    Returns:
+        int or None: An unsigned integer of the given width, or None for a None result.
+
+    Ex: address_fingerprint(parse_address('1234 Main Street, Unit 5'), unit=False)
+    """
+    if not parsed_address:
+        return None
+    if bits not in FINGERPRINT_BITS:
+        raise ValueError(f"Fingerprint width must be one of {FINGERPRINT_BITS}, not {bits}")
+
+    prefix = parsed_address.get('streetDirectionPrefix') if directionals else None
+    suffix = parsed_address.get('streetDirectionSuffix') if directionals else None
+    canonical = '\x1f'.join([
+        parsed_address.get('streetNumber') or '',
+        _direction_mapping.get(prefix, prefix) if prefix else '',
+        parsed_address.get('streetName') or '',
+        parsed_address.get('streetType') or '',
+        _direction_mapping.get(suffix, suffix) if suffix else '',
+        (parsed_address.get('unitNumberStripped') or '') if unit else '',
+    ])
+    digest = hashlib.blake2b(canonical.encode('utf-8'), digest_size=bits // 8, person=_FINGERPRINT_PERSON).digest()
+    return int.from_bytes(digest, 'big')
+
+def _add_fingerprints(parsed_address, bits):
+    for field, unit, directionals in _fingerprint_variants:
+        parsed_address[field] = address_fingerprint(parsed_address, bits, unit, directionals)
+
+def _parsed_field(address, field):
+    """
+    One field of parse_address(address), or None when the address does not parse (None, non-str, blank).
+    """
+    parsed_address = parse_address(address)
+    return parsed_address[field] if parsed_address is not None else None
+
 def normalize_address(address):
     """
     Normalize an address according to USPS standards.
@@ -404,7 +1150,7 @@ def normalize_address(address):
     Ex: 1234 Main Street, Unit 5 -> 1234 MAIN ST UNIT 5
     """
 
-    return parse_address(address).get('address')
+    return _parsed_field(address, 'address')
 
 def get_unit_info(address):
     """
@@ -412,7 +1158,7 @@ def get_unit_info(address):
 
     Ex: 1234 Main Street, Unit 5 -> Unit 5
     """
-    return parse_address(address).get('unitNumber')
+    return _parsed_field(address, 'unitNumber')
 
 def get_unit_info_stripped(address):
     """
@@ -420,7 +1166,7 @@ def get_unit_info_stripped(address):
 
     Ex: 1234 Main Street, Unit 5 -> 5
     """
-    return parse_address(address).get('unitNumberStripped')
+    return _parsed_field(address, 'unitNumberStripped')
 
 def get_street_number(address):
     """
@@ -428,7 +1174,7 @@ def get_street_number(address):
 
     Ex: 1234 Main Street, Unit 5 -> 1234
     """
-    return parse_address(address).get('streetNumber')
+    return _parsed_field(address, 'streetNumber')
 
 def get_street_name(address):
     """
@@ -436,7 +1182,7 @@ def get_street_name(address):
 
     Ex: 1234 Main St, Unit 5 -> Main St
     """
-    return parse_address(address).get('streetName')
+    return _parsed_field(address, 'streetName')
 
 def get_street_type(address):
     """
@@ -444,7 +1190,7 @@ def get_street_type(address):
 
     Ex: 1234 Main St, Unit 5 -> St
     """
-    return parse_address(address).get('streetType')
+    return _parsed_field(address, 'streetType')
 
 def get_address_with_unit(address):
     """
@@ -452,7 +1198,7 @@ def get_address_with_unit(address):
 
     Ex: 1234 Main Street, Unit 5 -> 1234 Main Street
     """
-    return parse_address(address).get('addressUnit')
+    return _parsed_field(address, 'addressUnit')
 
 def get_street_prefix(address):
     """
@@ -460,7 +1206,7 @@ def get_street_prefix(address):
 
     Ex: 1234 North Main St, Unit 5 -> N
     """
-    return parse_address(address).get('streetDirectionPrefix')
+    return _parsed_field(address, 'streetDirectionPrefix')
 
 def get_street_suffix(address):
     """
@@ -468,7 +1214,7 @@ def get_street_suffix(address):
 
     Ex: 1234 Main St Northwest, Unit 5 -> NW
     """
-    return parse_address(address).get('streetDirectionSuffix')
+    return _parsed_field(address, 'streetDirectionSuffix')
 
 def is_complete(address, warningsEnabled=False):
     """
@@ -477,10 +1223,12 @@ def is_complete(address, warningsEnabled=False):
     Ex: 1234 Main Street, Unit 5 -> True
     """
     normalized = parse_address(address, warningsEnabled)
-    
+    if normalized is None:
+        return False
+
     # Ensure the address has a valid street number, street name, and normalized address
-    street_number_exists = get_street_number(normalized) is not None
-    street_name_exists = get_street_name(normalized) is not None
+    street_number_exists = normalized['streetNumber'] is not None
+    street_name_exists = normalized['streetName'] is not None
     
     # An address is considered complete if it has a street number, street name, and normalized address
     return all([normalized, street_number_exists, street_name_exists])
\ No newline at end of file
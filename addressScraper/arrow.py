@@ -0,0 +1,176 @@
+"""
+Arrow record batches and Parquet files of parse results.
+
+Record batches are built straight from the result dicts against a fixed
+schema: one string column per result field, a boolean isComplete, and the
+low-cardinality street type and directional columns dictionary-encoded.
+Rows without a result are null in every column:
+
+    batch = parse_addresses_arrow(addresses, mode='process')
+    write_parquet(addresses, 'parsed.parquet', batch_rows=100000, mode='process')
+
+    python -m addressScraper.arrow addresses.csv parsed.parquet --column address --mode process
+
+write_parquet reads its input and writes row groups batch_rows at a time, so
+memory stays bounded however long the input is.
+
+Requires pyarrow, an optional dependency: pip install "addressScraper[arrow]".
+"""
+import argparse
+from itertools import islice
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Optional dependency
+    pyarrow = None
+
+from .addressScraper import FINGERPRINT_FIELDS, RESULT_FIELDS
+from .batch import parse_addresses
+from .quality import _read_addresses
+
+# Columns with few distinct values, stored as dictionary indexes into their values
+DICTIONARY_FIELDS = ('streetDirectionPrefix', 'streetType', 'streetDirectionSuffix')
+DEFAULT_BATCH_ROWS = 100000
+DEFAULT_COMPRESSION = 'zstd'
+# Stands in for rows without a result, so every column is null there
+_NULL_RESULT = dict.fromkeys(RESULT_FIELDS + FINGERPRINT_FIELDS)
+
+
+def _require_pyarrow():
+    if pyarrow is None:
+        raise ImportError('pyarrow is required for Arrow and Parquet output: pip install "addressScraper[arrow]"')
+
+
+def _field_type(field, fingerprintBits):
+    if field == 'isComplete':
+        return pyarrow.bool_()
+    if field in FINGERPRINT_FIELDS:
+        # 128-bit fingerprints do not fit an Arrow integer, so they are stored as big-endian bytes
+        return pyarrow.uint64() if fingerprintBits == 64 else pyarrow.binary(16)
+    if field in DICTIONARY_FIELDS:
+        return pyarrow.dictionary(pyarrow.int32(), pyarrow.string())
+    return pyarrow.string()
+
+
+def arrow_schema(fingerprintBits=None, input_column=None):
+    """
+    Schema of the record batches: RESULT_FIELDS in order, then FINGERPRINT_FIELDS when fingerprintBits is given.
+
+    Parameters:
+        fingerprintBits (int): 64 (uint64 columns) or 128 (16-byte binary columns).
+        input_column (str): Name of a leading column holding the input addresses, if wanted.
+    """
+    _require_pyarrow()
+    fields = RESULT_FIELDS + FINGERPRINT_FIELDS if fingerprintBits else RESULT_FIELDS
+    columns = [pyarrow.field(input_column, pyarrow.string())] if input_column else []
+    columns += [pyarrow.field(field, _field_type(field, fingerprintBits)) for field in fields]
+    return pyarrow.schema(columns)
+
+
+def results_to_record_batch(results, fingerprintBits=None, addresses=None, input_column=None):
+    """
+    Convert parse_address results to a record batch; rows without a result are null in every column.
+
+    Parameters:
+        results (list): parse_address results (dicts or None).
+        fingerprintBits (int): The width the results were parsed with, if they carry fingerprints.
+        addresses (list): The inputs, written to `input_column` when that is given.
+        input_column (str): Name of a leading column holding the input addresses.
+    """
+    schema = arrow_schema(fingerprintBits, input_column)
+    # pyarrow reads the dicts in C++ against the schema, which is quicker than gathering columns in Python;
+    # only 128-bit fingerprints (Python ints to bytes) and the inputs are converted here
+    converted = [field for field in schema if field.name != input_column
+                 and not (fingerprintBits == 128 and field.name in FINGERPRINT_FIELDS)]
+    batch = pyarrow.RecordBatch.from_pylist([result if result is not None else _NULL_RESULT for result in results],
+                                            schema=pyarrow.schema(converted))
+    columns = []
+    for field in schema:
+        name = field.name
+        if name == input_column:
+            columns.append(pyarrow.array(list(addresses), type=field.type))
+        elif fingerprintBits == 128 and name in FINGERPRINT_FIELDS:
+            columns.append(pyarrow.array([result[name].to_bytes(16, 'big') if result is not None else None
+                                          for result in results], type=field.type))
+        else:
+            columns.append(batch.column(name))
+    return pyarrow.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def parse_addresses_arrow(addresses, warningsEnabled=False, mode='serial', workers=None, chunk_size=None, rejects=None,
+                          fingerprintBits=None, stats=None, config=None, input_column=None):
+    """
+    Parse many addresses into one Arrow record batch, in input order.
+
+    Takes the same arguments as parse_addresses, plus `input_column` to include the inputs.
+
+    Ex: parse_addresses_arrow(['1234 Main Street', '55 W Wacker Drive Ste 201']).column('streetType')
+    """
+    _require_pyarrow()
+    addresses = list(addresses)
+    results = parse_addresses(addresses, warningsEnabled, mode, workers, chunk_size, rejects, fingerprintBits, stats, config)
+    return results_to_record_batch(results, fingerprintBits, addresses, input_column)
+
+
+def write_parquet(addresses, path, batch_rows=DEFAULT_BATCH_ROWS, compression=DEFAULT_COMPRESSION, input_column=None,
+                  **batch_options):
+    """
+    Parse addresses and write them to a Parquet file, one row group per batch_rows addresses.
+
+    Parameters:
+        addresses (iterable): Address strings, read batch_rows at a time.
+        path (str): Output file.
+        batch_rows (int): Addresses parsed, converted and written at a time; bounds memory use.
+        compression (str): Parquet codec ('zstd', 'snappy', 'gzip', 'none', ...).
+        input_column (str): Name of a leading column holding the input addresses.
+
+    Extra keyword arguments (mode, workers, chunk_size, rejects, fingerprintBits, stats, config)
+    go to parse_addresses; rejects are indexed across the whole input.
+
+    Returns:
+        int: Rows written.
+    """
+    _require_pyarrow()
+    if batch_rows < 1:
+        raise ValueError("batch_rows must be at least 1")
+    fingerprintBits = batch_options.get('fingerprintBits')
+    rejects = batch_options.pop('rejects', None)
+    addresses = iter(addresses)
+    rows = 0
+    with pyarrow.parquet.ParquetWriter(path, arrow_schema(fingerprintBits, input_column), compression=compression) as writer:
+        while True:
+            batch = list(islice(addresses, batch_rows))
+            if not batch:
+                break
+            batch_rejects = [] if rejects is not None else None
+            results = parse_addresses(batch, rejects=batch_rejects, **batch_options)
+            if batch_rejects:
+                rejects.extend((index + rows, address, reason) for index, address, reason in batch_rejects)
+            writer.write_table(pyarrow.Table.from_batches([results_to_record_batch(results, fingerprintBits, batch, input_column)]))
+            rows += len(batch)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m addressScraper.arrow', description='Parse a file of addresses into a Parquet file.')
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--column', default=None, help='address column of a CSV input (default: one address per line)')
+    parser.add_argument('--input-column', default='input', help="output column for the input addresses ('' to leave them out)")
+    parser.add_argument('--mode', default='serial', help='batch execution mode')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--batch-rows', type=int, default=DEFAULT_BATCH_ROWS, help='rows parsed and written per row group')
+    parser.add_argument('--compression', default=DEFAULT_COMPRESSION)
+    parser.add_argument('--fingerprint-bits', type=int, default=None, choices=(64, 128))
+    parser.add_argument('--encoding', default='utf-8')
+    args = parser.parse_args(argv)
+
+    rows = write_parquet(_read_addresses(args.input, args.column, args.encoding), args.output, args.batch_rows,
+                         args.compression, args.input_column or None, mode=args.mode, workers=args.workers,
+                         fingerprintBits=args.fingerprint_bits)
+    print(f"{rows} rows written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Batch parsing across serial, thread-pool and process-pool execution.
+
+parse_address is safe to call from many threads at once (see the notes at the
+top of addressScraper.py), so on free-threaded builds the thread mode scales
+without the pickling cost of the process mode.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .addressScraper import FINGERPRINT_BITS, FINGERPRINT_FIELDS, RESULT_FIELDS, parse_addresses_preprocessed
+from .rejects import parse_isolated
+from .sharedmem import parse_addresses_shared
+
+EXECUTION_MODES = ('serial', 'thread', 'process', 'shared_memory', 'auto')
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _chunks(items, chunk_size):
+    for start in range(0, len(items), chunk_size):
+        yield start, items[start:start + chunk_size]
+
+
+def _parse_chunk(addresses, warningsEnabled=False, start=0, isolate=False, fingerprintBits=None, stats=None, config=None):
+    """
+    Parse a chunk. With `isolate`, failing rows become None and are returned
+    as (index, address, reason) rejects instead of raising. With `stats`, every
+    row is also counted into that QualityStats.
+
+    Returns:
+        tuple: (list of results, list of rejects, stats)
+    """
+    if not isolate:
+        results = parse_addresses_preprocessed(addresses, warningsEnabled, fingerprintBits, config)
+        if stats is not None:
+            stats.update_many(addresses, results, config=config)
+        return results, [], stats
+
+    results = []
+    rejected = []
+    for index, address in enumerate(addresses, start):
+        result, reason = parse_isolated(address, warningsEnabled, fingerprintBits, config)
+        if reason is not None:
+            rejected.append((index, address, reason))
+        if stats is not None:
+            stats.update(address, result, reason, config)
+        results.append(result)
+    return results, rejected, stats
+
+
+def _parse_chunk_star(args):
+    return _parse_chunk(*args)
+
+
+def parse_addresses(addresses, warningsEnabled=False, mode='serial', workers=None, chunk_size=None, rejects=None,
+                    fingerprintBits=None, stats=None, config=None):
+    """
+    Parse many addresses, returning results in input order.
+
+    Parameters:
+        addresses (iterable): Address strings (None and blanks yield None, as with parse_address).
+        warningsEnabled (bool): Print parser warnings.
+        mode (str): 'serial', 'thread', 'process', 'shared_memory' or 'auto'. 'shared_memory' is a process
+            pool that passes addresses and encoded results through shared memory instead of pickling them.
+            'auto' lets addressScraper.planner pick the mode, pool size and chunk size for this batch.
+        workers (int): Pool size for the parallel modes. Defaults to os.cpu_count().
+        chunk_size (int): Addresses handed to a worker at a time.
+            With mode='auto', workers and chunk_size are kept if given.
+        rejects (list): If given, every row is isolated: a row that raises or has no parseable
+            address gets a None result and an (index, address, reason) entry appended here.
+        fingerprintBits (int): 64 or 128 to add the FINGERPRINT_FIELDS to every result.
+        stats (QualityStats): If given, every row is counted into it as it is parsed. The pool
+            modes count into one QualityStats per chunk and merge them.
+        config (ParserConfig): Tenant configuration from addressScraper.config (default: base tables).
+
+    Returns:
+        list: One parse_address result per input address.
+
+    Ex: parse_addresses(['1234 Main Street', '55 W Wacker Drive Ste 201'], mode='thread')
+    """
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode '{mode}', expected one of {EXECUTION_MODES}")
+    # Checked here once, as isolated rows would otherwise each be rejected for it
+    if fingerprintBits and fingerprintBits not in FINGERPRINT_BITS:
+        raise ValueError(f"Fingerprint width must be one of {FINGERPRINT_BITS}, not {fingerprintBits}")
+
+    addresses = list(addresses)
+    isolate = rejects is not None
+    if mode == 'auto':
+        # Imported here so that `python -m addressScraper.planner` does not find itself already imported
+        from .planner import plan_execution
+        plan = plan_execution(addresses, workers, chunk_size)
+        mode, workers, chunk_size = plan.mode, plan.workers, plan.chunk_size
+    if mode == 'serial' or len(addresses) <= 1:
+        results, rejected, _ = _parse_chunk(addresses, warningsEnabled, 0, isolate, fingerprintBits, stats, config)
+        if isolate:
+            rejects.extend(rejected)
+        return results
+
+    if mode == 'shared_memory':
+        rejected = [] if isolate else None
+        results = parse_addresses_shared(addresses, warningsEnabled, workers, chunk_size, rejected, fingerprintBits, config)
+        if stats is not None:
+            # Results come back as encoded records; counting them here costs no extra parsing
+            stats.update_many(addresses, results, rejected, config)
+        if isolate:
+            rejects.extend(rejected)
+        return results
+
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, min(DEFAULT_CHUNK_SIZE, -(-len(addresses) // workers)))
+    chunks = [
+        (chunk, warningsEnabled, start, isolate, fingerprintBits, stats.empty_copy(i) if stats is not None else None, config)
+        for i, (start, chunk) in enumerate(_chunks(addresses, chunk_size))
+    ]
+
+    executor_class = ThreadPoolExecutor if mode == 'thread' else ProcessPoolExecutor
+    with executor_class(max_workers=workers) as executor:
+        results = []
+        for parsed, rejected, chunk_stats in executor.map(_parse_chunk_star, chunks):
+            results.extend(parsed)
+            if isolate:
+                rejects.extend(rejected)
+            if stats is not None:
+                stats.merge(chunk_stats)
+    return results
+
+
+def parse_addresses_columnar(addresses, warningsEnabled=False, mode='serial', workers=None, chunk_size=None,
+                             rejects=None, fingerprintBits=None, stats=None, config=None):
+    """
+    Parse many addresses into columns: a dict of field name -> list of values in input order.
+
+    Takes the same arguments as parse_addresses. Rows without a result hold None in every column.
+    The fingerprint columns are present when fingerprintBits is given.
+
+    Ex: parse_addresses_columnar(['1234 Main Street', '55 W Wacker Drive Ste 201'])['streetType'] -> ['ST', 'DR']
+    """
+    # parse_addresses validates the arguments before any row is parsed
+    results = parse_addresses(addresses, warningsEnabled, mode, workers, chunk_size, rejects, fingerprintBits, stats, config)
+    fields = RESULT_FIELDS + FINGERPRINT_FIELDS if fingerprintBits else RESULT_FIELDS
+    return {
+        field: [result[field] if result is not None else None for result in results]
+        for field in fields
+    }
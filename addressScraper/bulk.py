@@ -0,0 +1,421 @@
+"""
+Bulk CSV normalization for very large files.
+
+The input is memory-mapped and split into byte ranges that start and end on
+record boundaries. A newline only ends a record when an even number of quote
+characters precede it, so quoted fields containing newlines are never cut.
+Each worker maps the file itself, parses its own range and writes a part
+file; the parts are concatenated into the output at the end. No rows travel
+between processes and there is no single reader.
+
+    python -m addressScraper.bulk input.csv output.csv --column address --workers 8
+
+The output keeps every input column and appends one column per parse result
+field (see RESULT_FIELDS); a field named like an input column is written as
+parsed_<field>, so `address` input keeps its column. Rows that cannot be parsed go to a rejects file
+with a rejectReason column instead of stopping the job.
+
+Work in progress lives in `<output>.work/`. Every worker checkpoints its input
+and output offsets periodically, so rerunning an interrupted job with the same
+arguments resumes each range where it stopped.
+"""
+import argparse
+import csv
+import io
+import mmap
+import os
+import json
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+from .addressScraper import RESULT_FIELDS
+from .quality import QualityStats
+from .rejects import describe_error, parse_isolated
+
+DEFAULT_COLUMN = 'address'
+DEFAULT_ENCODING = 'utf-8'
+DEFAULT_CHECKPOINT_ROWS = 50000
+REJECT_REASON_COLUMN = 'rejectReason'
+MISSING_COLUMN_REASON = 'address column missing from row'
+# Prepended to result fields whose names an input column already uses
+PARSED_COLUMN_PREFIX = 'parsed_'
+# Smallest range worth giving to its own worker
+MIN_RANGE_BYTES = 1 << 20
+_QUOTE = b'"'
+_NEWLINE = b'\n'
+_COUNT_WINDOW = 64 * 1024 * 1024
+
+
+def _open_mapped(path):
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _count_quotes_mapped(mapped, start, end):
+    """
+    Count quote characters in mapped[start:end], slicing at most _COUNT_WINDOW bytes at a time.
+    """
+    count = 0
+    for window in range(start, end, _COUNT_WINDOW):
+        count += mapped[window:min(window + _COUNT_WINDOW, end)].count(_QUOTE)
+    return count
+
+
+def _next_record_boundary(mapped, position, quotes_before):
+    """
+    Find the first record boundary at or after `position`.
+
+    Parameters:
+        quotes_before (int): Number of quote characters in the file before `position`.
+
+    Returns:
+        int: Offset just past the terminating newline, or len(mapped).
+    """
+    size = len(mapped)
+    while position < size:
+        newline = mapped.find(_NEWLINE, position)
+        if newline < 0:
+            return size
+        quotes_before += _count_quotes_mapped(mapped, position, newline)
+        if quotes_before % 2 == 0:
+            return newline + 1
+        position = newline + 1
+    return size
+
+
+def _count_quotes(path, start, end):
+    mapped = _open_mapped(path)
+    try:
+        return _count_quotes_mapped(mapped, start, end) if mapped is not None else 0
+    finally:
+        if mapped is not None:
+            mapped.close()
+
+
+def record_ranges(path, parts, executor=None):
+    """
+    Split a CSV file into at most `parts` byte ranges aligned on record boundaries.
+
+    The first range starts after the header row. Quote counts for the coarse
+    blocks are gathered in parallel when an executor is given, then each block
+    edge is moved forward to the next unquoted newline.
+
+    Returns:
+        tuple: (header end offset, list of (start, end) byte ranges)
+    """
+    mapped = _open_mapped(path)
+    if mapped is None:
+        return 0, []
+    try:
+        size = len(mapped)
+        header_end = _next_record_boundary(mapped, 0, 0)
+        body = size - header_end
+        parts = max(1, min(parts, body // MIN_RANGE_BYTES or 1))
+        targets = [header_end + body * k // parts for k in range(parts)] + [size]
+
+        # Quote parity at each target, from per-block counts
+        blocks = list(zip(targets[:-1], targets[1:]))
+        if executor is not None and len(blocks) > 1:
+            counts = list(executor.map(_count_quotes, [path] * len(blocks), *zip(*blocks)))
+        else:
+            counts = [_count_quotes_mapped(mapped, start, end) for start, end in blocks]
+        quotes_before = [_count_quotes_mapped(mapped, 0, header_end)]
+        for count in counts:
+            quotes_before.append(quotes_before[-1] + count)
+
+        # Boundary index: each target moved forward to the next record boundary
+        boundaries = [header_end]
+        for target, quotes in zip(targets[1:-1], quotes_before[1:-1]):
+            start = max(target, boundaries[-1])
+            boundary = _next_record_boundary(mapped, start, quotes + _count_quotes_mapped(mapped, target, start))
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+        if boundaries[-1] < size:
+            boundaries.append(size)
+        return header_end, list(zip(boundaries[:-1], boundaries[1:]))
+    finally:
+        mapped.close()
+
+
+def _read_header(path, header_end, encoding):
+    with open(path, 'rb') as f:
+        raw = f.read(header_end)
+    if encoding.replace('_', '-').lower() in ('utf-8', 'utf8'):
+        encoding = 'utf-8-sig'
+    rows = list(csv.reader(io.StringIO(raw.decode(encoding), newline='')))
+    return rows[0] if rows else []
+
+
+def _result_row(result):
+    if result is None:
+        return [''] * len(RESULT_FIELDS)
+    return ['' if result[field] is None else result[field] for field in RESULT_FIELDS]
+
+
+def _iter_records(mapped, start, end):
+    """
+    Yield (record bytes, offset after the record) for the CSV records in mapped[start:end].
+    """
+    mapped.seek(start)
+    while mapped.tell() < end:
+        record = mapped.readline()
+        quotes = record.count(_QUOTE)
+        while quotes % 2 and mapped.tell() < end:
+            line = mapped.readline()
+            quotes += line.count(_QUOTE)
+            record += line
+        yield record, mapped.tell()
+
+
+def _range_paths(work_dir, index):
+    base = os.path.join(work_dir, f"range{index:05d}")
+    return base + '.csv', base + '.rejects.csv', base + '.checkpoint.json'
+
+
+def _load_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    """
+    Atomically replace `path`, so a crash never leaves a half-written file.
+    """
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def _open_at(path, size):
+    """
+    Open a part file for appending after its first `size` bytes, dropping anything written after the last checkpoint.
+    """
+    f = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+    f.truncate(size)
+    f.seek(size)
+    return f
+
+
+def output_columns(header):
+    """
+    The output header: the input columns, then one column per result field, with
+    PARSED_COLUMN_PREFIX added to any field whose name is already taken.
+
+    Ex: output_columns(['id', 'address'])[-3:] -> ['parsed_address', 'addressUnit', 'isComplete']
+    """
+    taken = set(header)
+    columns = list(header)
+    for field in RESULT_FIELDS:
+        while field in taken:
+            field = PARSED_COLUMN_PREFIX + field
+        taken.add(field)
+        columns.append(field)
+    return columns
+
+
+def _normalize_range(path, start, end, work_dir, index, column_index, encoding, checkpoint_rows, collect_stats=False):
+    """
+    Parse the rows in path[start:end] into the range's part and rejects files, checkpointing as it goes.
+    With collect_stats, QualityStats for the range are kept in the checkpoint too.
+
+    Returns:
+        tuple: (rows written, rows rejected, QualityStats state dict or None)
+    """
+    part_path, rejects_path, checkpoint_path = _range_paths(work_dir, index)
+    state = _load_json(checkpoint_path)
+    if state is None or not os.path.exists(part_path) or not os.path.exists(rejects_path) \
+            or os.path.getsize(part_path) < state['output'] or os.path.getsize(rejects_path) < state['rejects']:
+        state = {'position': start, 'output': 0, 'rejects': 0, 'rows': 0, 'rejected': 0, 'done': False}
+    stats = None
+    if collect_stats:
+        stats = QualityStats.from_dict(state['stats']) if state.get('stats') else QualityStats()
+    if state['done']:
+        return state['rows'], state['rejected'], state.get('stats')
+
+    mapped = _open_mapped(path)
+    try:
+        with _open_at(part_path, state['output']) as out, _open_at(rejects_path, state['rejects']) as rejects:
+            out_buffer = io.StringIO()
+            rejects_buffer = io.StringIO()
+            writer = csv.writer(out_buffer)
+            rejects_writer = csv.writer(rejects_buffer)
+            since_checkpoint = 0
+
+            def checkpoint(position, done=False):
+                for f, buffer, key in ((out, out_buffer, 'output'), (rejects, rejects_buffer, 'rejects')):
+                    data = buffer.getvalue().encode(encoding)
+                    buffer.seek(0)
+                    buffer.truncate()
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    state[key] += len(data)
+                state['position'] = position
+                state['done'] = done
+                if stats is not None:
+                    state['stats'] = stats.to_dict()
+                _write_json(checkpoint_path, state)
+
+            for record, position in _iter_records(mapped, state['position'], end):
+                try:
+                    row = next(csv.reader([record.decode(encoding)]), [])
+                except (UnicodeDecodeError, csv.Error) as exc:
+                    row = [record.decode(encoding, 'replace').rstrip('\r\n')]
+                    result, reason = None, describe_error(exc)
+                else:
+                    if not row:
+                        continue
+                    if column_index < len(row):
+                        result, reason = parse_isolated(row[column_index])
+                    else:
+                        result, reason = None, MISSING_COLUMN_REASON
+                if stats is not None:
+                    stats.update(row[column_index] if column_index < len(row) else None, result, reason)
+
+                if reason is None:
+                    writer.writerow(row + _result_row(result))
+                    state['rows'] += 1
+                else:
+                    rejects_writer.writerow(row + [reason])
+                    state['rejected'] += 1
+
+                since_checkpoint += 1
+                if since_checkpoint >= checkpoint_rows:
+                    checkpoint(position)
+                    since_checkpoint = 0
+            checkpoint(end, done=True)
+    finally:
+        mapped.close()
+    return state['rows'], state['rejected'], state.get('stats')
+
+
+def _default_rejects_path(output_path):
+    root, ext = os.path.splitext(output_path)
+    return f"{root}.rejects{ext or '.csv'}"
+
+
+def _prepare_work_dir(input_path, work_dir, column, encoding, workers, executor, resume):
+    """
+    Reuse the manifest of an interrupted run of the same job, or start a new one.
+
+    Returns:
+        dict: The job manifest (header offset and byte ranges).
+    """
+    stat = os.stat(input_path)
+    job = {
+        'input': os.path.abspath(input_path),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'column': column,
+        'encoding': encoding,
+    }
+    manifest_path = os.path.join(work_dir, 'manifest.json')
+    manifest = _load_json(manifest_path) if resume else None
+    if manifest is not None and all(manifest.get(key) == value for key, value in job.items()):
+        return manifest
+
+    if os.path.isdir(work_dir):
+        shutil.rmtree(work_dir)
+    os.makedirs(work_dir)
+    header_end, ranges = record_ranges(input_path, workers * 4, executor)
+    job['header_end'] = header_end
+    job['ranges'] = ranges
+    _write_json(manifest_path, job)
+    return job
+
+
+def _concatenate(paths, out_path, header_row, encoding):
+    with open(out_path, 'w', encoding=encoding, newline='') as out:
+        csv.writer(out).writerow(header_row)
+    with open(out_path, 'ab') as out:
+        for path in paths:
+            with open(path, 'rb') as part:
+                shutil.copyfileobj(part, out, 16 * 1024 * 1024)
+
+
+def normalize_file(input_path, output_path, column=DEFAULT_COLUMN, workers=None, encoding=DEFAULT_ENCODING,
+                   rejects_path=None, checkpoint_rows=DEFAULT_CHECKPOINT_ROWS, resume=True, stats=None):
+    """
+    Normalize the address column of a CSV file into a new CSV file.
+
+    Parameters:
+        input_path (str): CSV file with a header row.
+        output_path (str): Destination CSV; work files are kept in `<output_path>.work/` until the job finishes.
+        column (str): Name of the address column.
+        workers (int): Worker processes. Defaults to os.cpu_count(); 1 runs in-process.
+        encoding (str): Text encoding of both files.
+        rejects_path (str): Where rejected rows go, with a rejectReason column. Defaults to `<output>.rejects.csv`.
+        checkpoint_rows (int): Rows each worker processes between checkpoints.
+        resume (bool): Continue an interrupted run of the same job instead of starting over.
+        stats (QualityStats): If given, each worker counts its rows and the results are merged into it.
+
+    Returns:
+        tuple: (rows written, rows rejected)
+
+    Ex: normalize_file('parcels.csv', 'parcels_normalized.csv', column='site_address', workers=16)
+    """
+    workers = workers or os.cpu_count() or 1
+    rejects_path = rejects_path or _default_rejects_path(output_path)
+    work_dir = output_path + '.work'
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        manifest = _prepare_work_dir(input_path, work_dir, column, encoding, workers, executor, resume)
+        header = _read_header(input_path, manifest['header_end'], encoding)
+        if column not in header:
+            raise ValueError(f"Column '{column}' not found in the header of '{input_path}'")
+        column_index = header.index(column)
+
+        tasks = [
+            (input_path, start, end, work_dir, index, column_index, encoding, max(1, checkpoint_rows), stats is not None)
+            for index, (start, end) in enumerate(manifest['ranges'])
+        ]
+        if executor is not None:
+            counts = list(executor.map(_normalize_range, *zip(*tasks))) if tasks else []
+        else:
+            counts = [_normalize_range(*task) for task in tasks]
+
+        paths = [_range_paths(work_dir, index) for index in range(len(tasks))]
+        _concatenate([part for part, _, _ in paths], output_path, output_columns(header), encoding)
+        _concatenate([rejects for _, rejects, _ in paths], rejects_path, header + [REJECT_REASON_COLUMN], encoding)
+        shutil.rmtree(work_dir)
+        if stats is not None:
+            for _, _, range_stats in counts:
+                stats.merge(QualityStats.from_dict(range_stats))
+        return sum(rows for rows, _, _ in counts), sum(rejected for _, rejected, _ in counts)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m addressScraper.bulk', description='Normalize the address column of a large CSV file.')
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--column', default=DEFAULT_COLUMN, help='name of the address column')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--encoding', default=DEFAULT_ENCODING)
+    parser.add_argument('--rejects', default=None, help='rejected rows output (default: <output>.rejects.csv)')
+    parser.add_argument('--checkpoint-rows', type=int, default=DEFAULT_CHECKPOINT_ROWS, help='rows per worker between checkpoints')
+    parser.add_argument('--restart', action='store_true', help='ignore checkpoints from an interrupted run')
+    parser.add_argument('--stats', default=None, help='write a data-quality report (JSON) to this path')
+    args = parser.parse_args(argv)
+
+    stats = QualityStats() if args.stats else None
+    rows, rejected = normalize_file(args.input, args.output, args.column, args.workers, args.encoding,
+                                    args.rejects, args.checkpoint_rows, not args.restart, stats)
+    print(f"AddressScraper: wrote {rows} rows to '{args.output}', {rejected} rejected rows to '{args.rejects or _default_rejects_path(args.output)}'")
+    if stats is not None:
+        with open(args.stats, 'w', encoding='utf-8') as f:
+            json.dump(stats.report(), f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
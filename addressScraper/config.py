@@ -0,0 +1,219 @@
+"""
+Immutable per-tenant parser configurations.
+
+A ParserConfig is the base tables plus small overlays: extra or overridden
+street suffixes, formal suffix forms and unit designators, and whether unit
+designators are written as their USPS abbreviations, plus an optional street
+gazetteer (addressScraper.gazetteer) of known streets. It is compiled once
+and cached by the hash of its overlays, so asking for the same overlays again
+returns the same object, and switching tenants per request is just passing a
+different config:
+
+    acme = compile_config(street_suffixes={'AVENUE': 'AV'}, unit_identifiers=['SLIP', 'DOCK'])
+    parse_address('12 Harbor Avenue Slip 4', config=acme)
+    parse_addresses(addresses, mode='process', config=acme)
+
+Configs never copy the base tables. Words an overlay does not touch are
+classified through the shared token cache, and only the overlay's own words
+are classified per config. Unit tables are built per config only when it adds
+unit designators.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import ChainMap
+from types import MappingProxyType
+
+from .addressScraper import (_ParserTables, _base_tables, _classify_token, _classify_token_miss, _classify_tokens,
+                             _formal_street_suffix_table, _street_suffix_table, _street_types, _token_cache,
+                             _token_cache_stats, _unit_designators, _unit_identifiers, _unit_number_patterns,
+                             _unit_patterns)
+from .gazetteer import StreetGazetteer
+
+_EMPTY = MappingProxyType({})
+_configs = {}
+_configs_lock = threading.Lock()
+
+
+def _normalize_mapping(mapping, name):
+    if not mapping:
+        return {}
+    if not isinstance(mapping, dict):
+        raise TypeError(f"'{name}' must be a dict of strings")
+    normalized = {}
+    for key, value in mapping.items():
+        if not isinstance(key, str) or not isinstance(value, str) or not key.strip() or not value.strip():
+            raise ValueError(f"'{name}' entries must be non-empty strings, got {key!r}: {value!r}")
+        normalized[key.strip().upper()] = value.strip().upper()
+    return normalized
+
+
+def _normalize_identifiers(identifiers):
+    if not identifiers:
+        return ()
+    if isinstance(identifiers, str):
+        raise TypeError("'unit_identifiers' must be a list of strings")
+    normalized = []
+    for identifier in identifiers:
+        if not isinstance(identifier, str) or not identifier.strip().isalnum():
+            raise ValueError(f"Unit identifiers must be single alphanumeric words, got {identifier!r}")
+        identifier = identifier.strip().upper()
+        if identifier not in _unit_designators and identifier not in normalized:
+            normalized.append(identifier)
+    return tuple(sorted(normalized))
+
+
+def _overlay_digest(street_suffixes, formal_street_suffixes, unit_identifiers, canonical_units, gazetteer, canonical_names):
+    content = json.dumps([street_suffixes, formal_street_suffixes, list(unit_identifiers), canonical_units, gazetteer,
+                          canonical_names], sort_keys=True)
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ParserConfig(_ParserTables):
+    """
+    Compiled, read-only parser tables for one set of overlays. Build with compile_config.
+
+    Attributes:
+        digest (str): Hash of the overlays; equal overlays give equal digests in every process.
+        street_suffixes, formal_street_suffixes (Mapping): The overlays.
+        unit_identifiers (tuple): Base unit designators followed by the overlay's.
+        canonical_units (bool): Whether units are written with the designator's USPS abbreviation.
+        gazetteer (StreetGazetteer): Known streets, or None.
+        canonical_names (bool): Whether number words, ordinals, SAINT and MOUNT in street names are canonicalized.
+        street_suffix_table, formal_street_suffix_table (Mapping): Overlay-over-base views.
+    """
+
+    __slots__ = ('digest', 'street_suffixes', 'formal_street_suffixes', 'street_suffix_table', '_overlay_tokens')
+
+    def __init__(self, street_suffixes, formal_street_suffixes, unit_identifiers, canonical_units, gazetteer, canonical_names,
+                 digest):
+        assign = object.__setattr__
+        assign(self, 'digest', digest)
+        assign(self, 'canonical_units', canonical_units)
+        assign(self, 'canonical_names', canonical_names)
+        # Mapped on the first parse that reads it
+        assign(self, 'gazetteer', StreetGazetteer(gazetteer) if gazetteer else None)
+        assign(self, 'street_suffixes', MappingProxyType(street_suffixes) if street_suffixes else _EMPTY)
+        assign(self, 'formal_street_suffixes', MappingProxyType(formal_street_suffixes) if formal_street_suffixes else _EMPTY)
+        assign(self, 'street_type_phrases', _base_tables.street_type_phrases)
+        assign(self, 'multi_word_street_types', _base_tables.multi_word_street_types)
+
+        # An overlay's abbreviations are canonical as they are, even where the base
+        # tables map them elsewhere (AVENUE -> AV must not turn AV into AVE)
+        overlay_table = {abbreviation: abbreviation for abbreviation in street_suffixes.values()}
+        overlay_table.update(street_suffixes)
+        if overlay_table:
+            assign(self, 'street_suffix_table', MappingProxyType(ChainMap(overlay_table, _street_suffix_table)))
+        else:
+            assign(self, 'street_suffix_table', _street_suffix_table)
+        if formal_street_suffixes:
+            assign(self, 'formal_street_suffix_table', MappingProxyType(ChainMap(formal_street_suffixes, _formal_street_suffix_table)))
+        else:
+            assign(self, 'formal_street_suffix_table', _formal_street_suffix_table)
+
+        # Only the overlay's own words classify differently from the base tables
+        street_types = _street_types | frozenset(overlay_table)
+        overlay_tokens = MappingProxyType({
+            word: _classify_token(word, street_types, overlay_table) for word in overlay_table
+        })
+        assign(self, '_overlay_tokens', overlay_tokens)
+        assign(self, 'classify_tokens', self._classify_overlay_tokens if overlay_tokens else _classify_tokens)
+
+        if unit_identifiers:
+            # Added designators have no abbreviation of their own
+            designators = dict(_unit_designators)
+            designators.update((identifier, identifier) for identifier in unit_identifiers)
+            pre_unit_number_res, post_unit_number_res = _unit_number_patterns(designators)
+            unit_identifier_re, unit_re = _unit_patterns(designators)
+            assign(self, 'unit_identifiers', _unit_identifiers + unit_identifiers)
+            assign(self, 'unit_designators', MappingProxyType(designators))
+            assign(self, 'unit_identifier_re', unit_identifier_re)
+            assign(self, 'unit_re', unit_re)
+            assign(self, 'pre_unit_number_res', pre_unit_number_res)
+            assign(self, 'post_unit_number_res', post_unit_number_res)
+        else:
+            for name in ('unit_identifiers', 'unit_designators', 'unit_identifier_re', 'unit_re', 'pre_unit_number_res',
+                         'post_unit_number_res'):
+                assign(self, name, getattr(_base_tables, name))
+
+    def _classify_overlay_tokens(self, words):
+        overlay_get = self._overlay_tokens.get
+        cache_get = _token_cache.get
+        _token_cache_stats['lookups'] += len(words)
+        return [overlay_get(word) or cache_get(word) or _classify_token_miss(word) for word in words]
+
+    def __setattr__(self, name, value):
+        raise AttributeError('ParserConfig is read-only')
+
+    def __reduce__(self):
+        # Rebuilt (or found in the cache) by compile_config in the receiving process
+        return (compile_config, (dict(self.street_suffixes), dict(self.formal_street_suffixes),
+                                 self.unit_identifiers[len(_unit_identifiers):], self.canonical_units,
+                                 self.gazetteer.path if self.gazetteer is not None else None, self.canonical_names))
+
+    def __repr__(self):
+        return (f"ParserConfig(digest='{self.digest}', street_suffixes={len(self.street_suffixes)}, "
+                f"formal_street_suffixes={len(self.formal_street_suffixes)}, "
+                f"unit_identifiers={len(self.unit_identifiers) - len(_unit_identifiers)}, canonical_units={self.canonical_units}, "
+                f"gazetteer={self.gazetteer.path if self.gazetteer is not None else None!r}, "
+                f"canonical_names={self.canonical_names})")
+
+
+def compile_config(street_suffixes=None, formal_street_suffixes=None, unit_identifiers=None, canonical_units=False,
+                   gazetteer=None, canonical_names=False):
+    """
+    Compile a parser configuration from overlays on the base tables, or return the cached one.
+
+    Parameters:
+        street_suffixes (dict): Street type variant -> USPS abbreviation, added to or overriding
+            street_suffix_mapping (e.g. {'AVENUE': 'AV', 'PROMENADE': 'PROM'}).
+        formal_street_suffixes (dict): Abbreviation -> formal form for formalize_address.
+        unit_identifiers (list): Extra unit designators (e.g. ['SLIP', 'DOCK']).
+        canonical_units (bool): Write units with the designator's USPS abbreviation
+            (APARTMENT 9-316 -> APT 9-316, SUITE #100 -> STE 100).
+        gazetteer (str): Path of a street gazetteer written by addressScraper.gazetteer.build_gazetteer.
+            Known streets then take precedence over the street type rules, and addresses whose
+            street is not in it parse as before.
+        canonical_names (bool): Write number words and ordinals in street names as digits and
+            SAINT and MOUNT as ST and MT (ONE HUNDRED TWENTY-FIRST -> 121ST, SAINT JOHNS -> ST JOHNS).
+
+    Returns:
+        ParserConfig: Shared, immutable and safe to use from any thread.
+
+    Ex: compile_config(street_suffixes={'AVENUE': 'AV'}) is compile_config(street_suffixes={'avenue': 'av'}) -> True
+    """
+    street_suffixes = _normalize_mapping(street_suffixes, 'street_suffixes')
+    formal_street_suffixes = _normalize_mapping(formal_street_suffixes, 'formal_street_suffixes')
+    unit_identifiers = _normalize_identifiers(unit_identifiers)
+    canonical_units = bool(canonical_units)
+    canonical_names = bool(canonical_names)
+    if isinstance(gazetteer, StreetGazetteer):
+        gazetteer = gazetteer.path
+    elif gazetteer is not None:
+        gazetteer = os.path.abspath(os.fspath(gazetteer))
+    # A gazetteer rebuilt in place compiles to a new config
+    gazetteer_version = None
+    if gazetteer is not None:
+        stat = os.stat(gazetteer)
+        gazetteer_version = [gazetteer, stat.st_size, stat.st_mtime_ns]
+    digest = _overlay_digest(street_suffixes, formal_street_suffixes, unit_identifiers, canonical_units, gazetteer_version,
+                             canonical_names)
+
+    config = _configs.get(digest)
+    if config is None:
+        config = ParserConfig(street_suffixes, formal_street_suffixes, unit_identifiers, canonical_units, gazetteer,
+                              canonical_names, digest)
+        with _configs_lock:
+            config = _configs.setdefault(digest, config)
+    return config
+
+
+def config_cache_info():
+    """
+    Digests of the configs compiled in this process.
+    """
+    return sorted(_configs)
+
+
+DEFAULT_CONFIG = compile_config()
@@ -0,0 +1,379 @@
+"""
+Differential regression runner.
+
+Parses one corpus with two parsers side by side and reports which fields of
+which rows would change, together with the parse throughput of each side, so
+a change to the suffix tables or parsing steps can be checked against a large
+corpus in one pass before it ships:
+
+    python -m addressScraper.diff addresses.csv --column address --baseline git:v1.2.0 --candidate current --workers 8
+
+A parser is named by a spec:
+    current          this copy of addressScraper
+    git:<revision>   addressScraper as of a revision of this repository
+    <directory>      another checkout (the directory holding addressScraper/, or the package itself)
+    module:function  any importable callable taking an address and returning a result dict
+
+Either side can also be given a configuration, as compile_config keyword
+arguments, to compare tenant configurations of one version or the same
+configuration across versions:
+
+    python -m addressScraper.diff addresses.txt --candidate-config '{"canonical_units": true}'
+
+A row that raises on one side counts as a difference in the 'error' field
+(with the exception in the samples) instead of stopping the run.
+
+The corpus is read in chunks and each worker parses a chunk with both parsers,
+so memory stays bounded for any corpus size.
+"""
+import argparse
+import functools
+import hashlib
+import importlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .addressScraper import RESULT_FIELDS, parse_address
+from .quality import _read_addresses
+from .rejects import describe_error
+
+CURRENT = 'current'
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_SAMPLE_SIZE = 20
+# Field name used when one side returns None and the other a result
+RESULT_PRESENCE_FIELD = 'result'
+# Field name used when a row raised on one side, or raised differently on the two
+ERROR_FIELD = 'error'
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_REPO_DIR = os.path.dirname(_PACKAGE_DIR)
+
+# Per-worker parsers set up once by _load_parsers
+_worker = {}
+
+
+def _load_package(directory):
+    """
+    Import the addressScraper package found in `directory` under a private module name,
+    so it can live next to this copy.
+    """
+    package_dir = directory if os.path.exists(os.path.join(directory, 'addressScraper.py')) \
+        else os.path.join(directory, 'addressScraper')
+    init_path = os.path.join(package_dir, '__init__.py')
+    if not os.path.exists(init_path):
+        raise ValueError(f"No addressScraper package found in '{directory}'")
+    name = '_addressScraper_' + hashlib.blake2b(os.path.abspath(package_dir).encode('utf-8'), digest_size=8).hexdigest()
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, init_path, submodule_search_locations=[package_dir])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_parser(spec, config=None):
+    """
+    Resolve a parser spec (see the module docstring) to a parse function.
+
+    git:<revision> specs must first be extracted with resolve_spec. With `config`
+    (compile_config keyword arguments), the parser is that version's parse_address
+    with the configuration compiled by that version's addressScraper.config.
+
+    Ex: load_parser('current', {'canonical_units': True})('5 Main St Apartment 2')['unitNumber'] -> 'APT 2'
+    """
+    if spec == CURRENT:
+        package = sys.modules[__package__]
+    elif os.path.isdir(spec):
+        package = _load_package(spec)
+    elif ':' in spec and not spec.startswith('git:'):
+        if config is not None:
+            raise ValueError(f"Parser spec '{spec}' takes no configuration")
+        module_name, function_name = spec.split(':', 1)
+        return getattr(importlib.import_module(module_name), function_name)
+    else:
+        raise ValueError(f"Unknown parser spec '{spec}'")
+    if config is None:
+        return package.parse_address
+    try:
+        compile_config = importlib.import_module(package.__name__ + '.config').compile_config
+    except ImportError:
+        raise ValueError(f"Parser '{spec}' has no configurations") from None
+    return functools.partial(package.parse_address, config=compile_config(**config))
+
+
+def resolve_spec(spec, work_dir):
+    """
+    Extract a git:<revision> spec's package into work_dir and return the directory spec for it.
+    Other specs are returned unchanged.
+    """
+    if not spec.startswith('git:'):
+        return spec
+    revision = spec[4:]
+    archive = subprocess.run(
+        ['git', '-C', _REPO_DIR, 'archive', '--format=tar', revision, os.path.basename(_PACKAGE_DIR)],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    if archive.returncode != 0:
+        raise ValueError(f"Cannot read addressScraper at revision '{revision}': {archive.stderr.decode().strip()}")
+    target = os.path.join(work_dir, hashlib.blake2b(revision.encode('utf-8'), digest_size=8).hexdigest())
+    with tarfile.open(fileobj=io.BytesIO(archive.stdout)) as tar:
+        if hasattr(tarfile, 'data_filter'):  # Python 3.12+, and security releases of earlier versions
+            tar.extractall(target, filter='data')
+        else:
+            tar.extractall(target)
+    return target
+
+
+def _load_parsers(baseline, candidate, baseline_config=None, candidate_config=None):
+    _worker['parsers'] = (load_parser(baseline, baseline_config), load_parser(candidate, candidate_config))
+
+
+class _RowError:
+    """
+    Stands in for the result of a row that raised.
+    """
+
+    __slots__ = ('reason',)
+
+    def __init__(self, reason):
+        self.reason = reason
+
+
+def _parse_rows(parse, addresses):
+    """
+    Parse every address, isolating rows that raise as rejects.parse_isolated does.
+    """
+    results = []
+    for address in addresses:
+        try:
+            results.append(parse(address))
+        except Exception as exc:
+            results.append(_RowError(describe_error(exc)))
+    return results
+
+
+def _sample_value(result, fields):
+    if isinstance(result, _RowError):
+        return {ERROR_FIELD: result.reason}
+    return result if result is None else {field: result.get(field) for field in fields}
+
+
+def _differences(baseline, candidate):
+    """
+    Names of the fields that differ between two results.
+    """
+    if isinstance(baseline, _RowError) or isinstance(candidate, _RowError):
+        same = isinstance(baseline, _RowError) and isinstance(candidate, _RowError) and baseline.reason == candidate.reason
+        return [] if same else [ERROR_FIELD]
+    if baseline is None or candidate is None:
+        return [RESULT_PRESENCE_FIELD] if (baseline is None) != (candidate is None) else []
+    fields = list(RESULT_FIELDS)
+    fields.extend(key for key in candidate if key not in RESULT_FIELDS)
+    fields.extend(key for key in baseline if key not in RESULT_FIELDS and key not in candidate)
+    return [field for field in fields if baseline.get(field) != candidate.get(field)]
+
+
+def _compare_chunk(start, addresses, sample_size):
+    """
+    Parse a chunk with both parsers.
+
+    Returns:
+        dict: Partial report with rows, changed rows, field counts, samples and seconds per side.
+    """
+    baseline_parse, candidate_parse = _worker['parsers']
+    started = time.perf_counter()
+    baseline_results = _parse_rows(baseline_parse, addresses)
+    baseline_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    candidate_results = _parse_rows(candidate_parse, addresses)
+    candidate_seconds = time.perf_counter() - started
+
+    fields = {}
+    samples = []
+    changed = 0
+    errors = [sum(isinstance(result, _RowError) for result in results) for results in (baseline_results, candidate_results)]
+    for offset, (baseline, candidate) in enumerate(zip(baseline_results, candidate_results)):
+        differing = _differences(baseline, candidate)
+        if not differing:
+            continue
+        changed += 1
+        for field in differing:
+            fields[field] = fields.get(field, 0) + 1
+        if len(samples) < sample_size:
+            samples.append({
+                'index': start + offset,
+                'address': addresses[offset],
+                'fields': differing,
+                'baseline': _sample_value(baseline, differing),
+                'candidate': _sample_value(candidate, differing),
+            })
+    return {
+        'rows': len(addresses),
+        'changedRows': changed,
+        'fields': fields,
+        'samples': samples,
+        'baselineErrors': errors[0],
+        'candidateErrors': errors[1],
+        'baselineSeconds': baseline_seconds,
+        'candidateSeconds': candidate_seconds,
+    }
+
+
+def _merge_report(report, partial, sample_size):
+    report['rows'] += partial['rows']
+    report['changedRows'] += partial['changedRows']
+    for field, count in partial['fields'].items():
+        report['fields'][field] = report['fields'].get(field, 0) + count
+    report['samples'].extend(partial['samples'][:sample_size - len(report['samples'])])
+    report['baselineErrors'] += partial['baselineErrors']
+    report['candidateErrors'] += partial['candidateErrors']
+    report['baselineSeconds'] += partial['baselineSeconds']
+    report['candidateSeconds'] += partial['candidateSeconds']
+
+
+def _chunked(addresses, chunk_size):
+    chunk = []
+    start = 0
+    for address in addresses:
+        chunk.append(address)
+        if len(chunk) >= chunk_size:
+            yield start, chunk
+            start += len(chunk)
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+
+def compare_parsers(addresses, baseline=CURRENT, candidate=CURRENT, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                    sample_size=DEFAULT_SAMPLE_SIZE, baseline_config=None, candidate_config=None):
+    """
+    Parse `addresses` with two parsers and report the differences.
+
+    Parameters:
+        addresses (iterable): Any iterable; it is consumed in chunks, never loaded whole.
+        baseline, candidate (str): Parser specs (see the module docstring).
+        workers (int): Worker processes, each parsing whole chunks with both parsers. 1 runs in-process.
+        sample_size (int): Changed rows to include, in input order.
+        baseline_config, candidate_config (dict): compile_config keyword arguments for that side.
+
+    Returns:
+        dict: rows, changedRows, fields (field -> rows where it changed), samples, and
+        errors (rows that raised) and rowsPerSecond (rows over the CPU time spent in
+        that side's parser) per side.
+
+    Ex: compare_parsers(addresses, baseline='git:HEAD~1')['fields'] -> {'streetType': 12, ...}
+    """
+    workers = workers or os.cpu_count() or 1
+    work_dir = tempfile.mkdtemp(prefix='addressScraper-diff-')
+    report = {
+        'baseline': baseline,
+        'candidate': candidate,
+        'baselineConfig': baseline_config,
+        'candidateConfig': candidate_config,
+        'rows': 0,
+        'changedRows': 0,
+        'fields': {},
+        'samples': [],
+        'baselineErrors': 0,
+        'candidateErrors': 0,
+        'baselineSeconds': 0.0,
+        'candidateSeconds': 0.0,
+    }
+    started = time.perf_counter()
+    try:
+        specs = (resolve_spec(baseline, work_dir), resolve_spec(candidate, work_dir), baseline_config, candidate_config)
+        chunks = _chunked(addresses, max(1, chunk_size))
+        if workers == 1:
+            _load_parsers(*specs)
+            for start, chunk in chunks:
+                _merge_report(report, _compare_chunk(start, chunk, sample_size), sample_size)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_load_parsers, initargs=specs) as executor:
+                pending = []
+                for start, chunk in chunks:
+                    pending.append(executor.submit(_compare_chunk, start, chunk, sample_size))
+                    # Keep a bounded number of chunks in flight, merged in input order
+                    while len(pending) >= workers * 2:
+                        _merge_report(report, pending.pop(0).result(), sample_size)
+                for future in pending:
+                    _merge_report(report, future.result(), sample_size)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report['elapsedSeconds'] = round(time.perf_counter() - started, 3)
+    report['changedPercent'] = round(100.0 * report['changedRows'] / report['rows'], 4) if report['rows'] else 0.0
+    report['fields'] = dict(sorted(report['fields'].items(), key=lambda item: -item[1]))
+    for side in ('baseline', 'candidate'):
+        seconds = report.pop(side + 'Seconds')
+        report[side + 'RowsPerSecond'] = round(report['rows'] / seconds, 1) if seconds else 0.0
+    return report
+
+
+def _print_report(report, out):
+    sides = [report[side] + (f" {json.dumps(report[side + 'Config'])}" if report[side + 'Config'] is not None else '')
+             for side in ('baseline', 'candidate')]
+    print(f"AddressScraper: {report['changedRows']} of {report['rows']} rows differ ({report['changedPercent']}%) "
+          f"between {sides[0]} and {sides[1]}", file=out)
+    for field, count in report['fields'].items():
+        print(f"  {field:<24} {count}", file=out)
+    print(f"AddressScraper: baseline {report['baselineRowsPerSecond']} rows/s, "
+          f"candidate {report['candidateRowsPerSecond']} rows/s, {report['elapsedSeconds']}s elapsed", file=out)
+    if report['baselineErrors'] or report['candidateErrors']:
+        print(f"AddressScraper: rows that raised: baseline {report['baselineErrors']}, "
+              f"candidate {report['candidateErrors']}", file=out)
+    for sample in report['samples']:
+        print(f"  [{sample['index']}] {sample['address']!r}", file=out)
+        print(f"      baseline:  {sample['baseline']}", file=out)
+        print(f"      candidate: {sample['candidate']}", file=out)
+
+
+def _config_argument(value):
+    if os.path.isfile(value):
+        with open(value, 'r', encoding='utf-8') as f:
+            value = f.read()
+    try:
+        config = json.loads(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"not JSON: {exc}")
+    if not isinstance(config, dict):
+        raise argparse.ArgumentTypeError('expected a JSON object of compile_config keyword arguments')
+    return config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m addressScraper.diff', description='Compare two parser versions over a corpus.')
+    parser.add_argument('input', help='one address per line, or a CSV with --column')
+    parser.add_argument('--column', default=None, help='address column of a CSV input')
+    parser.add_argument('--baseline', default=CURRENT, help="parser spec: 'current', 'git:<revision>', a directory or module:function")
+    parser.add_argument('--candidate', default=CURRENT, help='parser spec, as --baseline')
+    parser.add_argument('--baseline-config', type=_config_argument, default=None,
+                        help='compile_config keyword arguments for the baseline, as JSON or a JSON file')
+    parser.add_argument('--candidate-config', type=_config_argument, default=None, help='as --baseline-config')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='rows per work unit')
+    parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLE_SIZE, help='changed rows to show')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    parser.add_argument('--encoding', default='utf-8')
+    args = parser.parse_args(argv)
+
+    report = compare_parsers(_read_addresses(args.input, args.column, args.encoding), args.baseline, args.candidate,
+                             args.workers, args.chunk_size, args.samples, args.baseline_config, args.candidate_config)
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        _print_report(report, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
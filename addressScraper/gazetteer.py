@@ -0,0 +1,234 @@
+"""
+Known street names, for confirming where a street starts and ends.
+
+Without help the parser takes the rightmost street type as the end of the
+street, which splits names that contain or lack a type: "601 N BROADWAY FL 15"
+has no type at all, and "300 AVENUE OF THE AMERICAS" starts with one. A street
+gazetteer is a sorted list of the streets a tenant knows about, stored in a
+flat file of offsets and keys that is memory-mapped on first use, so every
+worker process shares the same pages. The parser looks up the longest known
+street after the street number, one token at a time, and falls back to the
+street type rules when nothing matches.
+
+    python -m addressScraper.gazetteer streets.txt streets.gaz
+    config = compile_config(gazetteer='streets.gaz')
+    parse_address('601 N Broadway FL 15', config=config)
+
+Streets are keyed by their words with street types in USPS form, so
+"Cedar Place Court" and "CEDAR PL CT" are the same entry.
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+import threading
+from bisect import bisect_left
+
+from .addressScraper import _TOKEN_STREET_TYPE, _classify_tokens, _preprocess
+from .quality import _read_addresses
+
+_MAGIC = b'ASGAZET1'
+# magic, entry count
+_HEADER = struct.Struct('<8sQ')
+_OFFSET = struct.Struct('<Q')
+# Every _INDEX_STEP-th key is kept in memory, so a search touches at most log2(_INDEX_STEP) mapped keys
+_INDEX_STEP = 64
+
+
+def street_key(street):
+    """
+    The gazetteer key of a street name: its words, with street types in USPS form.
+
+    Ex: street_key('Avenue of the Americas') -> 'AVE OF THE AMERICAS'
+    """
+    if not isinstance(street, str):
+        return None
+    words = _preprocess(street).split()
+    return ' '.join(canonical if flags & _TOKEN_STREET_TYPE else word
+                    for word, (flags, canonical) in zip(words, _classify_tokens(words))) or None
+
+
+def build_gazetteer(streets, path):
+    """
+    Write a gazetteer of `streets` to `path`, replacing any file there only once it is complete.
+
+    Returns:
+        int: Number of distinct streets written.
+    """
+    keys = sorted({key.encode('utf-8') for key in map(street_key, streets) if key})
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, len(keys)))
+        offset = 0
+        for key in keys:
+            f.write(_OFFSET.pack(offset))
+            offset += len(key)
+        f.write(_OFFSET.pack(offset))
+        for key in keys:
+            f.write(key)
+    os.replace(temporary, path)
+    return len(keys)
+
+
+class _Keys:
+    """
+    The entries of a mapped gazetteer as a read-only sequence, for bisect. Each
+    entry is copied out of the map only when it is compared.
+    """
+
+    __slots__ = ('_offsets', '_mapped', '_start')
+
+    def __init__(self, offsets, mapped, start):
+        self._offsets = offsets
+        self._mapped = mapped
+        self._start = start
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        start = self._start
+        return self._mapped[start + self._offsets[i]:start + self._offsets[i + 1]]
+
+
+class StreetGazetteer:
+    """
+    A gazetteer file, memory-mapped on the first lookup. Pickles as its path, so
+    worker processes map the same file rather than copying it.
+
+    Parameters:
+        path (str): A file written by build_gazetteer.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self._keys = None
+        self._index = None
+        self._count = 0
+        self._mapped = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._keys is not None:
+                return self._keys
+            with open(self.path, 'rb') as f:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    raise ValueError(f"'{self.path}' is not a street gazetteer")
+                magic, count = _HEADER.unpack(header)
+                if magic != _MAGIC:
+                    raise ValueError(f"'{self.path}' is not a street gazetteer")
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            data_start = _HEADER.size + (count + 1) * _OFFSET.size
+            if len(mapped) < data_start:
+                mapped.close()
+                raise ValueError(f"'{self.path}' is truncated")
+            if sys.byteorder == 'little':
+                offsets = memoryview(mapped)[_HEADER.size:data_start].cast('Q')
+            else:
+                offsets = [offset for offset, in _OFFSET.iter_unpack(mapped[_HEADER.size:data_start])]
+            if len(mapped) < data_start + offsets[count]:
+                if isinstance(offsets, memoryview):
+                    offsets.release()
+                mapped.close()
+                raise ValueError(f"'{self.path}' is truncated")
+            keys = _Keys(offsets, mapped, data_start)
+            self._index = [keys[i] for i in range(0, count, _INDEX_STEP)]
+            self._count = count
+            self._mapped = mapped
+            self._keys = keys
+            return keys
+
+    def _search(self, key):
+        """
+        Position of the first entry not below `key`.
+        """
+        keys = self._keys if self._keys is not None else self._load()
+        block = bisect_left(self._index, key)
+        if block == 0:
+            return 0
+        return bisect_left(keys, key, (block - 1) * _INDEX_STEP + 1, min(block * _INDEX_STEP, self._count))
+
+    def __len__(self):
+        if self._keys is None:
+            self._load()
+        return self._count
+
+    def __contains__(self, street):
+        key = street_key(street)
+        if not key:
+            return False
+        key = key.encode('utf-8')
+        i = self._search(key)
+        return i < self._count and self._keys[i] == key
+
+    def longest_match(self, keys, start):
+        """
+        The end of the longest known street that starts at keys[start], or None.
+
+        The entry just below the rest of the address is usually the answer. When it is
+        not, the longest street can only be a prefix of what the two have in common, so
+        the search repeats on that, and each search drops at least one word.
+
+        Parameters:
+            keys (list): Street keys of an address's words (see street_key).
+            start (int): Position of the first word.
+
+        Ex: longest_match(['300', 'AVE', 'OF', 'THE', 'AMERICAS'], 1) -> 5
+        """
+        text = ' '.join(keys[start:]).encode('utf-8')
+        while text:
+            i = self._search(text)
+            entries = self._keys
+            if i < self._count and entries[i] == text:
+                return start + text.count(b' ') + 1
+            if i == 0:
+                return None
+            below = entries[i - 1]
+            if text.startswith(below) and text[len(below):len(below) + 1] == b' ':
+                return start + below.count(b' ') + 1
+            # Shorten to the whole words the entry below shares with the text
+            shared = 0
+            for a, b in zip(below, text):
+                if a != b:
+                    break
+                shared += 1
+            text = text[:shared] if text[shared:shared + 1] == b' ' else text[:max(text.rfind(b' ', 0, shared), 0)]
+        return None
+
+    def close(self):
+        """
+        Release the memory map; the next lookup maps the file again.
+        """
+        with self._lock:
+            if self._mapped is not None:
+                if isinstance(self._keys._offsets, memoryview):
+                    self._keys._offsets.release()
+                self._keys = None
+                self._index = None
+                self._mapped.close()
+                self._mapped = None
+
+    def __reduce__(self):
+        return (StreetGazetteer, (self.path,))
+
+    def __repr__(self):
+        return f"StreetGazetteer('{self.path}')"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m addressScraper.gazetteer', description='Build a street gazetteer from a file of street names.')
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--column', default=None, help='street column of a CSV input (default: one street per line)')
+    parser.add_argument('--encoding', default='utf-8')
+    args = parser.parse_args(argv)
+
+    count = build_gazetteer(_read_addresses(args.input, args.column, args.encoding), args.output)
+    print(f"{count} streets written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
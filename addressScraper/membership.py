@@ -0,0 +1,215 @@
+"""
+Compact probabilistic membership for "is this address in our master list".
+
+AddressBloomFilter stores normalized addresses (the same value
+normalize_address returns, so STREET/ST, NORTH/N and similar variants all hit)
+in a Bloom filter with a configurable false-positive rate. Filters are saved
+to a flat file that load() memory-maps, so many processes can share one
+filter without each loading it into memory. A 100M-address filter at a 1%
+false-positive rate takes about 120 MB.
+
+    bloom = AddressBloomFilter.build(master_list, false_positive_rate=0.001, mode='process')
+    bloom.save('master.bloom')
+    bloom = AddressBloomFilter.load('master.bloom')
+    bloom.contains_many(['1234 Main Street', '55 W Wacker Drive Ste 201'])
+"""
+import hashlib
+import math
+import mmap
+import struct
+
+from .batch import parse_addresses
+
+_MAGIC = b'ASBLOOM1'
+# magic, bit count, hash count, item count, key field length
+_HEADER = struct.Struct('<8sQIQH')
+_MASK64 = (1 << 64) - 1
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
+KEY_FIELDS = ('address', 'addressUnit')
+
+
+class AddressBloomFilter:
+    """
+    Bloom filter keyed on normalized addresses.
+
+    Parameters:
+        capacity (int): Expected number of distinct addresses.
+        false_positive_rate (float): Target false-positive rate at that capacity.
+        field (str): Result field used as the key: 'address' (no unit, as normalize_address)
+            or 'addressUnit' (with the unit, falling back to 'address' when there is none).
+    """
+
+    def __init__(self, capacity, false_positive_rate=DEFAULT_FALSE_POSITIVE_RATE, field='address'):
+        if field not in KEY_FIELDS:
+            raise ValueError(f"Key field must be one of {KEY_FIELDS}, not '{field}'")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+        capacity = max(1, int(capacity))
+        self.bit_count = max(8, int(math.ceil(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, int(round(self.bit_count / capacity * math.log(2))))
+        self.field = field
+        self.count = 0
+        self._bits = bytearray((self.bit_count + 7) // 8)
+        self._mapped = None
+
+    @classmethod
+    def build(cls, addresses, false_positive_rate=DEFAULT_FALSE_POSITIVE_RATE, field='address', **batch_options):
+        """
+        Build a filter sized for `addresses` and add them all.
+
+        Extra keyword arguments (mode, workers, chunk_size) go to parse_addresses.
+        """
+        addresses = list(addresses)
+        bloom = cls(len(addresses), false_positive_rate, field)
+        bloom.add_many(addresses, **batch_options)
+        return bloom
+
+    def _key(self, result):
+        if result is None:
+            return None
+        if self.field == 'addressUnit':
+            return result['addressUnit'] or result['address']
+        return result['address']
+
+    def _open_bits(self):
+        if self._bits is None:
+            raise ValueError("filter is closed")
+        return self._bits
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        m = self.bit_count
+        return [((h1 + i * h2) & _MASK64) % m for i in range(self.hash_count)]
+
+    def add_normalized(self, key):
+        """
+        Add an already normalized address.
+        """
+        if self._mapped is not None:
+            raise TypeError("A memory-mapped filter is read-only")
+        bits = self._open_bits()
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def contains_normalized(self, key):
+        """
+        Check an already normalized address.
+        """
+        bits = self._open_bits()
+        for position in self._positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def add(self, address):
+        """
+        Normalize and add one address. Returns False if it had no normalized form.
+        """
+        return self.add_many([address]) == 1
+
+    def add_many(self, addresses, **batch_options):
+        """
+        Normalize and add many addresses through the batch parser.
+
+        Returns:
+            int: Number of addresses added (those with a normalized form).
+        """
+        self._open_bits()
+        added = 0
+        for result in parse_addresses(addresses, **batch_options):
+            key = self._key(result)
+            if key:
+                self.add_normalized(key)
+                added += 1
+        return added
+
+    def contains(self, address):
+        return self.contains_many([address])[0]
+
+    def __contains__(self, address):
+        return self.contains(address)
+
+    def contains_many(self, addresses, **batch_options):
+        """
+        Normalize and look up many addresses through the batch parser.
+
+        Returns:
+            list: True for each address that is probably in the filter, False if it is
+            definitely not (or has no normalized form).
+        """
+        self._open_bits()
+        found = []
+        for result in parse_addresses(addresses, **batch_options):
+            key = self._key(result)
+            found.append(bool(key) and self.contains_normalized(key))
+        return found
+
+    def expected_false_positive_rate(self):
+        """
+        False-positive rate for the number of addresses added so far.
+        """
+        return (1 - math.exp(-self.hash_count * self.count / self.bit_count)) ** self.hash_count
+
+    def save(self, path):
+        """
+        Write the filter to `path` in the flat format that load() memory-maps.
+        """
+        field = self.field.encode('ascii')
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, self.bit_count, self.hash_count, self.count, len(field)))
+            f.write(field)
+            f.write(self._bits)
+
+    @classmethod
+    def load(cls, path, use_mmap=True):
+        """
+        Open a saved filter. With use_mmap the bit array stays in the page cache and is
+        shared by every process that loads the same file; the filter is then read-only.
+        """
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"'{path}' is not an address Bloom filter")
+            magic, bit_count, hash_count, count, field_length = _HEADER.unpack(header)
+            if magic != _MAGIC:
+                raise ValueError(f"'{path}' is not an address Bloom filter")
+            field = f.read(field_length).decode('ascii')
+            offset = _HEADER.size + field_length
+            size = (bit_count + 7) // 8
+
+            bloom = cls.__new__(cls)
+            bloom.bit_count = bit_count
+            bloom.hash_count = hash_count
+            bloom.count = count
+            bloom.field = field
+            if use_mmap:
+                bloom._mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if len(bloom._mapped) < offset + size:
+                    bloom._mapped.close()
+                    raise ValueError(f"'{path}' is truncated")
+                bloom._bits = memoryview(bloom._mapped)[offset:offset + size]
+            else:
+                bloom._mapped = None
+                bloom._bits = bytearray(f.read(size))
+                if len(bloom._bits) < size:
+                    raise ValueError(f"'{path}' is truncated")
+        return bloom
+
+    def close(self):
+        """
+        Release the memory map of a loaded filter; lookups then raise ValueError.
+        """
+        if self._mapped is not None:
+            self._bits.release()
+            self._mapped.close()
+            self._mapped = None
+            self._bits = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
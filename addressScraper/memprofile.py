@@ -0,0 +1,251 @@
+"""
+Memory profiling of batch parsing with tracemalloc.
+
+Sizes worker memory and picks chunk sizes and output representations from
+measurements instead of guesses. profile_memory traces a batch and reports:
+
+    steps             per record and parse step: the peak bytes the step has
+                      allocated at once (its lists, joins and regex matches)
+                      and the bytes still held by its output
+    chunks            per chunk of the batch path: the peak traced bytes while
+                      parsing it, and the bytes its results hold
+    representations   retained bytes per stored result as result dicts, as
+                      slotted records and as parse_addresses_columnar columns
+
+    profile = profile_memory(addresses, chunk_size=1000)
+    profile.steps['parse']['peakBytes']
+
+    python -m addressScraper.memprofile addresses.csv --column address --chunk-size 1000
+
+tracemalloc sees the Python heap of this process only, so chunks are parsed
+here, as parse_addresses(mode='serial') parses them; a thread or process
+worker holds about one chunk's peak per chunk in flight. maxResidentBytes is
+the process's peak resident set, for comparison with the traced figures.
+Tracing slows parsing several times over, so profile a sample of the batch.
+Profiling needs Python 3.9 or later (tracemalloc.reset_peak).
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from collections import namedtuple
+from itertools import islice
+
+try:
+    import resource
+except ImportError:  # Not on Windows
+    resource = None
+
+from .addressScraper import (
+    FINGERPRINT_FIELDS,
+    RESULT_FIELDS,
+    _add_fingerprints,
+    _base_tables,
+    _parse_preprocessed,
+    _preprocess,
+    parse_addresses_preprocessed,
+)
+from .batch import DEFAULT_CHUNK_SIZE, _chunks, _parse_chunk, parse_addresses_columnar
+from .quality import _read_addresses
+
+PROFILE_STEPS = ('preprocess', 'tokenize', 'parse', 'fingerprint')
+REPRESENTATIONS = ('dict', 'record', 'columnar')
+# Addresses profiled step by step and stored in each representation
+DEFAULT_SAMPLE_SIZE = 2000
+
+MemoryProfile = namedtuple('MemoryProfile', ['records', 'steps', 'chunks', 'representations', 'maxResidentBytes'])
+MemoryProfile.__doc__ = """
+Memory use of parsing a batch, in bytes.
+
+    records (int): Addresses profiled.
+    steps (dict): Step name (PROFILE_STEPS) -> {'peakBytes', 'retainedBytes'}, means per record.
+        'parse' is the whole component parse of a preprocessed address, including its
+        own tokenizing and the result dict; 'fingerprint' is only present with fingerprintBits.
+    chunks (list): {'start', 'records', 'peakBytes', 'retainedBytes'} per chunk.
+    representations (dict): Representation name (REPRESENTATIONS) -> retained bytes per stored result.
+    maxResidentBytes (int): Peak resident set of the process, or None where it is not available.
+"""
+
+
+def _require_reset_peak():
+    if not hasattr(tracemalloc, 'reset_peak'):
+        raise RuntimeError("Memory profiling needs Python 3.9 or later (tracemalloc.reset_peak)")
+
+
+def _record_class(fields):
+    """
+    A __slots__ class with one attribute per result field, the compact alternative to a dict per result.
+    """
+    def __init__(self, result):
+        for field in fields:
+            setattr(self, field, result[field])
+    return type('ParsedRecord', (), {'__slots__': fields, '__init__': __init__})
+
+
+def _traced():
+    return tracemalloc.get_traced_memory()[0]
+
+
+def _profile_steps(addresses, fingerprintBits, tables):
+    """
+    Mean peak and retained bytes per record of each parse step, run one record at a time.
+    """
+    steps = [
+        ('preprocess', _preprocess),
+        ('tokenize', lambda prepared: tables.classify_tokens(prepared.split())),
+        ('parse', lambda prepared: _parse_preprocessed(prepared, False, None, tables)),
+    ]
+    if fingerprintBits:
+        steps.append(('fingerprint', lambda result: _add_fingerprints(result, fingerprintBits)))
+    totals = {name: [0, 0] for name, _ in steps}
+    records = 0
+    for address in addresses:
+        if not isinstance(address, str) or not address.strip():
+            continue
+        prepared = _preprocess(address)
+        inputs = {'preprocess': address, 'tokenize': prepared, 'parse': prepared}
+        result = None
+        for name, step in steps:
+            if name == 'fingerprint':
+                if result is None:
+                    continue
+                inputs[name] = result
+            before = _traced()
+            tracemalloc.reset_peak()
+            output = step(inputs[name])
+            current, peak = tracemalloc.get_traced_memory()
+            totals[name][0] += peak - before
+            totals[name][1] += current - before
+            if name == 'parse':
+                result = output
+            del output
+        records += 1
+    return {
+        name: {'peakBytes': peak / max(records, 1), 'retainedBytes': retained / max(records, 1)}
+        for name, (peak, retained) in totals.items()
+    }
+
+
+def _retained(build):
+    """
+    Bytes still traced once build() has returned, per element of its output.
+    """
+    gc.collect()
+    before = _traced()
+    stored = build()
+    gc.collect()
+    retained = _traced() - before
+    count = len(next(iter(stored.values()))) if isinstance(stored, dict) else len(stored)
+    del stored
+    return retained / max(count, 1)
+
+
+def _profile_representations(addresses, fingerprintBits, config):
+    fields = RESULT_FIELDS + FINGERPRINT_FIELDS if fingerprintBits else RESULT_FIELDS
+    record_class = _record_class(fields)
+
+    def records():
+        return [record_class(result) if result is not None else None
+                for result in parse_addresses_preprocessed(addresses, False, fingerprintBits, config)]
+
+    return {
+        'dict': _retained(lambda: parse_addresses_preprocessed(addresses, False, fingerprintBits, config)),
+        'record': _retained(records),
+        'columnar': _retained(lambda: parse_addresses_columnar(addresses, fingerprintBits=fingerprintBits, config=config)),
+    }
+
+
+def _max_resident_bytes():
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+def profile_memory(addresses, chunk_size=DEFAULT_CHUNK_SIZE, sample_size=DEFAULT_SAMPLE_SIZE, fingerprintBits=None,
+                   config=None):
+    """
+    Parse a batch under tracemalloc and report its memory use (see MemoryProfile).
+
+    Parameters:
+        addresses (iterable): Address strings, as for parse_addresses.
+        chunk_size (int): Addresses per chunk, as passed to parse_addresses.
+        sample_size (int): Leading addresses profiled step by step and per representation.
+        fingerprintBits (int): 64 or 128 to profile results carrying fingerprints.
+        config (ParserConfig): Tenant configuration from addressScraper.config.
+
+    Returns:
+        MemoryProfile: Byte counts; the steps and representations are means per record.
+
+    Ex: profile_memory(addresses).representations -> {'dict': 868.4, 'record': 524.1, 'columnar': 485.3}
+    """
+    _require_reset_peak()
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    addresses = list(addresses)
+    sample = addresses[:sample_size]
+    tables = config if config is not None else _base_tables
+    # Words met for the first time are added to the token cache; that is not per-record memory
+    parse_addresses_preprocessed(sample, False, fingerprintBits, config)
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        steps = _profile_steps(sample, fingerprintBits, tables)
+        representations = _profile_representations(sample, fingerprintBits, config)
+        chunks = []
+        for start, chunk in _chunks(addresses, chunk_size):
+            gc.collect()
+            before = _traced()
+            tracemalloc.reset_peak()
+            results = _parse_chunk(chunk, False, start, False, fingerprintBits, None, config)[0]
+            current, peak = tracemalloc.get_traced_memory()
+            chunks.append({'start': start, 'records': len(chunk), 'peakBytes': peak - before,
+                           'retainedBytes': current - before})
+            del results
+    finally:
+        if started:
+            tracemalloc.stop()
+    return MemoryProfile(len(addresses), steps, chunks, representations, _max_resident_bytes())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m addressScraper.memprofile', description='Profile the memory use of parsing a file of addresses.')
+    parser.add_argument('input')
+    parser.add_argument('--column', default=None, help='address column of a CSV input (default: one address per line)')
+    parser.add_argument('--limit', type=int, default=100000, help='leading addresses profiled (0 for all)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--sample-size', type=int, default=DEFAULT_SAMPLE_SIZE, help='addresses profiled per step and representation')
+    parser.add_argument('--fingerprint-bits', type=int, default=None, choices=(64, 128))
+    parser.add_argument('--json', action='store_true', help='print the full profile, including every chunk, as JSON')
+    parser.add_argument('--encoding', default='utf-8')
+    args = parser.parse_args(argv)
+
+    addresses = _read_addresses(args.input, args.column, args.encoding)
+    if args.limit:
+        addresses = islice(addresses, args.limit)
+    profile = profile_memory(addresses, args.chunk_size, args.sample_size, args.fingerprint_bits)
+    if args.json:
+        print(json.dumps(profile._asdict(), indent=2))
+        return
+
+    print(f"{profile.records} addresses")
+    print(f"{'step':<12} {'peak B/rec':>11} {'kept B/rec':>11}")
+    for name, sizes in profile.steps.items():
+        print(f"{name:<12} {sizes['peakBytes']:>11.0f} {sizes['retainedBytes']:>11.0f}")
+    print(f"{'stored as':<12} {'B/result':>11}")
+    for name, size in profile.representations.items():
+        print(f"{name:<12} {size:>11.0f}")
+    peaks = [chunk['peakBytes'] for chunk in profile.chunks]
+    if peaks:
+        print(f"{len(peaks)} chunks of {args.chunk_size}: peak {max(peaks) / 1024:.0f} KiB, "
+              f"mean {sum(peaks) / len(peaks) / 1024:.0f} KiB")
+    if profile.maxResidentBytes is not None:
+        print(f"process peak resident set: {profile.maxResidentBytes / 2**20:.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
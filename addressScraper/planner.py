@@ -0,0 +1,355 @@
+"""
+Execution planning for parse_addresses(mode='auto').
+
+Which batch mode is fastest depends on the machine and the batch: a process
+pool loses to serial parsing for a few thousand addresses and wins by a wide
+margin for millions, and threads only scale on free-threaded builds. The
+planner estimates the run time of every mode and picks the cheapest. It uses
+these measurements:
+
+    parse cost per address      on a sample of the batch being planned
+    thread scaling              the reference sample parsed on a thread pool
+    pool start-up               thread and process pools, per worker
+    task overhead               one round trip of a chunk to a warm pool
+    transfer cost per address   pickling in the parent (process) or decoding
+                                shared-memory records (shared_memory)
+
+Everything except the batch sample is measured once per machine and Python
+build and cached in <cache dir>/addressScraper/calibration.json (the cache dir
+is $ADDRESSSCRAPER_CACHE_DIR, $XDG_CACHE_HOME or ~/.cache). The decision is
+logged at INFO level on the 'addressScraper.planner' logger. A mode given to
+parse_addresses is used as is, and workers or chunk_size given with
+mode='auto' are kept in the plan.
+
+    parse_addresses(addresses, mode='auto')
+    plan_execution(addresses)   # ExecutionPlan(mode='process', workers=16, chunk_size=2000, ...)
+
+    python -m addressScraper.planner --count 5000000 [--recalibrate]
+"""
+import argparse
+import json
+import logging
+import os
+import pickle
+import platform
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .addressScraper import parse_addresses_preprocessed
+from .sharedmem import decode_results, encode_results, shared_memory
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever what calibrate() measures changes, so older cached calibrations are not used
+CALIBRATION_VERSION = 1
+PLANNED_MODES = ('serial', 'thread', 'process', 'shared_memory')
+# Addresses of the batch parsed to estimate its per-address cost
+SAMPLE_SIZE = 256
+# Largest share of a chunk's parse time its task overhead may take
+MAX_TASK_OVERHEAD = 0.05
+# Chunks per worker at least, so a slow chunk does not leave the other workers idle
+MIN_CHUNKS_PER_WORKER = 4
+MAX_CHUNK_SIZE = 20000
+
+ExecutionPlan = namedtuple('ExecutionPlan', ['mode', 'workers', 'chunk_size', 'estimated_seconds', 'estimates'])
+ExecutionPlan.__doc__ = """
+How parse_addresses(mode='auto') runs a batch.
+
+    mode (str): One of PLANNED_MODES.
+    workers (int): Pool size (1 for serial).
+    chunk_size (int): Addresses per pool task (None for serial).
+    estimated_seconds (float): Estimated run time of the chosen mode.
+    estimates (dict): Estimated run time of every mode considered.
+"""
+
+_calibration = None
+_calibration_lock = threading.Lock()
+
+
+def _reference_addresses():
+    """
+    A fixed, varied sample for the machine-level measurements.
+    """
+    names = ['MAIN', 'OAK', 'LAKE SHORE', 'MARTIN LUTHER KING', '5TH', 'WASHINGTON', 'CEDAR', 'GEIST WOODS']
+    types = ['St', 'Avenue', 'DR', 'Boulevard', 'Ct', 'Highway', 'PKWY', 'Lane']
+    units = ['', '', 'Apt 2B', 'Suite 100', 'Unit #200', 'FL 15']
+    directions = ['', '', 'N', 'South', 'NE']
+    return [
+        ' '.join(part for part in [str(100 + 37 * i), directions[i % 5], names[i % 8], types[i % 7], directions[i % 3],
+                                   units[i % 6]] if part)
+        for i in range(512)
+    ]
+
+
+def _available_cpus():
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _gil_enabled():
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled() if is_gil_enabled is not None else True
+
+
+def _machine_key():
+    return '|'.join([platform.node(), platform.machine(), str(_available_cpus()), sys.version.split()[0],
+                     'gil' if _gil_enabled() else 'nogil', str(CALIBRATION_VERSION)])
+
+
+def _cache_path():
+    directory = (os.environ.get('ADDRESSSCRAPER_CACHE_DIR') or
+                 os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                              'addressScraper'))
+    return os.path.join(directory, 'calibration.json')
+
+
+def _read_cache(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(path, entries):
+    # Best effort: planning works without a writable cache, it just calibrates again next process
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+        os.replace(temporary, path)
+    except OSError:
+        pass
+
+
+def _best_of(function, repeat=3):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _parse_slice(addresses):
+    return parse_addresses_preprocessed(addresses)
+
+
+def _noop(value):
+    return value
+
+
+def _pool_costs(executor_class, workers, sample):
+    """
+    Seconds to start a pool of `workers` and get one task back from each, and one
+    task's round trip on the warm pool.
+    """
+    started = time.perf_counter()
+    with executor_class(max_workers=workers) as executor:
+        list(executor.map(_noop, range(workers)))
+        start_seconds = time.perf_counter() - started
+        tasks = 4 * workers
+        task_seconds = _best_of(lambda: list(executor.map(_noop, [sample[:1]] * tasks))) / tasks * workers
+    return start_seconds, task_seconds
+
+
+def calibrate():
+    """
+    Measure this machine's costs (see the module docstring), without the cache.
+
+    Returns:
+        dict: Seconds per address, per pool start and per task; None where a mode is unavailable.
+    """
+    sample = _reference_addresses()
+    cpus = _available_cpus()
+    _parse_slice(sample)
+    parse_seconds = _best_of(lambda: _parse_slice(sample)) / len(sample)
+
+    threads = min(cpus, 4)
+    thread_speedup = 1.0
+    thread_start_seconds, thread_task_seconds = _pool_costs(ThreadPoolExecutor, threads, sample)
+    if threads > 1:
+        size = -(-len(sample) // threads)
+        slices = [sample[start:start + size] for start in range(0, len(sample), size)]
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            threaded = _best_of(lambda: list(executor.map(_parse_slice, slices)))
+        thread_speedup = parse_seconds * len(sample) / threaded
+
+    results = _parse_slice(sample)
+
+    def transfer():
+        # The parent pickles every chunk out and unpickles every result, serially
+        pickle.dumps(sample, pickle.HIGHEST_PROTOCOL)
+        pickle.loads(pickle.dumps(results, pickle.HIGHEST_PROTOCOL))
+    process_transfer_seconds = _best_of(transfer) / len(sample)
+    process_start_seconds = process_task_seconds = shared_memory_transfer_seconds = None
+    # A process pool cannot beat serial parsing on one CPU, so it is not measured there
+    if cpus > 1:
+        process_start_seconds, process_task_seconds = _pool_costs(ProcessPoolExecutor, cpus, sample)
+        if shared_memory is not None:
+            header, text = encode_results(results)
+            shared_memory_transfer_seconds = _best_of(lambda: decode_results(header, text)) / len(sample)
+
+    return {
+        'cpus': cpus,
+        'parseSeconds': parse_seconds,
+        'threadWorkers': threads,
+        'threadSpeedup': thread_speedup,
+        'threadStartSecondsPerWorker': thread_start_seconds / threads,
+        'threadTaskSeconds': thread_task_seconds,
+        'processStartSecondsPerWorker': process_start_seconds / cpus if process_start_seconds is not None else None,
+        'processTaskSeconds': process_task_seconds,
+        'processTransferSeconds': process_transfer_seconds,
+        'sharedMemoryTransferSeconds': shared_memory_transfer_seconds,
+        'calibratedAt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def get_calibration(recalibrate=False):
+    """
+    This machine's calibration: from memory, else from the cache file, else measured and cached.
+    """
+    global _calibration
+    with _calibration_lock:
+        if _calibration is not None and not recalibrate:
+            return _calibration
+        path = _cache_path()
+        entries = _read_cache(path)
+        key = _machine_key()
+        calibration = entries.get(key) if not recalibrate else None
+        if calibration is None:
+            calibration = calibrate()
+            logger.info("Calibrated batch execution for %s: %s", key, calibration)
+            entries[key] = calibration
+            _write_cache(path, entries)
+        _calibration = calibration
+        return calibration
+
+
+def _speedup(calibration, workers):
+    """
+    Thread speedup at `workers` threads, by Amdahl's law from the one measured.
+    """
+    measured = calibration['threadSpeedup']
+    threads = calibration['threadWorkers']
+    if threads <= 1 or measured <= 1:
+        return 1.0
+    parallel = min(1.0, (1 - 1 / measured) / (1 - 1 / threads))
+    return 1 / ((1 - parallel) + parallel / workers)
+
+
+def _chunk_size(count, workers, parse_seconds, task_seconds):
+    # Large enough that task overhead stays small, small enough that every worker gets several chunks
+    amortized = int(task_seconds / (parse_seconds * MAX_TASK_OVERHEAD)) + 1
+    balanced = -(-count // (workers * MIN_CHUNKS_PER_WORKER))
+    return max(1, min(amortized, balanced, MAX_CHUNK_SIZE))
+
+
+def _sample_parse_seconds(addresses):
+    step = max(1, len(addresses) // SAMPLE_SIZE)
+    sample = addresses[::step][:SAMPLE_SIZE]
+    started = time.perf_counter()
+    parse_addresses_preprocessed(sample)
+    return (time.perf_counter() - started) / len(sample)
+
+
+def plan_execution(addresses, workers=None, chunk_size=None, calibration=None):
+    """
+    Choose the batch mode, pool size and chunk size that should parse `addresses` soonest.
+
+    Parameters:
+        addresses (list): The batch.
+        workers (int): Pool size to plan with instead of the available CPUs.
+        chunk_size (int): Chunk size to plan with instead of the planner's choice.
+        calibration (dict): Machine costs to plan with (default: get_calibration()).
+
+    Returns:
+        ExecutionPlan
+    """
+    count = len(addresses)
+    calibration = calibration or get_calibration()
+    cpus = calibration['cpus']
+    parse_seconds = calibration['parseSeconds']
+    serial_seconds = count * parse_seconds
+    estimates = {'serial': serial_seconds}
+    options = {'serial': (1, None)}
+
+    # No pool can finish before it has started; otherwise measure what this batch costs to parse
+    pool_start = min(calibration['threadStartSecondsPerWorker'], calibration['processStartSecondsPerWorker'] or float('inf'))
+    if count > SAMPLE_SIZE and serial_seconds > pool_start:
+        parse_seconds = _sample_parse_seconds(addresses)
+        serial_seconds = estimates['serial'] = count * parse_seconds
+
+        thread_workers = workers or cpus
+        thread_chunk = chunk_size or _chunk_size(count, thread_workers, parse_seconds, calibration['threadTaskSeconds'])
+        estimates['thread'] = (thread_workers * calibration['threadStartSecondsPerWorker'] +
+                               serial_seconds / _speedup(calibration, thread_workers) +
+                               -(-count // thread_chunk) * calibration['threadTaskSeconds'] / thread_workers)
+        options['thread'] = (thread_workers, thread_chunk)
+
+        if calibration['processStartSecondsPerWorker'] is not None:
+            process_workers = workers or cpus
+            parallel = min(process_workers, cpus)
+            process_chunk = chunk_size or _chunk_size(count, parallel, parse_seconds, calibration['processTaskSeconds'])
+            pool_seconds = (process_workers * calibration['processStartSecondsPerWorker'] + serial_seconds / parallel +
+                            -(-count // process_chunk) * calibration['processTaskSeconds'] / parallel)
+            estimates['process'] = pool_seconds + count * calibration['processTransferSeconds']
+            options['process'] = (process_workers, process_chunk)
+            if calibration['sharedMemoryTransferSeconds'] is not None:
+                estimates['shared_memory'] = pool_seconds + count * calibration['sharedMemoryTransferSeconds']
+                options['shared_memory'] = (process_workers, process_chunk)
+
+    # Ties go to the simpler mode, in PLANNED_MODES order
+    mode = min(estimates, key=lambda name: (estimates[name], PLANNED_MODES.index(name)))
+    plan_workers, plan_chunk = options[mode]
+    plan = ExecutionPlan(mode, plan_workers, plan_chunk, estimates[mode], estimates)
+    logger.info("Planned %d addresses as mode=%s workers=%d chunk_size=%s (estimated %.3fs; %s)", count, mode,
+                plan_workers, plan_chunk, plan.estimated_seconds,
+                ', '.join(f'{name} {seconds:.3f}s' for name, seconds in estimates.items()))
+    return plan
+
+
+class _Repeated:
+    """
+    A sequence of `count` addresses cycling through `sample`, without building it.
+    """
+
+    def __init__(self, sample, count):
+        self._sample = sample
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._sample[i % len(self._sample)] for i in range(*index.indices(self._count))]
+        return self._sample[index % len(self._sample)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m addressScraper.planner', description='Show this machine\'s calibration and the plan for a batch size.')
+    parser.add_argument('--count', type=int, action='append', help='batch size to plan (repeatable)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--recalibrate', action='store_true', help='measure again and replace the cached calibration')
+    args = parser.parse_args(argv)
+
+    calibration = get_calibration(args.recalibrate)
+    print(json.dumps(calibration, indent=2, sort_keys=True))
+    print(f"cache: {_cache_path()}")
+    sample = _reference_addresses()
+    for count in args.count or [1000, 100000, 10000000]:
+        # The reference sample stands in for a batch of this size
+        plan = plan_execution(_Repeated(sample, count), args.workers, calibration=calibration)
+        print(f"{count:>10} addresses: mode={plan.mode} workers={plan.workers} chunk_size={plan.chunk_size} "
+              f"estimated {plan.estimated_seconds:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+"""
+Streaming data-quality statistics.
+
+QualityStats is updated with each (address, result) pair as the batch, bulk
+and streaming modes parse, so a daily report needs no second pass. Memory is
+constant: plain counters, a Misra-Gries top-k summary of the words the parser
+had to assume were street types, and a reservoir sample of incomplete rows.
+Every part merges, so per-worker stats combine into one report at the end.
+
+    stats = QualityStats()
+    parse_addresses(addresses, mode='process', stats=stats)
+    stats.report()
+
+    python -m addressScraper.quality addresses.csv --column address --mode process
+"""
+import argparse
+import csv
+import json
+import random
+import sys
+
+from .addressScraper import WARNING_CATEGORIES, _assumed_street_type, _base_tables, _preprocess, warning_categories
+from .batch import parse_addresses
+
+DEFAULT_TOP_K = 50
+DEFAULT_SAMPLE_SIZE = 100
+
+
+class TopK:
+    """
+    Misra-Gries heavy-hitters summary holding at most `capacity` counters.
+
+    Counts are lower bounds, each at most total / (capacity + 1) below the true
+    count, so every item seen more often than that is kept.
+    """
+
+    def __init__(self, capacity=DEFAULT_TOP_K):
+        self.capacity = max(1, capacity)
+        self.total = 0
+        self.counts = {}
+
+    def add(self, item, count=1):
+        self.total += count
+        counts = self.counts
+        if item in counts or len(counts) < self.capacity:
+            counts[item] = counts.get(item, 0) + count
+            return
+        decrement = min(count, min(counts.values()))
+        for key in list(counts):
+            counts[key] -= decrement
+            if counts[key] <= 0:
+                del counts[key]
+        if count > decrement:
+            counts[item] = count - decrement
+
+    def merge(self, other):
+        """
+        Fold another summary into this one (Agarwal et al., mergeable summaries).
+        """
+        self.total += other.total
+        counts = self.counts
+        for item, count in other.counts.items():
+            counts[item] = counts.get(item, 0) + count
+        if len(counts) > self.capacity:
+            cutoff = sorted(counts.values(), reverse=True)[self.capacity]
+            self.counts = {item: count - cutoff for item, count in counts.items() if count > cutoff}
+        return self
+
+    def top(self, n=None):
+        """
+        Items by estimated count, most frequent first.
+        """
+        return sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+
+class Reservoir:
+    """
+    Uniform random sample of at most `size` items from a stream (Algorithm R).
+    """
+
+    def __init__(self, size=DEFAULT_SAMPLE_SIZE, seed=None):
+        self.size = max(0, size)
+        self.seen = 0
+        self.items = []
+        self._random = random.Random(seed)
+
+    def add(self, item):
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+        else:
+            slot = self._random.randrange(self.seen)
+            if slot < self.size:
+                self.items[slot] = item
+
+    def merge(self, other):
+        """
+        Combine two samples into one sample of the union, drawing from each side in proportion to how many items it saw.
+        """
+        if not other.seen:
+            return self
+        mine, theirs = list(self.items), list(other.items)
+        # Each sampled item stands for seen / len(items) items of its stream
+        my_weight, their_weight = float(self.seen), float(other.seen)
+        my_step = my_weight / len(mine) if mine else 0.0
+        their_step = their_weight / len(theirs) if theirs else 0.0
+        merged = []
+        while len(merged) < self.size and (mine or theirs):
+            if mine and (not theirs or self._random.random() * (my_weight + their_weight) < my_weight):
+                merged.append(mine.pop(self._random.randrange(len(mine))))
+                my_weight -= my_step
+            else:
+                merged.append(theirs.pop(self._random.randrange(len(theirs))))
+                their_weight -= their_step
+        self.items = merged
+        self.seen += other.seen
+        return self
+
+
+def _assumed_street_type_word(address, config=None):
+    """
+    The word parse_address assumes is the street type when it finds no known one, found
+    the way the parser finds it: the last word of the street, before any '#' unit.
+    """
+    words = _preprocess(address).split()
+    if not words:
+        return None
+    return words[_assumed_street_type(words, config if config is not None else _base_tables)[0]]
+
+
+class QualityStats:
+    """
+    Mergeable data-quality counters for a stream of parse results.
+
+    Parameters:
+        top_k (int): Counters kept for the unknown street type and reject reason summaries.
+        sample_size (int): Incomplete or rejected rows kept as examples.
+        seed (int): Seed of the sample's random choices.
+    """
+
+    def __init__(self, top_k=DEFAULT_TOP_K, sample_size=DEFAULT_SAMPLE_SIZE, seed=None):
+        self.rows = 0
+        self.parsed = 0
+        self.complete = 0
+        self.no_street_type = 0
+        self.no_street_number = 0
+        self.with_unit = 0
+        self.rejected = 0
+        self.warnings = dict.fromkeys(WARNING_CATEGORIES, 0)
+        self.unknown_street_types = TopK(top_k)
+        self.reject_reasons = TopK(top_k)
+        self.bad_rows = Reservoir(sample_size, seed)
+        self.seed = seed
+
+    def empty_copy(self, index=0):
+        """
+        A new, empty QualityStats with the same settings, for a worker to fill and merge back.
+
+        Parameters:
+            index (int): The worker's chunk number. A seeded copy is seeded with seed + index + 1,
+                so every chunk draws its own sample and seeded parallel runs are reproducible.
+        """
+        seed = self.seed + index + 1 if self.seed is not None else None
+        return QualityStats(self.unknown_street_types.capacity, self.bad_rows.size, seed)
+
+    def update(self, address, result, reason=None, config=None):
+        """
+        Count one row. `reason` is the reject reason for rows the batch or bulk mode rejected,
+        and `config` the ParserConfig the row was parsed with.
+        """
+        self.rows += 1
+        categories = warning_categories(address, result, config)
+        for category in categories:
+            self.warnings[category] += 1
+        if reason is not None:
+            self.rejected += 1
+            self.reject_reasons.add(reason)
+        if result is None:
+            self.bad_rows.add([address, reason or 'no result'])
+            return
+
+        self.parsed += 1
+        if result['isComplete']:
+            self.complete += 1
+        else:
+            self.bad_rows.add([address, ', '.join(categories) or 'incomplete'])
+        if result['streetType'] is None:
+            self.no_street_type += 1
+            word = _assumed_street_type_word(address, config)
+            if word:
+                self.unknown_street_types.add(word)
+        if result['streetNumber'] is None:
+            self.no_street_number += 1
+        if result['unitNumber'] is not None:
+            self.with_unit += 1
+
+    def update_many(self, addresses, results, rejects=None, config=None):
+        """
+        Count parallel lists of addresses and results, with rejects as (index, address, reason) from the batch API.
+        """
+        reasons = {index: reason for index, _, reason in rejects} if rejects else {}
+        for index, (address, result) in enumerate(zip(addresses, results)):
+            self.update(address, result, reasons.get(index), config)
+        return self
+
+    def merge(self, other):
+        """
+        Add another QualityStats (e.g. from another worker) into this one.
+        """
+        for name in ('rows', 'parsed', 'complete', 'no_street_type', 'no_street_number', 'with_unit', 'rejected'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for category, count in other.warnings.items():
+            self.warnings[category] = self.warnings.get(category, 0) + count
+        self.unknown_street_types.merge(other.unknown_street_types)
+        self.reject_reasons.merge(other.reject_reasons)
+        self.bad_rows.merge(other.bad_rows)
+        return self
+
+    def to_dict(self):
+        """
+        JSON-serializable state, restored by from_dict (used to checkpoint bulk jobs).
+        """
+        return {
+            'rows': self.rows,
+            'parsed': self.parsed,
+            'complete': self.complete,
+            'noStreetType': self.no_street_type,
+            'noStreetNumber': self.no_street_number,
+            'withUnit': self.with_unit,
+            'rejected': self.rejected,
+            'warnings': dict(self.warnings),
+            'unknownStreetTypes': [self.unknown_street_types.capacity, self.unknown_street_types.total, self.unknown_street_types.counts],
+            'rejectReasons': [self.reject_reasons.capacity, self.reject_reasons.total, self.reject_reasons.counts],
+            'badRows': [self.bad_rows.size, self.bad_rows.seen, self.bad_rows.items],
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        stats = cls()
+        stats.rows = state['rows']
+        stats.parsed = state['parsed']
+        stats.complete = state['complete']
+        stats.no_street_type = state['noStreetType']
+        stats.no_street_number = state['noStreetNumber']
+        stats.with_unit = state['withUnit']
+        stats.rejected = state['rejected']
+        stats.warnings.update(state['warnings'])
+        for summary, key in ((stats.unknown_street_types, 'unknownStreetTypes'), (stats.reject_reasons, 'rejectReasons')):
+            summary.capacity, summary.total, summary.counts = state[key][0], state[key][1], dict(state[key][2])
+        stats.bad_rows.size, stats.bad_rows.seen, stats.bad_rows.items = state['badRows'][0], state['badRows'][1], list(state['badRows'][2])
+        return stats
+
+    def report(self, top=10):
+        """
+        Summary of the rows seen so far.
+
+        Percentages are of all rows. `top` limits the unknown street type and reject reason lists.
+        """
+        def percent(count):
+            return round(100.0 * count / self.rows, 3) if self.rows else 0.0
+
+        return {
+            'rows': self.rows,
+            'parsed': self.parsed,
+            'rejected': self.rejected,
+            'percentComplete': percent(self.complete),
+            'percentNoStreetType': percent(self.no_street_type),
+            'percentNoStreetNumber': percent(self.no_street_number),
+            'percentWithUnit': percent(self.with_unit),
+            'warnings': dict(self.warnings),
+            'topUnknownStreetTypes': self.unknown_street_types.top(top),
+            'topRejectReasons': self.reject_reasons.top(top),
+            'sampleBadRows': list(self.bad_rows.items),
+        }
+
+
+def _read_addresses(path, column, encoding):
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        if column is None:
+            for line in f:
+                yield line.rstrip('\r\n')
+            return
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if column not in header:
+            raise ValueError(f"Column '{column}' not found in the header of '{path}'")
+        column_index = header.index(column)
+        for row in reader:
+            yield row[column_index] if column_index < len(row) else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m addressScraper.quality', description='Report data-quality statistics for a file of addresses.')
+    parser.add_argument('input')
+    parser.add_argument('--column', default=None, help='address column of a CSV input (default: one address per line)')
+    parser.add_argument('--mode', default='serial', help='batch execution mode')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--batch-rows', type=int, default=100000, help='rows parsed per batch')
+    parser.add_argument('--top', type=int, default=10, help='entries in the top-k lists')
+    parser.add_argument('--sample-size', type=int, default=DEFAULT_SAMPLE_SIZE, help='incomplete rows kept as examples')
+    parser.add_argument('--encoding', default='utf-8')
+    args = parser.parse_args(argv)
+
+    stats = QualityStats(max(DEFAULT_TOP_K, args.top), args.sample_size)
+    batch = []
+    for address in _read_addresses(args.input, args.column, args.encoding):
+        batch.append(address)
+        if len(batch) >= args.batch_rows:
+            parse_addresses(batch, mode=args.mode, workers=args.workers, rejects=[], stats=stats)
+            batch = []
+    if batch:
+        parse_addresses(batch, mode=args.mode, workers=args.workers, rejects=[], stats=stats)
+    json.dump(stats.report(args.top), sys.stdout, indent=2)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,301 @@
+"""
+Street number ranges and a per-street interval index.
+
+parse_street_number_range turns a parsed street number ('100-200', '121B',
+'5 1/2', '123/125') into a StreetNumberRange. AddressRangeIndex groups ranges by
+canonical street and answers "which records cover 150 B ST NW" with an
+implicit augmented interval tree per street: intervals sorted by their low
+number, with each tree node holding the highest number in its subtree, so
+point and range queries take O(log n + matches).
+
+    index = AddressRangeIndex.build(parcel_addresses, records=parcel_ids, mode='process')
+    index.find('150 B St NW')            # parcel ids whose range covers 150 on B ST NW
+    index.overlapping('B ST NW', 140, 160)
+"""
+import re
+from array import array
+from collections import namedtuple
+
+from .addressScraper import _direction_mapping, parse_address
+from .batch import parse_addresses
+
+StreetNumberRange = namedtuple('StreetNumberRange', ['low', 'high', 'parity', 'alpha', 'fraction'])
+StreetNumberRange.__doc__ = """
+Parsed street number.
+
+    low, high (int): Inclusive bounds; equal for a single number.
+    parity (str): 'even' or 'odd' when every number in the range shares it (as on
+        one side of a street), otherwise 'both'.
+    alpha (str): Letter or hyphenated suffix ('B' in '121B' or '200-B'), or None.
+    fraction (str): Fractional part ('1/2' in '5 1/2'), or None.
+"""
+
+EVEN = 'even'
+ODD = 'odd'
+BOTH = 'both'
+
+_PARITY_CODES = {EVEN: 0, ODD: 1, BOTH: 2}
+_PARITY_NAMES = (EVEN, ODD, BOTH)
+# a/b with b up to this is a fraction (1/2, 3/4), above it a slash range (123/125)
+_MAX_FRACTION_DENOMINATOR = 8
+# Subtrees at or below this height are scanned linearly
+_LEAF_LEVEL = 3
+
+_number_re = re.compile(r'^(\d+)([A-Z]*)$')
+_hyphen_re = re.compile(r'^(\d+)-([A-Z\d]+)$')
+_slash_re = re.compile(r'^(\d+)/(\d+)$')
+
+
+def _range_parity(low, high):
+    if low % 2 == high % 2:
+        return EVEN if low % 2 == 0 else ODD
+    return BOTH
+
+
+def parse_street_number_range(street_number):
+    """
+    Parse a streetNumber value from parse_address into a StreetNumberRange.
+
+    '100-200' is a range (both ends even -> 'even' parity); '200-B' and '123-4A'
+    are a number with a hyphenated suffix; '123/125' is a slash range and '5 1/2'
+    a number with a fraction.
+
+    Returns:
+        StreetNumberRange or None: None if the value has no whole number.
+
+    Ex: 100-200 -> StreetNumberRange(low=100, high=200, parity='even', alpha=None, fraction=None)
+    """
+    if not street_number:
+        return None
+    parts = street_number.split()
+    fraction = None
+    if len(parts) == 2 and _slash_re.match(parts[1]):
+        street_number, fraction = parts
+    elif len(parts) != 1:
+        return None
+
+    match = _number_re.match(street_number)
+    if match:
+        number = int(match.group(1))
+        return StreetNumberRange(number, number, _range_parity(number, number), match.group(2) or None, fraction)
+
+    match = _hyphen_re.match(street_number)
+    if match:
+        low = int(match.group(1))
+        rest = match.group(2)
+        if rest.isdigit() and int(rest) > low:
+            high = int(rest)
+            return StreetNumberRange(low, high, _range_parity(low, high), None, fraction)
+        return StreetNumberRange(low, low, _range_parity(low, low), rest, fraction)
+
+    match = _slash_re.match(street_number)
+    if match:
+        first, second = int(match.group(1)), int(match.group(2))
+        if second <= _MAX_FRACTION_DENOMINATOR:
+            return None
+        low, high = min(first, second), max(first, second)
+        return StreetNumberRange(low, high, _range_parity(low, high), None, fraction)
+    return None
+
+
+def street_key(parsed_address):
+    """
+    Canonical street of a parse result: directional prefix, name, type and
+    directional suffix, with directionals abbreviated.
+
+    Ex: 100-200 B Street Northwest -> 'B ST NW'
+        12 US Highway 19 N -> 'US HWY 19 N'
+    """
+    if not parsed_address or not (parsed_address.get('streetName') or parsed_address.get('street')):
+        return None
+    prefix = parsed_address.get('streetDirectionPrefix')
+    suffix = parsed_address.get('streetDirectionSuffix')
+    parts = [
+        _direction_mapping.get(prefix, prefix) if prefix else None,
+        parsed_address.get('streetName'),
+        parsed_address.get('streetType'),
+        _direction_mapping.get(suffix, suffix) if suffix else None,
+    ]
+    return ' '.join(part for part in parts if part)
+
+
+def _has_parity_in(low, high, parity):
+    """
+    Whether [low, high] contains a number of the given parity.
+    """
+    if low > high:
+        return False
+    if parity == BOTH:
+        return True
+    first = low if low % 2 == _PARITY_CODES[parity] else low + 1
+    return first <= high
+
+
+class _StreetIntervals:
+    """
+    Intervals of one street in an implicit augmented binary tree (after Heng Li's cgranges).
+
+    Intervals are sorted by low; node i at level k covers the array slice around
+    i, and maxs[i] holds the largest high in that subtree.
+    """
+
+    __slots__ = ('lows', 'highs', 'maxs', 'parities', 'records', 'root_level')
+
+    def __init__(self, entries):
+        entries.sort(key=lambda entry: (entry[0], entry[1]))
+        self.lows = array('q', [entry[0] for entry in entries])
+        self.highs = array('q', [entry[1] for entry in entries])
+        self.parities = bytes(entry[2] for entry in entries)
+        self.records = [entry[3] for entry in entries]
+        self.maxs = array('q', self.highs)
+        self.root_level = self._index()
+
+    def _index(self):
+        n = len(self.lows)
+        maxs = self.maxs
+        highs = self.highs
+        last_i = 0
+        last = highs[0]
+        for i in range(0, n, 2):
+            last_i = i
+            last = maxs[i] = highs[i]
+        k = 1
+        while (1 << k) <= n:
+            x = 1 << (k - 1)
+            for i in range((x << 1) - 1, n, x << 2):
+                left = maxs[i - x]
+                right = maxs[i + x] if i + x < n else last
+                maxs[i] = max(highs[i], left, right)
+            last_i = last_i - x if (last_i >> k) & 1 else last_i + x
+            if last_i < n and maxs[last_i] > last:
+                last = maxs[last_i]
+            k += 1
+        return k - 1
+
+    def overlapping(self, low, high):
+        """
+        Indices of intervals intersecting [low, high], in sorted order.
+        """
+        lows, highs, maxs = self.lows, self.highs, self.maxs
+        n = len(lows)
+        found = []
+        stack = [(self.root_level, (1 << self.root_level) - 1, False)]
+        while stack:
+            k, x, left_done = stack.pop()
+            if k <= _LEAF_LEVEL:
+                i = x >> k << k
+                end = min(i + (1 << (k + 1)) - 1, n)
+                while i < end and lows[i] <= high:
+                    if low <= highs[i]:
+                        found.append(i)
+                    i += 1
+            elif not left_done:
+                stack.append((k, x, True))
+                y = x - (1 << (k - 1))
+                if y >= n or maxs[y] >= low:
+                    stack.append((k - 1, y, False))
+            elif x < n and lows[x] <= high:
+                if low <= highs[x]:
+                    found.append(x)
+                stack.append((k - 1, x + (1 << (k - 1)), False))
+        return found
+
+
+class AddressRangeIndex:
+    """
+    Street number ranges keyed by canonical street, queryable by point or range.
+
+    Ranges can be added at any time; each street's tree is rebuilt lazily on its
+    next query.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._streets = {}
+
+    @classmethod
+    def build(cls, addresses, records=None, **batch_options):
+        """
+        Parse `addresses` through the batch API and index every one with a street and number.
+
+        Parameters:
+            records (list): Value returned for each address by queries. Defaults to the address itself.
+            batch_options: mode, workers, chunk_size for parse_addresses.
+        """
+        addresses = list(addresses)
+        return cls.from_parsed(parse_addresses(addresses, **batch_options), records if records is not None else addresses)
+
+    @classmethod
+    def from_parsed(cls, parsed_addresses, records):
+        """
+        Index already parsed results, with one record per result.
+        """
+        index = cls()
+        for parsed, record in zip(parsed_addresses, records):
+            index.add_parsed(parsed, record)
+        return index
+
+    def add_parsed(self, parsed_address, record):
+        """
+        Index one parse result. Returns False if it has no street or usable street number.
+        """
+        street = street_key(parsed_address)
+        number_range = parse_street_number_range(parsed_address['streetNumber']) if street else None
+        if number_range is None:
+            return False
+        self.add(street, number_range, record)
+        return True
+
+    def add(self, street, number_range, record):
+        """
+        Index a StreetNumberRange on a canonical street (see street_key).
+        """
+        entry = (number_range.low, number_range.high, _PARITY_CODES[number_range.parity], record)
+        self._pending.setdefault(street, []).append(entry)
+
+    def _street(self, street):
+        pending = self._pending.pop(street, None)
+        if pending:
+            existing = self._streets.get(street)
+            if existing is not None:
+                pending.extend(zip(existing.lows, existing.highs, existing.parities, existing.records))
+            self._streets[street] = _StreetIntervals(pending)
+        return self._streets.get(street)
+
+    def overlapping(self, street, low, high=None):
+        """
+        Records on `street` whose range contains at least one number of its own
+        parity within [low, high]. With high omitted this is a point query.
+
+        Ex: index.overlapping('B ST NW', 150) -> records covering 150 B ST NW
+        """
+        high = low if high is None else high
+        intervals = self._street(street)
+        if intervals is None or low > high:
+            return []
+        found = []
+        for i in intervals.overlapping(low, high):
+            parity = _PARITY_NAMES[intervals.parities[i]]
+            if _has_parity_in(max(low, intervals.lows[i]), min(high, intervals.highs[i]), parity):
+                found.append(intervals.records[i])
+        return found
+
+    def find(self, address):
+        """
+        Parse `address` and return the records whose ranges cover its street number (or range).
+
+        Ex: index.find('150 B St NW')
+        """
+        parsed = parse_address(address)
+        street = street_key(parsed)
+        number_range = parse_street_number_range(parsed['streetNumber']) if street else None
+        if number_range is None:
+            return []
+        return self.overlapping(street, number_range.low, number_range.high)
+
+    def streets(self):
+        return sorted(set(self._streets) | set(self._pending))
+
+    def __len__(self):
+        return sum(len(intervals.lows) for intervals in self._streets.values()) + \
+            sum(len(entries) for entries in self._pending.values())
@@ -0,0 +1,32 @@
+"""
+Per-row failure isolation for the batch and bulk modes.
+
+A row is rejected when parsing raises or yields no result (blank, missing,
+non-string or oversize address). Rejected rows are reported with a reason instead of
+aborting the whole job.
+"""
+from .addressScraper import MAX_ADDRESS_LENGTH, parse_address
+
+EMPTY_ADDRESS_REASON = 'empty or non-string address'
+
+
+def parse_isolated(address, warningsEnabled=False, fingerprintBits=None, config=None):
+    """
+    Parse one address without letting a bad row raise.
+
+    Returns:
+        tuple: (parse result, None) on success, or (None, reason) if the row is rejected.
+    """
+    try:
+        result = parse_address(address, warningsEnabled, fingerprintBits, config)
+    except Exception as exc:
+        return None, describe_error(exc)
+    if result is None:
+        if isinstance(address, str) and len(address) > MAX_ADDRESS_LENGTH:
+            return None, f"address longer than {MAX_ADDRESS_LENGTH} characters"
+        return None, EMPTY_ADDRESS_REASON
+    return result, None
+
+
+def describe_error(exc):
+    return f"{type(exc).__name__}: {exc}"
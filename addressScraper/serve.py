@@ -0,0 +1,397 @@
+"""
+Local HTTP normalization service.
+
+Runs a small standard-library HTTP server so several services can share one
+warm copy of the parser instead of embedding their own:
+
+    python -m addressScraper.serve --host 127.0.0.1 --port 8080
+
+Endpoints:
+    POST /parse    {"address": "..."} or {"addresses": ["...", ...]}
+    GET  /metrics  throughput, latency percentiles and cache hit rate
+    GET  /health   liveness check
+
+Concurrent requests are coalesced into shared batches. Identical addresses
+within a batch are parsed once, and every result goes through a shared LRU
+cache.
+"""
+import argparse
+import json
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from .addressScraper import parse_addresses_preprocessed
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+DEFAULT_CACHE_SIZE = 100000
+DEFAULT_MAX_BATCH_SIZE = 512
+DEFAULT_MAX_WAIT_MS = 2.0
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of parse results keyed by the raw address string.
+    """
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        """
+        Look up several keys at once.
+
+        Returns:
+            tuple: (dict of found key -> result, list of missing keys)
+        """
+        found = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                if key in self._data:
+                    self._data.move_to_end(key)
+                    found[key] = self._data[key]
+                else:
+                    missing.append(key)
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def put_many(self, items):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            for key, value in items:
+                self._data[key] = value
+                self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class Metrics:
+    """
+    Request counters and a sliding window of latencies for the /metrics endpoint.
+    """
+
+    def __init__(self, window=10000):
+        self.started = time.time()
+        self.requests = 0
+        self.addresses = 0
+        self.batches = 0
+        self.batched_addresses = 0
+        self.deduplicated = 0
+        self.errors = 0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record_request(self, address_count, latency):
+        with self._lock:
+            self.requests += 1
+            self.addresses += address_count
+            self._latencies.append(latency)
+
+    def record_batch(self, size, unique):
+        with self._lock:
+            self.batches += 1
+            self.batched_addresses += size
+            self.deduplicated += size - unique
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self, cache):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            uptime = max(time.time() - self.started, 1e-9)
+            lookups = cache.hits + cache.misses
+            return {
+                'uptimeSeconds': round(uptime, 3),
+                'requests': self.requests,
+                'addresses': self.addresses,
+                'errors': self.errors,
+                'requestsPerSecond': round(self.requests / uptime, 3),
+                'addressesPerSecond': round(self.addresses / uptime, 3),
+                'batches': self.batches,
+                'meanBatchSize': round(self.batched_addresses / self.batches, 3) if self.batches else 0.0,
+                'deduplicated': self.deduplicated,
+                'latencyMs': {
+                    'p50': _percentile(latencies, 50),
+                    'p90': _percentile(latencies, 90),
+                    'p99': _percentile(latencies, 99),
+                    'max': round(latencies[-1] * 1000, 3) if latencies else 0.0,
+                },
+                'cache': {
+                    'size': len(cache),
+                    'hits': cache.hits,
+                    'misses': cache.misses,
+                    'hitRate': round(cache.hits / lookups, 4) if lookups else 0.0,
+                },
+            }
+
+
+def _percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list of seconds, in milliseconds.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = min(max(math.ceil(pct / 100.0 * len(sorted_values)) - 1, 0), len(sorted_values) - 1)
+    return round(sorted_values[rank] * 1000, 3)
+
+
+class _PendingRequest:
+    __slots__ = ('addresses', 'results', 'error', 'done')
+
+    def __init__(self, addresses):
+        self.addresses = addresses
+        self.results = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class BatchCoalescer:
+    """
+    Collects addresses from concurrent requests into shared batches.
+
+    A single worker thread drains the queue whenever it holds `max_batch_size`
+    addresses or the oldest request has waited `max_wait_ms`, whichever comes
+    first. Each batch is deduplicated, served from the cache where possible,
+    and only the remaining unique addresses are parsed.
+    """
+
+    def __init__(self, cache, metrics, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.cache = cache
+        self.metrics = metrics
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue = deque()
+        self._queued_addresses = 0
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='addressScraper-coalescer', daemon=True)
+        self._thread.start()
+
+    def submit(self, addresses):
+        """
+        Queue a list of addresses and block until their results are ready.
+        """
+        pending = _PendingRequest(addresses)
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError('coalescer is stopped')
+            self._queue.append((time.monotonic(), pending))
+            self._queued_addresses += len(addresses)
+            self._cond.notify()
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.results
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _take_batch(self):
+        with self._cond:
+            while not self._queue and not self._stopped:
+                self._cond.wait()
+            if not self._queue:
+                return None
+            deadline = self._queue[0][0] + self.max_wait
+            while self._queued_addresses < self.max_batch_size and not self._stopped:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = []
+            size = 0
+            while self._queue and (not batch or size + len(self._queue[0][1].addresses) <= self.max_batch_size):
+                _, pending = self._queue.popleft()
+                batch.append(pending)
+                size += len(pending.addresses)
+            self._queued_addresses -= size
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            try:
+                self._process(batch)
+            except Exception as exc:
+                for pending in batch:
+                    pending.error = exc
+            for pending in batch:
+                pending.done.set()
+
+    def _process(self, batch):
+        unique = list(OrderedDict.fromkeys(
+            address for pending in batch for address in pending.addresses
+        ))
+        size = sum(len(pending.addresses) for pending in batch)
+        self.metrics.record_batch(size, len(unique))
+
+        results, missing = self.cache.get_many(unique)
+        parsed = list(zip(missing, parse_addresses_preprocessed(missing)))
+        self.cache.put_many(parsed)
+        results.update(parsed)
+
+        for pending in batch:
+            pending.results = [results[address] for address in pending.addresses]
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class AddressRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'addressScraper'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self._send_json(200, self.server.metrics.snapshot(self.server.cache))
+        elif self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/parse':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        started = time.perf_counter()
+        try:
+            payload = self._read_json()
+            addresses, single = _addresses_from_payload(payload)
+        except ValueError as exc:
+            self.server.metrics.record_error()
+            self._send_json(400, {'error': str(exc)})
+            return
+
+        try:
+            results = self.server.coalescer.submit(addresses)
+        except Exception as exc:
+            self.server.metrics.record_error()
+            self._send_json(500, {'error': str(exc)})
+            return
+
+        self.server.metrics.record_request(len(addresses), time.perf_counter() - started)
+        if single:
+            self._send_json(200, {'result': results[0]})
+        else:
+            self._send_json(200, {'results': results})
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            raise ValueError('invalid Content-Length')
+        if length <= 0:
+            raise ValueError('request body is empty')
+        if length > MAX_REQUEST_BYTES:
+            raise ValueError('request body is too large')
+        try:
+            return json.loads(self.rfile.read(length).decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ValueError('request body is not valid JSON')
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+
+def _addresses_from_payload(payload):
+    """
+    Accept {"address": str} or {"addresses": [str, ...]}.
+
+    Returns:
+        tuple: (list of addresses, True if this was a single-address request)
+    """
+    if not isinstance(payload, dict):
+        raise ValueError('expected a JSON object')
+    if 'address' in payload:
+        address = payload['address']
+        if address is not None and not isinstance(address, str):
+            raise ValueError("'address' must be a string")
+        return [address], True
+    if 'addresses' in payload:
+        addresses = payload['addresses']
+        if not isinstance(addresses, list) or not all(a is None or isinstance(a, str) for a in addresses):
+            raise ValueError("'addresses' must be a list of strings")
+        return addresses, False
+    raise ValueError("expected an 'address' or 'addresses' field")
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT, cache_size=DEFAULT_CACHE_SIZE,
+                max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS, verbose=False):
+    """
+    Build a ready-to-serve HTTP server. Pass port=0 to bind a free port.
+
+    Ex: server = make_server(port=0); threading.Thread(target=server.serve_forever).start()
+    """
+    server = _ThreadingHTTPServer((host, port), AddressRequestHandler)
+    server.verbose = verbose
+    server.cache = ResultCache(cache_size)
+    server.metrics = Metrics()
+    server.coalescer = BatchCoalescer(server.cache, server.metrics, max_batch_size, max_wait_ms)
+
+    server_close = server.server_close
+
+    def close():
+        server.coalescer.stop()
+        server_close()
+
+    server.server_close = close
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m addressScraper.serve', description='Serve address normalization over HTTP.')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE, help='maximum number of cached results (0 disables the cache)')
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE, help='addresses per coalesced batch')
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS, help='longest a request waits for its batch to fill')
+    parser.add_argument('--verbose', action='store_true', help='log every request')
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.cache_size, args.max_batch_size, args.max_wait_ms, args.verbose)
+    host, port = server.server_address[:2]
+    print(f"AddressScraper serving on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
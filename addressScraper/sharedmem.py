@@ -0,0 +1,260 @@
+"""
+Process-pool batch parsing over shared memory.
+
+The input addresses are packed into one shared memory segment as a table of
+int64 offsets followed by the UTF-8 bytes of every address. Workers attach to
+the segment once, parse their slice in place and write compact encoded
+results into their own pre-sized region of a shared output segment. Only
+integers (slice bounds and byte counts) cross the process boundary.
+
+Encoded chunk layout:
+    header  11 x uint32 per record: flags (bit 0: result is None, bit 1:
+            isComplete, bit 2: rejected) then the character length of each
+            field in RESULT_STRING_FIELDS order, 0xFFFFFFFF marking a None
+            field. A rejected record stores its reason in the first field.
+    text    every field of every record concatenated, UTF-8 encoded once
+
+Requires Python 3.8+ (multiprocessing.shared_memory).
+"""
+import os
+import struct
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+from .addressScraper import RESULT_FIELDS, _add_fingerprints, parse_address, parse_addresses_preprocessed
+from .rejects import parse_isolated
+
+RESULT_STRING_FIELDS = tuple(field for field in RESULT_FIELDS if field != 'isComplete')
+
+_RECORD_WIDTH = 1 + len(RESULT_STRING_FIELDS)
+_NONE_LENGTH = 0xFFFFFFFF
+_FLAG_NONE = 1
+_FLAG_COMPLETE = 2
+_FLAG_REJECTED = 4
+_NONE_RECORD = [_FLAG_NONE] + [_NONE_LENGTH] * len(RESULT_STRING_FIELDS)
+_OFFSET_SIZE = 8
+
+# Output bytes reserved per input byte and per record. Results are built from
+# the (at most 5x longer, '&' -> ' AND ') preprocessed input and usually take
+# about four times its size; a chunk that still overflows is re-parsed by the
+# parent instead.
+OUTPUT_BYTES_PER_INPUT_BYTE = 6
+OUTPUT_BYTES_PER_RECORD = _RECORD_WIDTH * 4
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# Per-worker state set up once by _attach
+_worker = {}
+
+
+def _require_shared_memory():
+    if shared_memory is None:
+        raise RuntimeError("The 'shared_memory' mode needs Python 3.8 or later (multiprocessing.shared_memory)")
+
+
+def _pack_input(addresses):
+    """
+    Encode addresses into an offsets table and one data blob.
+
+    Non-string inputs are stored as empty strings, which parse_address maps to None just like the original value.
+    """
+    encoded = [address.encode('utf-8') if isinstance(address, str) else b'' for address in addresses]
+    offsets = [0] * (len(encoded) + 1)
+    total = 0
+    for i, data in enumerate(encoded):
+        total += len(data)
+        offsets[i + 1] = total
+    return offsets, b''.join(encoded)
+
+
+def encode_results(results, reasons=None):
+    """
+    Encode a list of parse results into a header table and one UTF-8 text blob.
+
+    Parameters:
+        reasons (list): Optional reject reason per result (None for accepted rows).
+
+    Returns:
+        tuple: (header bytes, text bytes)
+    """
+    header = array('I')
+    text = []
+    for i, result in enumerate(results):
+        if reasons is not None and reasons[i] is not None:
+            header.extend(_NONE_RECORD)
+            header[-_RECORD_WIDTH] = _FLAG_NONE | _FLAG_REJECTED
+            header[-_RECORD_WIDTH + 1] = len(reasons[i])
+            text.append(reasons[i])
+            continue
+        if result is None:
+            header.extend(_NONE_RECORD)
+            continue
+        header.append(_FLAG_COMPLETE if result['isComplete'] else 0)
+        for field in RESULT_STRING_FIELDS:
+            value = result[field]
+            if value is None:
+                header.append(_NONE_LENGTH)
+            else:
+                header.append(len(value))
+                text.append(value)
+    return header.tobytes(), ''.join(text).encode('utf-8')
+
+
+def decode_results(header, text, rejected=None):
+    """
+    Rebuild parse result dicts from a header table (sequence of ints) and the decoded text.
+
+    Parameters:
+        rejected (list): If given, (record number, reason) is appended for each rejected record.
+    """
+    results = []
+    position = 0
+    for record in range(0, len(header), _RECORD_WIDTH):
+        flags = header[record]
+        if flags & _FLAG_REJECTED:
+            length = header[record + 1]
+            if rejected is not None:
+                rejected.append((record // _RECORD_WIDTH, text[position:position + length]))
+            position += length
+            results.append(None)
+            continue
+        if flags & _FLAG_NONE:
+            results.append(None)
+            continue
+        result = {}
+        for field, length in zip(RESULT_STRING_FIELDS, header[record + 1:record + _RECORD_WIDTH]):
+            if length == _NONE_LENGTH:
+                result[field] = None
+            else:
+                result[field] = text[position:position + length]
+                position += length
+        result['isComplete'] = bool(flags & _FLAG_COMPLETE)
+        results.append(result)
+    return results
+
+
+def _attach(input_name, output_name, count):
+    inp = shared_memory.SharedMemory(name=input_name)
+    out = shared_memory.SharedMemory(name=output_name)
+    _worker['input'] = inp
+    _worker['output'] = out
+    _worker['offsets'] = inp.buf[:(count + 1) * _OFFSET_SIZE].cast('q')
+    _worker['data'] = inp.buf[(count + 1) * _OFFSET_SIZE:]
+
+
+def _parse_slice(start, stop, out_start, out_limit, warningsEnabled, isolate, config=None):
+    """
+    Parse addresses[start:stop] from the shared input and encode them into output[out_start:out_limit].
+
+    Returns:
+        int: Text bytes written after the header table, or -1 if the region was too small.
+    """
+    offsets = _worker['offsets']
+    data = _worker['data']
+    addresses = [bytes(data[offsets[i]:offsets[i + 1]]).decode('utf-8') for i in range(start, stop)]
+    if isolate:
+        results = []
+        reasons = []
+        for address in addresses:
+            result, reason = parse_isolated(address, warningsEnabled, config=config)
+            results.append(result)
+            reasons.append(reason)
+    else:
+        results = parse_addresses_preprocessed(addresses, warningsEnabled, config=config)
+        reasons = None
+    header, text = encode_results(results, reasons)
+    text_start = out_start + len(header)
+    if text_start + len(text) > out_limit:
+        return -1
+    buffer = _worker['output'].buf
+    buffer[out_start:text_start] = header
+    buffer[text_start:text_start + len(text)] = text
+    return len(text)
+
+
+def _parse_slice_star(args):
+    return _parse_slice(*args)
+
+
+def parse_addresses_shared(addresses, warningsEnabled=False, workers=None, chunk_size=None, rejects=None,
+                           fingerprintBits=None, config=None):
+    """
+    Parse addresses with a process pool that exchanges data through shared memory.
+
+    Parameters:
+        rejects (list): If given, rows are isolated as in batch.parse_addresses and
+            (index, address, reason) is appended here for each rejected row.
+        fingerprintBits (int): 64 or 128 to add fingerprints. They are computed by the parent from
+            the decoded components, so they cost no extra parsing and no extra transfer.
+        config (ParserConfig): Tenant configuration, rebuilt once per worker from its overlays.
+
+    Returns:
+        list: One parse_address result per input address, in input order.
+    """
+    _require_shared_memory()
+    addresses = list(addresses)
+    count = len(addresses)
+    if count == 0:
+        return []
+
+    isolate = rejects is not None
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, min(DEFAULT_CHUNK_SIZE, -(-count // workers)))
+    offsets, data = _pack_input(addresses)
+
+    # Lay out one output region per chunk, sized from that chunk's input bytes
+    tasks = []
+    out_position = 0
+    for start in range(0, count, chunk_size):
+        stop = min(start + chunk_size, count)
+        capacity = (offsets[stop] - offsets[start]) * OUTPUT_BYTES_PER_INPUT_BYTE + (stop - start) * OUTPUT_BYTES_PER_RECORD
+        tasks.append((start, stop, out_position, out_position + capacity, warningsEnabled, isolate, config))
+        out_position += capacity
+
+    offsets_size = (count + 1) * _OFFSET_SIZE
+    inp = shared_memory.SharedMemory(create=True, size=max(1, offsets_size + len(data)))
+    out = None
+    try:
+        out = shared_memory.SharedMemory(create=True, size=max(1, out_position))
+        # Native byte order, as workers read the table with memoryview.cast('q')
+        inp.buf[:offsets_size] = struct.pack(f'{count + 1}q', *offsets)
+        inp.buf[offsets_size:offsets_size + len(data)] = data
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(inp.name, out.name, count)) as executor:
+            written = list(executor.map(_parse_slice_star, tasks))
+
+        results = []
+        for (start, stop, out_start, _, _, _, _), used in zip(tasks, written):
+            if used < 0:
+                for index in range(start, stop):
+                    if isolate:
+                        result, reason = parse_isolated(addresses[index], warningsEnabled, config=config)
+                        if reason is not None:
+                            rejects.append((index, addresses[index], reason))
+                    else:
+                        result = parse_address(addresses[index], warningsEnabled, config=config)
+                    results.append(result)
+            else:
+                text_start = out_start + (stop - start) * OUTPUT_BYTES_PER_RECORD
+                header = array('I', bytes(out.buf[out_start:text_start]))
+                text = bytes(out.buf[text_start:text_start + used]).decode('utf-8')
+                rejected = [] if isolate else None
+                results.extend(decode_results(header, text, rejected))
+                if isolate:
+                    rejects.extend((start + record, addresses[start + record], reason) for record, reason in rejected)
+        if fingerprintBits:
+            for result in results:
+                if result is not None:
+                    _add_fingerprints(result, fingerprintBits)
+        return results
+    finally:
+        inp.close()
+        inp.unlink()
+        if out is not None:
+            out.close()
+            out.unlink()
@@ -0,0 +1,261 @@
+"""
+Mailing-order sort keys computed from a single parse.
+
+sort_key turns a parse result into a tuple that orders addresses by street,
+then numerically by house number (with fraction and alpha suffix), then by
+unit, so '200 MAIN ST' sorts before '1000 MAIN ST' and 'APT 9' before
+'APT 10'. sort_key_bytes encodes the same order as bytes that compare with
+plain memcmp, for external sorts and database indexes.
+
+Files larger than memory are sorted with external_sort: chunks are parsed
+through the batch API, sorted by their byte keys into run files and merged.
+
+    python -m addressScraper.sorting addresses.csv sorted.csv --column address --chunk-rows 1000000
+"""
+import argparse
+import csv
+import heapq
+import io
+import os
+import re
+import struct
+import tempfile
+
+from .batch import parse_addresses
+from .ranges import parse_street_number_range
+
+_MISSING_NUMBER = (1 << 63) - 1
+_unit_part_re = re.compile(r'(\d+)|([^\d]+)')
+_RUN_RECORD = struct.Struct('<II')
+_NUMBER_LENGTH = struct.Struct('>H')
+DEFAULT_CHUNK_ROWS = 1000000
+
+
+def _fraction_value(fraction):
+    if not fraction:
+        return 0.0
+    numerator, denominator = fraction.split('/')
+    try:
+        return int(numerator) / int(denominator) if int(denominator) else 0.0
+    except OverflowError:
+        # Garbage like '1 999...9/1' still gets a (last) place instead of failing the sort
+        return float(_MISSING_NUMBER)
+
+
+def _unit_key(unit):
+    """
+    Natural-order key for a stripped unit number: runs of digits compare
+    numerically and other runs alphabetically, so '9' < '10' and '2B' < '10A'.
+    """
+    if not unit:
+        return ()
+    return tuple(
+        (0, int(digits), '') if digits else (1, 0, text)
+        for digits, text in _unit_part_re.findall(unit)
+    )
+
+
+def _encode_number(number):
+    """
+    Order-preserving bytes of a non-negative integer of any size: its big-endian
+    byte length, then the bytes, so longer (larger) numbers sort after shorter ones.
+    Inputs are capped at MAX_ADDRESS_LENGTH characters, so the length always fits.
+    """
+    length = (number.bit_length() + 7) // 8
+    return _NUMBER_LENGTH.pack(length) + number.to_bytes(length, 'big')
+
+
+def sort_key(parsed_address, parity_first=False):
+    """
+    Build a mailing-order sort key from a parse result.
+
+    The key orders by street name, street type, directional prefix and suffix,
+    then house number (numeric low end, fraction, alpha suffix), then unit.
+    With parity_first, odd numbers on a street come before even ones, as a
+    carrier walks one side and then the other. Numbered routes without a street
+    name (e.g. 'STATE RD 7') sort by their route; results without a street
+    (including None) sort last.
+
+    Ex: sorted(results, key=sort_key)
+    """
+    if not parsed_address or not (parsed_address.get('streetName') or parsed_address.get('street')):
+        return (1,)
+    number_range = parse_street_number_range(parsed_address.get('streetNumber'))
+    if number_range is None:
+        number = (_MISSING_NUMBER, 0.0, '')
+        parity = 2
+    else:
+        number = (number_range.low, _fraction_value(number_range.fraction), number_range.alpha or '')
+        parity = 0 if number_range.low % 2 else 1
+    street = (
+        parsed_address.get('streetName') or '',
+        parsed_address.get('streetType') or '',
+        parsed_address.get('streetDirectionPrefix') or '',
+        parsed_address.get('streetDirectionSuffix') or '',
+    )
+    unit = _unit_key(parsed_address.get('unitNumberStripped'))
+    if parity_first:
+        return (0,) + street + (parity,) + number + (unit,)
+    return (0,) + street + number + (parity, unit)
+
+
+def sort_key_bytes(parsed_address, parity_first=False):
+    """
+    Encode sort_key as bytes whose plain byte order matches the tuple order.
+
+    Strings are UTF-8 with a 0x00 terminator (the parser strips NUL characters)
+    and numbers are length-prefixed big-endian (see _encode_number), so street
+    numbers and units of any size encode.
+    """
+    key = sort_key(parsed_address, parity_first)
+    if key == (1,):
+        return b'\x01'
+    parts = [b'\x00']
+    for value in key[1:]:
+        if isinstance(value, str):
+            parts.append(value.encode('utf-8') + b'\x00')
+        elif isinstance(value, float):
+            parts.append(_encode_number(int(value * 1000000)))
+        elif isinstance(value, int):
+            parts.append(_encode_number(value))
+        else:
+            for is_text, number, text in value:
+                parts.append(bytes((is_text + 1,)) + _encode_number(number) + text.encode('utf-8') + b'\x00')
+            parts.append(b'\x00')
+    return b''.join(parts)
+
+
+def sort_keys(addresses, parity_first=False, as_bytes=False, **batch_options):
+    """
+    Parse each address once through the batch API and return its sort key.
+
+    Extra keyword arguments (mode, workers, chunk_size) go to parse_addresses.
+    """
+    make_key = sort_key_bytes if as_bytes else sort_key
+    return [make_key(result, parity_first) for result in parse_addresses(addresses, **batch_options)]
+
+
+def sort_addresses(addresses, parity_first=False, **batch_options):
+    """
+    Return the addresses in mailing order, parsing each one once.
+
+    Ex: sort_addresses(['1000 Main St', '200 Main St', '200 Main St Apt 10', '200 Main St Apt 9'])
+        -> ['200 Main St', '200 Main St Apt 9', '200 Main St Apt 10', '1000 Main St']
+    """
+    addresses = list(addresses)
+    keys = sort_keys(addresses, parity_first, **batch_options)
+    order = sorted(range(len(addresses)), key=keys.__getitem__)
+    return [addresses[i] for i in order]
+
+
+def _csv_line(row):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(row)
+    return buffer.getvalue()
+
+
+def _write_run(records, directory):
+    """
+    Sort (key, line) records and write them as one length-prefixed run file.
+    """
+    records.sort(key=lambda record: record[0])
+    fd, path = tempfile.mkstemp(prefix='addressScraper-run-', dir=directory)
+    with os.fdopen(fd, 'wb') as f:
+        for key, line in records:
+            data = line.encode('utf-8')
+            f.write(_RUN_RECORD.pack(len(key), len(data)))
+            f.write(key)
+            f.write(data)
+    return path
+
+
+def _read_run(path):
+    with open(path, 'rb') as f:
+        reader = io.BufferedReader(f, 1 << 20)
+        while True:
+            header = reader.read(_RUN_RECORD.size)
+            if not header:
+                return
+            key_length, data_length = _RUN_RECORD.unpack(header)
+            yield reader.read(key_length), reader.read(data_length).decode('utf-8')
+
+
+def external_sort(input_path, output_path, column=None, chunk_rows=DEFAULT_CHUNK_ROWS, parity_first=False,
+                  temp_dir=None, encoding='utf-8', **batch_options):
+    """
+    Sort a file that may not fit in memory into mailing order.
+
+    Parameters:
+        input_path (str): Plain text with one address per line, or a CSV with a header when `column` is given.
+        output_path (str): Destination in the same format.
+        column (str): Address column of a CSV input.
+        chunk_rows (int): Rows parsed, sorted and written per run file.
+        temp_dir (str): Where run files go. Defaults to the output's directory.
+        batch_options: mode, workers, chunk_size for parse_addresses.
+
+    Returns:
+        int: Number of rows written.
+    """
+    temp_dir = temp_dir or os.path.dirname(os.path.abspath(output_path))
+    runs = []
+    header = None
+    rows = 0
+    try:
+        with open(input_path, 'r', encoding=encoding, newline='') as f:
+            if column is not None:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                if column not in header:
+                    raise ValueError(f"Column '{column}' not found in the header of '{input_path}'")
+                column_index = header.index(column)
+                records = ((row[column_index] if column_index < len(row) else None, _csv_line(row)) for row in reader)
+            else:
+                records = ((line.rstrip('\r\n'), line if line.endswith('\n') else line + '\n') for line in f)
+
+            chunk = []
+            for record in records:
+                chunk.append(record)
+                if len(chunk) >= chunk_rows:
+                    runs.append(_sort_chunk(chunk, temp_dir, parity_first, batch_options))
+                    rows += len(chunk)
+                    chunk = []
+            if chunk:
+                runs.append(_sort_chunk(chunk, temp_dir, parity_first, batch_options))
+                rows += len(chunk)
+
+        with open(output_path, 'w', encoding=encoding, newline='') as out:
+            if header is not None:
+                csv.writer(out).writerow(header)
+            for _, line in heapq.merge(*[_read_run(path) for path in runs], key=lambda record: record[0]):
+                out.write(line)
+        return rows
+    finally:
+        for path in runs:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def _sort_chunk(chunk, temp_dir, parity_first, batch_options):
+    keys = sort_keys([address for address, _ in chunk], parity_first, True, **batch_options)
+    return _write_run([(key, line) for key, (_, line) in zip(keys, chunk)], temp_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m addressScraper.sorting', description='Sort addresses into mailing order.')
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--column', default=None, help='address column of a CSV input (default: one address per line)')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help='rows per in-memory run')
+    parser.add_argument('--parity-first', action='store_true', help='odd house numbers before even ones on each street')
+    parser.add_argument('--mode', default='serial', help='batch execution mode for parsing')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--temp-dir', default=None)
+    args = parser.parse_args(argv)
+
+    rows = external_sort(args.input, args.output, args.column, args.chunk_rows, args.parity_first, args.temp_dir,
+                         mode=args.mode, workers=args.workers)
+    print(f"AddressScraper: sorted {rows} rows into '{args.output}'")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""
+Streaming micro-batch parsing for pipelines.
+
+Reads addresses line by line and groups them into micro-batches that are
+flushed when they hold `max_batch_size` lines or when the oldest line has
+waited `max_wait_ms`, whichever comes first. Each batch goes through the batch
+parser and its results are written in input order, one per line, so latency
+stays bounded on a slow trickle while throughput stays high on a full pipe:
+
+    cat addresses.txt | python -m addressScraper.stream --max-batch-size 512 --max-wait-ms 5 > parsed.jsonl
+
+Throughput and batch-latency counters are printed to stderr on exit, and so
+are parser warnings, so the results on stdout stay one record per line.
+"""
+import argparse
+import contextlib
+import json
+import queue
+import sys
+import threading
+import time
+from collections import deque
+
+from .batch import parse_addresses
+from .quality import QualityStats
+from .serve import _percentile
+
+DEFAULT_MAX_BATCH_SIZE = 512
+DEFAULT_MAX_WAIT_MS = 5.0
+OUTPUT_FORMATS = ('json', 'address')
+
+_EOF = object()
+
+
+class StreamStats:
+    """
+    Counters for a streaming run. Batch latency runs from the arrival of a
+    batch's first line to the flush of its results.
+    """
+
+    def __init__(self, window=10000):
+        self.started = time.perf_counter()
+        self.lines = 0
+        self.batches = 0
+        self.parsed = 0
+        self.parse_seconds = 0.0
+        self.full_batches = 0
+        self._latencies = deque(maxlen=window)
+
+    def record_batch(self, size, parse_seconds, latency, full):
+        self.lines += size
+        self.batches += 1
+        self.parsed += size
+        self.parse_seconds += parse_seconds
+        self.full_batches += bool(full)
+        self._latencies.append(latency)
+
+    def snapshot(self):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        latencies = sorted(self._latencies)
+        return {
+            'elapsedSeconds': round(elapsed, 3),
+            'lines': self.lines,
+            'batches': self.batches,
+            'fullBatches': self.full_batches,
+            'meanBatchSize': round(self.lines / self.batches, 3) if self.batches else 0.0,
+            'linesPerSecond': round(self.lines / elapsed, 3),
+            'parseLinesPerSecond': round(self.parsed / self.parse_seconds, 3) if self.parse_seconds else 0.0,
+            'batchLatencyMs': {
+                'p50': _percentile(latencies, 50),
+                'p90': _percentile(latencies, 90),
+                'p99': _percentile(latencies, 99),
+                'max': round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            },
+        }
+
+
+def _read_lines(lines, line_queue):
+    try:
+        for line in lines:
+            line_queue.put((time.perf_counter(), line.rstrip('\r\n')))
+    finally:
+        line_queue.put((time.perf_counter(), _EOF))
+
+
+def micro_batches(lines, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+    """
+    Group an iterable of lines (such as sys.stdin) into micro-batches.
+
+    A reader thread pulls lines as they arrive, so a batch is closed after
+    max_wait_ms even when the source blocks.
+
+    Yields:
+        tuple: (list of lines with line endings stripped, arrival time of the first line, True if the batch is full)
+    """
+    max_batch_size = max(1, max_batch_size)
+    max_wait = max(0.0, max_wait_ms) / 1000.0
+    line_queue = queue.Queue(maxsize=max_batch_size * 4)
+    reader = threading.Thread(target=_read_lines, args=(lines, line_queue), name='addressScraper-stream-reader', daemon=True)
+    reader.start()
+
+    done = False
+    while not done:
+        first_arrival, line = line_queue.get()
+        if line is _EOF:
+            return
+        batch = [line]
+        deadline = first_arrival + max_wait
+        while len(batch) < max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                _, line = line_queue.get(timeout=remaining) if remaining > 0 else line_queue.get_nowait()
+            except queue.Empty:
+                break
+            if line is _EOF:
+                done = True
+                break
+            batch.append(line)
+        yield batch, first_arrival, len(batch) >= max_batch_size
+
+
+def _format_result(result, output_format):
+    if output_format == 'address':
+        return (result['addressUnit'] or result['address'] or '') if result else ''
+    return json.dumps(result)
+
+
+def stream_addresses(lines, output, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                     output_format='json', warningsEnabled=False, fingerprintBits=None, stats=None, quality=None):
+    """
+    Parse lines in micro-batches and write one result line per input line, in order.
+
+    Parameters:
+        lines (iterable): Address lines, e.g. sys.stdin.
+        output (file): Text stream for the results, flushed after every batch.
+        output_format (str): 'json' for one JSON object (or null) per line, or 'address'
+            for the normalized address with its unit (empty when there is none).
+        warningsEnabled (bool): Print parser warnings, to stderr rather than stdout.
+        stats (StreamStats): Counters to update. A new one is created if omitted.
+        quality (QualityStats): If given, every parsed line is counted into it.
+
+    Returns:
+        StreamStats: The run's counters.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}', expected one of {OUTPUT_FORMATS}")
+    stats = stats if stats is not None else StreamStats()
+    for batch, first_arrival, full in micro_batches(lines, max_batch_size, max_wait_ms):
+        started = time.perf_counter()
+        if warningsEnabled:
+            # The parser prints warnings to stdout, where they would interleave with the results
+            with contextlib.redirect_stdout(sys.stderr):
+                results = parse_addresses(batch, warningsEnabled, fingerprintBits=fingerprintBits, stats=quality)
+        else:
+            results = parse_addresses(batch, warningsEnabled, fingerprintBits=fingerprintBits, stats=quality)
+        parse_seconds = time.perf_counter() - started
+        output.write(''.join(_format_result(result, output_format) + '\n' for result in results))
+        output.flush()
+        stats.record_batch(len(batch), parse_seconds, time.perf_counter() - first_arrival, full)
+    return stats
+
+
+def _print_stats(stats, out):
+    snapshot = stats.snapshot()
+    latency = snapshot['batchLatencyMs']
+    print(f"AddressScraper: {snapshot['lines']} lines in {snapshot['batches']} batches "
+          f"(mean {snapshot['meanBatchSize']}, {snapshot['fullBatches']} full) in {snapshot['elapsedSeconds']}s", file=out)
+    print(f"AddressScraper: {snapshot['linesPerSecond']} lines/s overall, {snapshot['parseLinesPerSecond']} lines/s parsing", file=out)
+    print(f"AddressScraper: batch latency ms p50 {latency['p50']} p90 {latency['p90']} p99 {latency['p99']} max {latency['max']}", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m addressScraper.stream', description='Parse addresses from stdin in micro-batches.')
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE, help='lines per batch')
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS, help='longest a line waits for its batch to fill')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='json', help='json results or normalized addresses')
+    parser.add_argument('--fingerprint-bits', type=int, choices=(64, 128), default=None, help='add fingerprints to json results')
+    parser.add_argument('--warnings', action='store_true', help='print parser warnings to stderr')
+    parser.add_argument('--quality', action='store_true', help='print a data-quality report (JSON) to stderr on exit')
+    args = parser.parse_args(argv)
+
+    stats = StreamStats()
+    quality = QualityStats() if args.quality else None
+    try:
+        stream_addresses(sys.stdin, sys.stdout, args.max_batch_size, args.max_wait_ms, args.format,
+                         args.warnings, args.fingerprint_bits, stats, quality)
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        _print_stats(stats, sys.stderr)
+        if quality is not None:
+            print(json.dumps(quality.report()), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,368 @@
+"""
+Typeahead suggestions for partly typed addresses.
+
+A TypeaheadIndex holds the distinct normalized addresses of a corpus with how
+often each occurred, as one sorted array of keys, and answers a prefix such
+as "1234 N MA" with the most frequent addresses that start with it. Keys use
+the USPS abbreviation of every street type and directional, and so do
+queries, so "1234 North Main Street" and "1234 N MAIN ST" reach the same
+suggestions. A last word still being typed also matches the abbreviations of
+the directionals and street types it could be the start of ("1234 MAIN STR"
+finds "1234 MAIN ST").
+
+    index = TypeaheadIndex.build(addresses, mode='process')
+    index.complete('1234 N MA', k=5)   # [('1234 N MAIN ST', 310), ('1234 N MAPLE AVE', 12), ...]
+    index.save('addresses.typeahead')
+    index = TypeaheadIndex.load('addresses.typeahead')
+
+Top-k search runs over a tree of per-block maximum counts, so a query reads
+O(k log n) counts, however many addresses share the prefix. The file is laid
+out as the index is held in memory, and load() maps it, so processes share one
+copy.
+"""
+import argparse
+import heapq
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from .addressScraper import (_TOKEN_DIRECTIONAL, _TOKEN_STREET_TYPE, _classify_tokens, _direction_mapping, _preprocess,
+                             _street_suffix_table)
+from .batch import parse_addresses
+from .gazetteer import _Keys
+from .membership import KEY_FIELDS
+from .quality import _read_addresses
+
+_MAGIC = b'ASTYPAH1'
+# magic, address count, key bytes, offset width
+_HEADER = struct.Struct('<8sQQQ')
+# Children per node of the maximum-count tree
+_BRANCH = 8
+DEFAULT_K = 10
+# Addresses parsed at a time while building
+_BUILD_BATCH = 100000
+# Directionals and street type variants, with their abbreviation, for completing a partial word
+_VARIANTS = tuple(sorted(dict(_street_suffix_table, **_direction_mapping).items()))
+_VARIANT_WORDS = tuple(word for word, _ in _VARIANTS)
+
+
+def _abbreviate(words):
+    return ' '.join(canonical if flags & (_TOKEN_STREET_TYPE | _TOKEN_DIRECTIONAL) else word
+                    for word, (flags, canonical) in zip(words, _classify_tokens(words)))
+
+
+def completion_key(text):
+    """
+    The index key of an address: its words with street types and directionals abbreviated.
+
+    Ex: completion_key('1234 North Main Street') -> '1234 N MAIN ST'
+    """
+    if not isinstance(text, str):
+        return None
+    return _abbreviate(_preprocess(text).split()) or None
+
+
+def _count_levels(counts):
+    """
+    Maximum count of each block of _BRANCH entries, of each block of those, and so on.
+    """
+    levels = [counts]
+    while len(levels[-1]) > _BRANCH:
+        below = levels[-1]
+        levels.append(array('I', (max(below[i:i + _BRANCH]) for i in range(0, len(below), _BRANCH))))
+    return levels
+
+
+def _level_sizes(count):
+    sizes = [count]
+    while sizes[-1] > _BRANCH:
+        sizes.append((sizes[-1] + _BRANCH - 1) // _BRANCH)
+    return sizes
+
+
+def _little_endian(values):
+    if sys.byteorder == 'little':
+        return values
+    values = array(values.typecode, values)
+    values.byteswap()
+    return values
+
+
+class TypeaheadIndex:
+    """
+    Prefix index of normalized addresses ranked by frequency. Build with build() or load().
+    """
+
+    def __init__(self, offsets, levels, data, data_start=0, mapped=None):
+        self._offsets = offsets
+        self._levels = levels
+        self._data = data
+        self._data_start = data_start
+        self._keys = _Keys(offsets, data, data_start)
+        self._mapped = mapped
+        self.count = len(offsets) - 1
+
+    @classmethod
+    def build(cls, addresses, field='address', **batch_options):
+        """
+        Parse `addresses` and index the distinct normalized ones with their frequency.
+
+        Parameters:
+            addresses (iterable): Address strings; read and parsed _BUILD_BATCH at a time.
+            field (str): 'address' (without the unit, as normalize_address) or 'addressUnit'
+                (with the unit, falling back to 'address' when there is none).
+
+        Extra keyword arguments (mode, workers, chunk_size, config) go to parse_addresses.
+        """
+        if field not in KEY_FIELDS:
+            raise ValueError(f"Key field must be one of {KEY_FIELDS}, not '{field}'")
+        frequencies = Counter()
+        batch = []
+        for address in addresses:
+            batch.append(address)
+            if len(batch) == _BUILD_BATCH:
+                cls._count_batch(frequencies, batch, field, batch_options)
+                batch = []
+        if batch:
+            cls._count_batch(frequencies, batch, field, batch_options)
+        return cls.from_counts(frequencies)
+
+    @staticmethod
+    def _count_batch(frequencies, batch, field, batch_options):
+        for result in parse_addresses(batch, **batch_options):
+            if result is not None:
+                key = completion_key(result[field] or result['address'])
+                if key:
+                    frequencies[key] += 1
+
+    @classmethod
+    def from_counts(cls, frequencies):
+        """
+        Index a mapping of address -> count. Addresses are keyed with completion_key and
+        counts of addresses with the same key are added up.
+        """
+        merged = Counter()
+        for address, count in frequencies.items():
+            key = completion_key(address)
+            if key and count > 0:
+                merged[key.encode('utf-8')] += count
+        keys = sorted(merged)
+        offsets = array('Q', [0])
+        total = 0
+        for key in keys:
+            total += len(key)
+            offsets.append(total)
+        if total < 1 << 32:
+            offsets = array('I', offsets)
+        counts = array('I', (min(merged[key], 0xFFFFFFFF) for key in keys))
+        return cls(offsets, _count_levels(counts), b''.join(keys))
+
+    def __len__(self):
+        return self.count
+
+    def _range(self, prefix):
+        """
+        Positions of the keys that start with `prefix`; UTF-8 never has a 0xFF byte.
+        """
+        return bisect_left(self._keys, prefix), bisect_left(self._keys, prefix + b'\xff')
+
+    def _find(self, key):
+        i = bisect_left(self._keys, key)
+        return i if i < self.count and self._keys[i] == key else None
+
+    def _query_ranges(self, text):
+        """
+        Key ranges a partly typed address can complete to.
+        """
+        words = _preprocess(text).split()
+        if not words:
+            return []
+        complete = text[-1:].isspace()
+        # Words already typed are matched as keys are built, the last one as it is unless complete
+        head = _abbreviate(words if complete else words[:-1])
+        if complete:
+            whole = [head]
+            prefixes = [head + ' ']
+        else:
+            partial = words[-1]
+            start = head + ' ' if head else ''
+            prefixes = [start + partial]
+            # Abbreviations the partial word could be the start of, unless the prefix already covers them
+            i = bisect_left(_VARIANT_WORDS, partial)
+            abbreviations = set()
+            while i < len(_VARIANTS) and _VARIANT_WORDS[i].startswith(partial):
+                abbreviation = _VARIANTS[i][1]
+                if not abbreviation.startswith(partial):
+                    abbreviations.add(abbreviation)
+                i += 1
+            whole = [start + abbreviation for abbreviation in sorted(abbreviations)]
+            prefixes += [key + ' ' for key in whole]
+
+        ranges = []
+        for key in whole:
+            i = self._find(key.encode('utf-8'))
+            if i is not None:
+                ranges.append((i, i + 1))
+        for prefix in prefixes:
+            low, high = self._range(prefix.encode('utf-8'))
+            if low < high:
+                ranges.append((low, high))
+        return ranges
+
+    def complete(self, text, k=DEFAULT_K):
+        """
+        The `k` most frequent indexed addresses that `text` is the start of.
+
+        Parameters:
+            text (str): What has been typed so far. A trailing space marks the last word as complete.
+            k (int): Most suggestions to return.
+
+        Returns:
+            list: (address, count) tuples, most frequent first.
+
+        Ex: index.complete('1234 North Ma', k=2) -> [('1234 N MAIN ST', 310), ('1234 N MAPLE AVE', 12)]
+        """
+        if not isinstance(text, str) or k <= 0 or not self.count:
+            return []
+        levels = self._levels
+        top = len(levels) - 1
+        heap = []
+        # Cover each range with the fewest tree nodes: partial blocks at each level, whole ones above
+        for low, high in self._query_ranges(text):
+            level = 0
+            while low < high:
+                values = levels[level]
+                if level == top:
+                    heap.extend((-values[j], level, j) for j in range(low, high))
+                    break
+                while low < high and low % _BRANCH:
+                    heap.append((-values[low], level, low))
+                    low += 1
+                while low < high and high % _BRANCH:
+                    high -= 1
+                    heap.append((-values[high], level, high))
+                low //= _BRANCH
+                high //= _BRANCH
+                level += 1
+        heapq.heapify(heap)
+
+        found = []
+        while heap and len(found) < k:
+            count, level, j = heapq.heappop(heap)
+            if level == 0:
+                found.append((self._keys[j].decode('utf-8'), -count))
+                continue
+            below = levels[level - 1]
+            for child in range(j * _BRANCH, min((j + 1) * _BRANCH, len(below))):
+                heapq.heappush(heap, (-below[child], level - 1, child))
+        return found
+
+    def nbytes(self):
+        """
+        Bytes held by the keys, offsets and counts.
+        """
+        size = self._offsets[self.count] + len(self._offsets) * self._offsets.itemsize
+        return size + sum(len(level) * 4 for level in self._levels)
+
+    def save(self, path):
+        """
+        Write the index to `path` in the flat format that load() memory-maps.
+        """
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, self.count, self._offsets[self.count], self._offsets.itemsize))
+            f.write(_little_endian(array(self._offsets.typecode, self._offsets)))
+            for level in self._levels:
+                f.write(_little_endian(array('I', level)))
+            f.write(self._data[self._data_start:self._data_start + self._offsets[self.count]])
+
+    @classmethod
+    def load(cls, path, use_mmap=True):
+        """
+        Open a saved index. With use_mmap it stays in the page cache and is shared by
+        every process that loads the same file.
+        """
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"'{path}' is not a typeahead index")
+            magic, count, key_bytes, width = _HEADER.unpack(header)
+            if magic != _MAGIC or width not in (4, 8):
+                raise ValueError(f"'{path}' is not a typeahead index")
+            if use_mmap:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                f.seek(0)
+                buffer = f.read()
+        typecode = 'I' if width == 4 else 'Q'
+        sizes = _level_sizes(count)
+        data_start = _HEADER.size + (count + 1) * width + sum(sizes) * 4
+        if len(buffer) < data_start + key_bytes:
+            if use_mmap:
+                buffer.close()
+            raise ValueError(f"'{path}' is truncated")
+
+        position = _HEADER.size
+        if sys.byteorder == 'little':
+            view = memoryview(buffer)
+            offsets = view[position:position + (count + 1) * width].cast(typecode)
+        else:
+            offsets = array(typecode, buffer[position:position + (count + 1) * width])
+            offsets.byteswap()
+        position += (count + 1) * width
+        levels = []
+        for size in sizes:
+            if sys.byteorder == 'little':
+                level = view[position:position + size * 4].cast('I')
+            else:
+                level = array('I', buffer[position:position + size * 4])
+                level.byteswap()
+            levels.append(level)
+            position += size * 4
+        return cls(offsets, levels, buffer, data_start, buffer if use_mmap else None)
+
+    def close(self):
+        """
+        Release the memory map of a loaded index.
+        """
+        if self._mapped is not None:
+            for values in [self._offsets] + self._levels:
+                if isinstance(values, memoryview):
+                    values.release()
+            self._mapped.close()
+            self._mapped = None
+            self._offsets = array('I', [0])
+            self._levels = [array('I')]
+            self._data = b''
+            self._data_start = 0
+            self._keys = _Keys(self._offsets, b'', 0)
+            self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m addressScraper.typeahead', description='Build a typeahead index from a file of addresses.')
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--column', default=None, help='address column of a CSV input (default: one address per line)')
+    parser.add_argument('--field', default='address', choices=KEY_FIELDS, help='index addresses without or with their unit')
+    parser.add_argument('--mode', default='serial', help='batch execution mode')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--encoding', default='utf-8')
+    args = parser.parse_args(argv)
+
+    index = TypeaheadIndex.build(_read_addresses(args.input, args.column, args.encoding), args.field,
+                                 mode=args.mode, workers=args.workers)
+    index.save(args.output)
+    print(f"{len(index)} addresses ({index.nbytes()} bytes) written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Adversarial and fuzz latency benchmark for parse_address.
+
+Runs families of pathological inputs (long whitespace runs, repeated '&',
+long digit runs, repeated unit designators, random byte soup, ...) at
+increasing lengths and reports p50/p99/max latency per length, with warnings
+on, so a superlinear path shows up as a max that grows faster than the length.
+
+    python benchmarks/adversarial.py
+    python benchmarks/adversarial.py --max-address-length 100000   # time the parser itself past the cap
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from addressScraper import addressScraper  # noqa: E402
+
+FAMILIES = {
+    'whitespace': lambda n, rng: '1 MAIN ST' + ' ' * n + 'X',
+    'tabs': lambda n, rng: '1 MAIN ST' + '\t' * n + '&',
+    'ampersands': lambda n, rng: '1 MAIN ' + '& ' * (n // 2) + 'ST',
+    'digit run': lambda n, rng: 'APT 3 5 ' + '1' * n + 'Z ST',
+    'digit run unit': lambda n, rng: '1 MAIN ST APT ' + '1' * n + ' Q',
+    'numbers': lambda n, rng: '12 ' * (n // 3),
+    'fractions': lambda n, rng: '5 ' + '1/2 ' * (n // 4) + 'ST',
+    'unit words': lambda n, rng: '1 MAIN ST ' + 'APT 1 ' * (n // 6),
+    'street types': lambda n, rng: '1 ' + 'ST RD AVE ' * (n // 10),
+    'punctuation': lambda n, rng: '1 MAIN ST' + ' ,.#' * (n // 4),
+    'fuzz': lambda n, rng: ''.join(rng.choice('0123456789 &#/-,.ABCNSTEW\t') for _ in range(n)),
+}
+LENGTHS = (16, 64, 256, 1000, 4096, 16384, 65536)
+
+
+def _percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, max(0, -(-len(sorted_values) * pct // 100) - 1))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--samples', type=int, default=20, help='inputs per family and length')
+    parser.add_argument('--max-address-length', type=int, default=None, help='override MAX_ADDRESS_LENGTH')
+    args = parser.parse_args(argv)
+
+    if args.max_address_length is not None:
+        addressScraper.MAX_ADDRESS_LENGTH = args.max_address_length
+    print(f"MAX_ADDRESS_LENGTH = {addressScraper.MAX_ADDRESS_LENGTH}, {args.samples} samples per family and length")
+    print(f"{'length':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}  slowest family")
+
+    rng = random.Random(0)
+    sink = io.StringIO()
+    for length in LENGTHS:
+        timings = []
+        for family, make in FAMILIES.items():
+            for _ in range(args.samples):
+                address = make(length, rng)
+                started = time.perf_counter()
+                with contextlib.redirect_stdout(sink):
+                    addressScraper.parse_address(address, True)
+                timings.append((time.perf_counter() - started, family))
+                sink.seek(0)
+                sink.truncate()
+        timings.sort()
+        values = [elapsed * 1000 for elapsed, _ in timings]
+        print(f"{length:>7} {_percentile(values, 50):>9.3f} {_percentile(values, 99):>9.3f} {values[-1]:>9.3f}  {timings[-1][1]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Converting parse results to Arrow: a schema-less Table.from_pylist vs. results_to_record_batch, and Parquet end to end.
+
+    python benchmarks/arrow_export.py --count 200000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from addressScraper.arrow import pyarrow, results_to_record_batch, write_parquet  # noqa: E402
+from addressScraper.batch import parse_addresses  # noqa: E402
+from corpus import make_addresses  # noqa: E402
+
+
+def timed(function, *args, repeat=3):
+    """
+    Best of `repeat` runs, as single runs are noisy at this scale.
+    """
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=200000)
+    args = parser.parse_args(argv)
+    if pyarrow is None:
+        raise SystemExit('pyarrow is not installed: pip install "addressScraper[arrow]"')
+
+    addresses = make_addresses(args.count)
+    parse_seconds = timed(parse_addresses, addresses, repeat=1)
+    results = parse_addresses(addresses)
+    pylist_seconds = timed(pyarrow.Table.from_pylist, [result for result in results if result is not None])
+    batch_seconds = timed(results_to_record_batch, results)
+    batch = results_to_record_batch(results)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'parsed.parquet')
+        parquet_seconds = timed(write_parquet, addresses, path, repeat=1)
+        parquet_bytes = os.path.getsize(path)
+
+    print(f"{args.count} addresses, parsed in {parse_seconds:.2f}s")
+    print(f"  Table.from_pylist        {pylist_seconds:.2f}s ({pylist_seconds / parse_seconds:.0%} of parsing)")
+    print(f"  results_to_record_batch  {batch_seconds:.2f}s ({batch_seconds / parse_seconds:.0%} of parsing), "
+          f"{batch.nbytes / 2 ** 20:.1f} MB")
+    print(f"  write_parquet end to end {parquet_seconds:.2f}s ({args.count / parquet_seconds:.0f} rows/s), "
+          f"{parquet_bytes / 2 ** 20:.1f} MB file")
+
+
+if __name__ == '__main__':
+    main()
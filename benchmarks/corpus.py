@@ -0,0 +1,31 @@
+"""
+Deterministic synthetic address corpus shared by the benchmark scripts.
+"""
+import random
+
+from addressScraper.street_suffix_mapping import street_suffix_mapping
+
+_NAMES = ['MAIN', 'ELM', 'OAK', 'PINE', 'MAPLE', 'CEDAR', 'WASHINGTON', 'LAKE SHORE', 'BAKER', 'BROADWAY',
+          'MARTIN LUTHER KING', '35TH', '5TH', 'FIRST', 'SOUTHPORT', 'GEIST WOODS', 'CULBREATH KEY', 'CORTEZ']
+_DIRECTIONS = ['', '', '', 'N', 'S', 'E', 'W', 'NORTH', 'SOUTHWEST', 'NE']
+_UNITS = ['', '', '', 'APT 2B', 'SUITE 100', 'UNIT #200', 'STE 201', 'LOT 61-3', 'FL 15', 'APARTMENT 9-316']
+
+
+def make_addresses(count, seed=0):
+    """
+    Build `count` realistic-looking, mixed-case addresses from a fixed seed.
+    """
+    rng = random.Random(seed)
+    suffixes = sorted(street_suffix_mapping)
+    addresses = []
+    for _ in range(count):
+        parts = [str(rng.randint(1, 20000)) + rng.choice(['', '', '', 'B', '-4', ' 1/2']),
+                 rng.choice(_DIRECTIONS), rng.choice(_NAMES), rng.choice(suffixes),
+                 rng.choice(_DIRECTIONS), rng.choice(_UNITS)]
+        address = ' '.join(part for part in parts if part)
+        if rng.random() < 0.5:
+            address = address.title()
+        if rng.random() < 0.2:
+            address = address.replace(' APT', ', Apt').replace(' SUITE', ', Suite')
+        addresses.append(address)
+    return addresses
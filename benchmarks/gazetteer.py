@@ -0,0 +1,65 @@
+"""
+Parse cost of confirming streets against a gazetteer, as the gazetteer grows.
+
+    python benchmarks/gazetteer.py --count 50000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from addressScraper.addressScraper import parse_address  # noqa: E402
+from addressScraper.config import compile_config  # noqa: E402
+from addressScraper.gazetteer import build_gazetteer  # noqa: E402
+from corpus import make_addresses  # noqa: E402
+
+
+def known_streets(addresses, extra):
+    """
+    The corpus's own streets plus `extra` made-up ones, so most lookups hit and the table is large.
+    """
+    streets = {result['street'] for result in map(parse_address, addresses) if result and result['street']}
+    streets.update(f'STREET{i} {("RD", "AVE", "ST", "BLVD")[i % 4]}' for i in range(extra))
+    return streets
+
+
+def timed(addresses, config, repeat=3):
+    """
+    Best of `repeat` passes, as single passes are noisy at this scale.
+    """
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for address in addresses:
+            parse_address(address, config=config)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    addresses = make_addresses(args.count)
+    base_seconds = timed(addresses, None)
+    print(f"{args.count} addresses, no gazetteer: {base_seconds / args.count * 1e6:.2f} us/addr")
+    print(f"{'streets':>9} {'file KB':>9} {'us/addr':>9} {'overhead':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for extra in (0, 10000, 1000000):
+            path = os.path.join(directory, f'streets{extra}.gaz')
+            count = build_gazetteer(known_streets(addresses, extra), path)
+            config = compile_config(gazetteer=path)
+            parse_address(addresses[0], config=config)
+            seconds = timed(addresses, config)
+            print(f"{count:>9} {os.path.getsize(path) / 1024:>9.0f} {seconds / args.count * 1e6:>9.2f} "
+                  f"{seconds / base_seconds - 1:>9.0%}")
+            config.gazetteer.close()
+
+
+if __name__ == '__main__':
+    main()
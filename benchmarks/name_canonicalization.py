@@ -0,0 +1,56 @@
+"""
+Parse cost of canonicalizing street names (number words, ordinals, SAINT and MOUNT).
+
+    python benchmarks/name_canonicalization.py --count 50000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from addressScraper.addressScraper import parse_address  # noqa: E402
+from addressScraper.config import compile_config  # noqa: E402
+from corpus import make_addresses  # noqa: E402
+
+_SPELLED = ('FIFTH', 'TWENTY-THIRD', 'ONE HUNDRED TWENTY FIRST', 'SAINT JAMES', 'MOUNT VERNON', 'FORTY TWO')
+
+
+def spelled_addresses(count):
+    """
+    Addresses whose street names all have something to canonicalize.
+    """
+    return [f'{100 + i % 900} {_SPELLED[i % len(_SPELLED)]} {("ST", "AVE", "RD")[i % 3]} SPRINGFIELD IL 62704'
+            for i in range(count)]
+
+
+def timed(addresses, config, repeat=3):
+    """
+    Best of `repeat` passes, as single passes are noisy at this scale.
+    """
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for address in addresses:
+            parse_address(address, config=config)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    config = compile_config(canonical_names=True)
+    print(f"{'corpus':>8} {'off us':>8} {'on us':>8} {'overhead':>9}")
+    for name, addresses in (('mixed', make_addresses(args.count)), ('spelled', spelled_addresses(args.count))):
+        off = timed(addresses, None)
+        on = timed(addresses, config)
+        print(f"{name:>8} {off / args.count * 1e6:>8.2f} {on / args.count * 1e6:>8.2f} {on / off - 1:>9.1%}")
+
+
+if __name__ == '__main__':
+    main()
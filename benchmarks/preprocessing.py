@@ -0,0 +1,59 @@
+"""
+Share of parse time spent in preprocessing, per address vs. per batch.
+
+    python benchmarks/preprocessing.py --count 500000 --batch-size 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from addressScraper.addressScraper import (  # noqa: E402
+    _preprocess, parse_address, parse_addresses_preprocessed, preprocess_addresses,
+)
+from corpus import make_addresses  # noqa: E402
+
+
+def timed(function, batches):
+    started = time.perf_counter()
+    for batch in batches:
+        function(batch)
+    return time.perf_counter() - started
+
+
+def per_address_preprocess(batch):
+    return [_preprocess(address) for address in batch]
+
+
+def per_address_parse(batch):
+    return [parse_address(address) for address in batch]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=200000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    addresses = make_addresses(args.count)
+    batches = [addresses[i:i + args.batch_size] for i in range(0, len(addresses), args.batch_size)]
+    if [parse_addresses_preprocessed(batch) for batch in batches] != [per_address_parse(batch) for batch in batches]:
+        raise SystemExit("batch preprocessing changed the results")
+
+    per_address = timed(per_address_preprocess, batches)
+    per_batch = timed(preprocess_addresses, batches)
+    parse_per_address = timed(per_address_parse, batches)
+    parse_per_batch = timed(parse_addresses_preprocessed, batches)
+
+    print(f"{args.count} addresses in batches of {args.batch_size}")
+    print(f"{'':>22} {'seconds':>9} {'addr/s':>11} {'share':>7}")
+    print(f"{'preprocess, per row':>22} {per_address:>9.3f} {args.count / per_address:>11,.0f} {per_address / parse_per_address:>7.1%}")
+    print(f"{'preprocess, per batch':>22} {per_batch:>9.3f} {args.count / per_batch:>11,.0f} {per_batch / parse_per_batch:>7.1%}")
+    print(f"{'parse, per row':>22} {parse_per_address:>9.3f} {args.count / parse_per_address:>11,.0f}")
+    print(f"{'parse, per batch':>22} {parse_per_batch:>9.3f} {args.count / parse_per_batch:>11,.0f}")
+
+
+if __name__ == '__main__':
+    main()
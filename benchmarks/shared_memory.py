@@ -0,0 +1,44 @@
+"""
+Shared-memory process pool vs. the plain pickled process pool.
+
+    python benchmarks/shared_memory.py --count 500000 --workers 8
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from addressScraper.batch import parse_addresses  # noqa: E402
+from corpus import make_addresses  # noqa: E402
+
+
+def timed(addresses, mode, workers, chunk_size):
+    started = time.perf_counter()
+    results = parse_addresses(addresses, mode=mode, workers=workers, chunk_size=chunk_size)
+    return time.perf_counter() - started, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=200000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    addresses = make_addresses(args.count)
+    print(f"{args.count} addresses, {args.workers} workers")
+    print(f"{'mode':>14} {'seconds':>9} {'addr/s':>11}")
+    expected = None
+    for mode in ('serial', 'process', 'shared_memory'):
+        elapsed, results = timed(addresses, mode, args.workers, args.chunk_size)
+        if expected is None:
+            expected = results
+        elif results != expected:
+            raise SystemExit(f"'{mode}' results differ from the serial run")
+        print(f"{mode:>14} {elapsed:>9.3f} {args.count / elapsed:>11,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Cost of finding multi-word street types as the phrase table grows: token trie vs. a scan over every phrase.
+
+    python benchmarks/street_type_phrases.py --count 50000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from addressScraper.addressScraper import (  # noqa: E402
+    _TOKEN_STREET_TYPE, _build_phrase_trie, _classify_tokens, _match_phrase, _preprocess, _street_type_phrases,
+)
+from corpus import make_addresses  # noqa: E402
+
+_HIGHWAYS = ['100 STATE ROAD 7', '12 US HIGHWAY 19 N', '5 COUNTY RD 220 W APT 4', '456 OLD HIGHWAY 441', '10 US RTE 1']
+
+
+def synthetic_phrases(count):
+    """
+    The real phrases plus `count` made-up ones ending in the same road types.
+    """
+    phrases = set(_street_type_phrases)
+    for i in range(count):
+        phrases.add(f'DESIGNATOR{i} {("RD", "HWY", "RTE", "ST")[i % 4]}')
+    return phrases
+
+
+def scan_match(phrases, tokens, end):
+    """
+    Longest phrase ending at tokens[end], trying every phrase in turn.
+    """
+    words = tuple(canonical for _, canonical in tokens[:end + 1])
+    match = None
+    for phrase in phrases:
+        if len(phrase) <= len(words) and words[len(words) - len(phrase):] == phrase:
+            if match is None or len(phrase) > len(match[1]):
+                match = (len(words) - len(phrase), phrase)
+    return match
+
+
+def street_type_ends(addresses):
+    ends = []
+    for address in addresses:
+        tokens = _classify_tokens(_preprocess(address).split())
+        for i in range(len(tokens) - 1, -1, -1):
+            if tokens[i][0] & _TOKEN_STREET_TYPE:
+                ends.append((tokens, i))
+                break
+    return ends
+
+
+def timed(function, table, ends):
+    started = time.perf_counter()
+    for tokens, end in ends:
+        function(table, tokens, end)
+    return time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    addresses = make_addresses(args.count)
+    for i in range(0, len(addresses), 50):
+        addresses[i] = _HIGHWAYS[i // 50 % len(_HIGHWAYS)]
+    ends = street_type_ends(addresses)
+    # The scan is slow on large tables, so it is timed on a sample
+    sample = ends[:2000]
+
+    print(f"{len(ends)} street types located, {args.count} addresses")
+    print(f"{'phrases':>8} {'trie us/addr':>13} {'scan us/addr':>13}")
+    for extra in (0, 100, 1000, 10000):
+        phrases = synthetic_phrases(extra)
+        trie = _build_phrase_trie(phrases)
+        split = [tuple(phrase.split()) for phrase in phrases]
+        trie_seconds = timed(_match_phrase, trie, ends)
+        scan_seconds = timed(scan_match, split, sample)
+        print(f"{len(phrases):>8} {trie_seconds / len(ends) * 1e6:>13.3f} {scan_seconds / len(sample) * 1e6:>13.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Thread-scaling benchmark for parse_address.
+
+Parses the same corpus with 1..N threads and reports throughput, speedup and
+parallel efficiency (speedup / threads). Works on both GIL and free-threaded
+(e.g. 3.13t) builds; on a GIL build efficiency is expected to fall roughly as
+1/threads, on a free-threaded build it should stay close to 1.0.
+
+    python benchmarks/thread_scaling.py --count 200000 --max-threads 8
+"""
+import argparse
+import os
+import sys
+import sysconfig
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from addressScraper import parse_address  # noqa: E402
+from corpus import make_addresses  # noqa: E402
+
+
+def _gil_enabled():
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    if is_gil_enabled is not None:
+        return is_gil_enabled()
+    return True
+
+
+def _parse_slice(addresses):
+    return [parse_address(address) for address in addresses]
+
+
+def run(addresses, threads, repeat):
+    size = -(-len(addresses) // threads)
+    slices = [addresses[start:start + size] for start in range(0, len(addresses), size)]
+    best = None
+    results = None
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            results = [parsed for chunk in executor.map(_parse_slice, slices) for parsed in chunk]
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=50000)
+    parser.add_argument('--max-threads', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    addresses = make_addresses(args.count)
+    free_threaded = bool(sysconfig.get_config_var('Py_GIL_DISABLED'))
+    print(f"Python {sys.version.split()[0]}, free-threaded build: {free_threaded}, GIL enabled: {_gil_enabled()}")
+    print(f"{args.count} addresses, best of {args.repeat}")
+    print(f"{'threads':>7} {'seconds':>9} {'addr/s':>11} {'speedup':>8} {'efficiency':>10}")
+
+    expected = _parse_slice(addresses)
+    baseline = None
+    for threads in range(1, args.max_threads + 1):
+        elapsed, results = run(addresses, threads, args.repeat)
+        if results != expected:
+            raise SystemExit(f"Results with {threads} threads differ from the serial run")
+        baseline = baseline or elapsed
+        speedup = baseline / elapsed
+        print(f"{threads:>7} {elapsed:>9.3f} {args.count / elapsed:>11,.0f} {speedup:>8.2f} {speedup / threads:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
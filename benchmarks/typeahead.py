@@ -0,0 +1,57 @@
+"""
+Typeahead latency and size: suggestions for prefixes of real addresses, by prefix length.
+
+    python benchmarks/typeahead.py --count 500000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from addressScraper.typeahead import TypeaheadIndex  # noqa: E402
+from corpus import make_addresses  # noqa: E402
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=500000)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    addresses = make_addresses(args.count)
+    started = time.perf_counter()
+    index = TypeaheadIndex.build(addresses)
+    build_seconds = time.perf_counter() - started
+    print(f"{args.count} addresses, {len(index)} distinct, built in {build_seconds:.1f}s, "
+          f"{index.nbytes() / len(index):.1f} bytes/address ({index.nbytes() / 2 ** 20:.1f} MB)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'addresses.typeahead')
+        index.save(path)
+        with TypeaheadIndex.load(path) as mapped:
+            rng = random.Random(1)
+            print(f"{'typed':>6} {'p50 us':>8} {'p99 us':>8} {'hits':>6}")
+            for length in (1, 3, 6, 9, 12, 16):
+                timings = []
+                hits = 0
+                for _ in range(args.queries):
+                    text = rng.choice(addresses)[:length]
+                    started = time.perf_counter()
+                    hits += len(mapped.complete(text, args.k))
+                    timings.append(time.perf_counter() - started)
+                print(f"{length:>6} {percentile(timings, 0.5) * 1e6:>8.0f} {percentile(timings, 0.99) * 1e6:>8.0f} "
+                      f"{hits / args.queries:>6.1f}")
+
+
+if __name__ == '__main__':
+    main()
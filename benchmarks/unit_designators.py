@@ -0,0 +1,94 @@
+"""
+Unit extraction: the designator trie regex in one search vs. the flat alternation searched and then re.sub'd.
+
+    python benchmarks/unit_designators.py --count 100000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from addressScraper.addressScraper import (  # noqa: E402
+    _base_tables, _find_unit, _preprocess, _unit_identifiers, parse_address,
+)
+from corpus import make_addresses  # noqa: E402
+
+# The previous path: search a flat alternation for a designator and its number, then re.sub the designators out
+_pattern = r'\b(' + '|'.join(_unit_identifiers) + r')\b'
+_unit_identifier_re = re.compile(_pattern)
+_unit_re = re.compile(_pattern + r'\s*[A-Z\d\-]+')
+
+
+def regex_unit(text):
+    match = _unit_re.search(text)
+    unit = match.group() if match else text
+    return unit, _unit_identifier_re.sub('', unit).strip()
+
+
+def trie_unit(text):
+    return _find_unit(text, _base_tables)[:2]
+
+
+def regex_designator(text):
+    return _unit_identifier_re.search(text)
+
+
+def trie_designator(text):
+    return _base_tables.unit_identifier_re.search(text)
+
+
+def unit_texts(addresses):
+    """
+    The text each address leaves after its street, as the parser sees it.
+    """
+    texts = []
+    for address in addresses:
+        parsed = parse_address(address)
+        if parsed and parsed['address']:
+            remaining = _preprocess(address).replace(parsed['address'], '', 1).strip()
+            if remaining and '#' not in remaining:
+                texts.append(remaining)
+    return texts
+
+
+def timed(function, texts, repeat=5):
+    """
+    Best of `repeat` passes, as single passes are noisy at this scale.
+    """
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            function(text)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    addresses = make_addresses(args.count)
+    units = unit_texts(addresses)
+    if [regex_unit(text) for text in units] != [trie_unit(text) for text in units]:
+        raise SystemExit("the designator trie changed the results")
+    # The edge-case check looks for a designator anywhere in the whole reconstructed address
+    normalized = [result['addressUnit'] or result['address'] for result in map(parse_address, addresses) if result]
+
+    print(f"{len(units)} unit texts, {len(normalized)} addresses")
+    print(f"{'':>28} {'flat ns':>9} {'trie ns':>9}")
+    for label, texts, regex_path, trie_path in (
+            ('unit + stripped (unit text)', units, regex_unit, trie_unit),
+            ('first designator (address)', normalized, regex_designator, trie_designator)):
+        regex_seconds = timed(regex_path, texts)
+        trie_seconds = timed(trie_path, texts)
+        print(f"{label:>28} {regex_seconds / len(texts) * 1e9:>9.0f} {trie_seconds / len(texts) * 1e9:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -17,5 +17,8 @@ setup(
     ],
     python_requires='>=3.6',
     install_requires=[],
+    extras_require={
+        'arrow': ['pyarrow>=8'],
+    },
     include_package_data=True,
 )
@@ -0,0 +1,20 @@
+import pytest
+
+from addressScraper import parse_addresses, parse_addresses_columnar
+
+
+@pytest.mark.parametrize('parse', [parse_addresses, parse_addresses_columnar])
+def test_invalid_fingerprint_bits_raises_once_with_rejects(parse):
+    rejects = []
+    with pytest.raises(ValueError, match='Fingerprint width'):
+        parse(['1234 Main Street', '55 W Wacker Drive'], rejects=rejects, fingerprintBits=32)
+    assert rejects == []
+
+
+def test_rejects_collect_unparseable_rows():
+    rejects = []
+    results = parse_addresses(['1234 Main Street', None], rejects=rejects, fingerprintBits=64)
+    assert results[0]['streetName'] == 'MAIN'
+    assert isinstance(results[0]['fingerprint'], int)
+    assert results[1] is None
+    assert [index for index, _, _ in rejects] == [1]
@@ -0,0 +1,17 @@
+import csv
+
+from addressScraper.bulk import normalize_file
+
+
+def test_output_keeps_input_address_column(tmp_path):
+    source = tmp_path / 'input.csv'
+    source.write_text('id,address\n1,1234 Main Street Apt 5\n2,55 W Wacker Drive\n', encoding='utf-8')
+    output = tmp_path / 'output.csv'
+
+    assert normalize_file(str(source), str(output), column='address', workers=1) == (2, 0)
+
+    with open(output, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['address'] for row in rows] == ['1234 Main Street Apt 5', '55 W Wacker Drive']
+    assert [row['parsed_address'] for row in rows] == ['1234 MAIN ST', '55 W WACKER DR']
+    assert rows[0]['addressUnit'] == '1234 MAIN ST APT 5'
@@ -0,0 +1,85 @@
+import os
+import pickle
+from types import MappingProxyType
+
+import pytest
+
+from addressScraper import parse_address
+from addressScraper.addressScraper import _street_suffix_table, _unit_identifiers
+from addressScraper.config import DEFAULT_CONFIG, _configs, compile_config, config_cache_info
+from addressScraper.gazetteer import build_gazetteer
+
+CANONICAL = compile_config(canonical_names=True)
+OVERLAYS = {'street_suffixes': {'AVENUE': 'AV', 'PROMENADE': 'PROM'}, 'unit_identifiers': ['SLIP']}
+
+
+def test_equal_overlays_return_the_cached_config():
+    config = compile_config(**OVERLAYS)
+    assert compile_config(street_suffixes={'promenade': 'prom', ' avenue ': 'av'}, unit_identifiers=['slip']) is config
+    assert config.digest in config_cache_info()
+    assert compile_config() is DEFAULT_CONFIG
+    assert compile_config(**OVERLAYS, canonical_units=True) is not config
+
+
+def test_overlays_change_parsing_but_not_the_base_tables():
+    base_table = dict(_street_suffix_table)
+    base_units = tuple(_unit_identifiers)
+    config = compile_config(**OVERLAYS)
+    before = parse_address('12 Harbor Promenade Slip 4')
+    result = parse_address('12 Harbor Promenade Slip 4', config=config)
+    assert (result['streetType'], result['unitNumber']) == ('PROM', 'SLIP 4')
+    assert parse_address('12 Harbor Avenue', config=config)['streetType'] == 'AV'
+    # Parsing with the overlay leaves the default parse, and the tables behind it, as they were
+    assert parse_address('12 Harbor Promenade Slip 4') == before
+    assert parse_address('12 Harbor Avenue')['streetType'] == 'AVE'
+    assert dict(_street_suffix_table) == base_table and tuple(_unit_identifiers) == base_units
+    assert isinstance(config.street_suffixes, MappingProxyType)
+
+
+def test_config_pickles_as_its_overlays(tmp_path, monkeypatch):
+    path = str(tmp_path / 'streets.gaz')
+    build_gazetteer(['N Broadway'], path)
+    config = compile_config(**OVERLAYS, canonical_units=True, gazetteer=path, canonical_names=True)
+    assert pickle.loads(pickle.dumps(config)) is config
+    # A process that has not compiled it rebuilds the same config from the overlays
+    monkeypatch.delitem(_configs, config.digest)
+    copy = pickle.loads(pickle.dumps(config))
+    assert copy is not config and copy.digest == config.digest
+    address = '601 N Broadway Apartment 4'
+    assert parse_address(address, config=copy) == parse_address(address, config=config)
+
+
+def test_gazetteer_modification_time_is_part_of_the_digest(tmp_path):
+    path = str(tmp_path / 'streets.gaz')
+    build_gazetteer(['N Broadway'], path)
+    config = compile_config(gazetteer=path)
+    assert compile_config(gazetteer=path) is config
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    rebuilt = compile_config(gazetteer=path)
+    assert rebuilt is not config and rebuilt.digest != config.digest
+
+
+@pytest.mark.parametrize('address, street_name', [
+    ('1 Fifth Ave', '5TH'),
+    ('1 Five Ave', '5TH'),
+    ('1 5th Ave', '5TH'),
+    ('1 Twenty-First St', '21ST'),
+    ('1 One Hundred and Twelfth St', '112TH'),
+    ('1 One Hundred Twenty-First St', '121ST'),
+    ('5 Five Points Rd', '5 POINTS'),
+    ('9 Saint Johns Pl', 'ST JOHNS'),
+    ('9 Mount Vernon Ave', 'MT VERNON'),
+])
+def test_canonical_names(address, street_name):
+    assert parse_address(address, config=CANONICAL)['streetName'] == street_name
+
+
+@pytest.mark.parametrize('address, street_name', [
+    ('1 Fifth Ave', 'FIFTH'),
+    ('1 Five Ave', 'FIVE'),
+    ('9 Saint Johns Pl', 'SAINT JOHNS'),
+    ('9 Mount Vernon Ave', 'MOUNT VERNON'),
+])
+def test_default_config_leaves_names_unchanged(address, street_name):
+    assert parse_address(address)['streetName'] == street_name
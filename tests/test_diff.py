@@ -0,0 +1,33 @@
+import pytest
+
+from addressScraper.diff import compare_parsers
+
+ADDRESSES = ['5 Main St Apartment 2', '1234 Main Street', 'raise here', '55 W Wacker Drive Suite 201']
+
+
+def flaky_parse(address):
+    if address == 'raise here':
+        raise RuntimeError('bad row')
+    from addressScraper import parse_address
+    return parse_address(address)
+
+
+def test_configurations_are_compared_per_side():
+    report = compare_parsers(ADDRESSES[:2] + ADDRESSES[3:], workers=1, candidate_config={'canonical_units': True})
+    assert report['changedRows'] == 2
+    assert report['fields'] == {'unitNumber': 2, 'addressUnit': 2}
+    assert report['samples'][0]['candidate']['unitNumber'] == 'APT 2'
+
+
+def test_row_errors_are_reported_as_differences():
+    report = compare_parsers(ADDRESSES, candidate=f'{__name__}:flaky_parse', workers=1)
+    assert report['rows'] == 4
+    assert report['changedRows'] == 1
+    assert report['fields'] == {'error': 1}
+    assert report['candidateErrors'] == 1 and report['baselineErrors'] == 0
+    assert report['samples'][0]['candidate'] == {'error': 'RuntimeError: bad row'}
+
+
+def test_function_specs_take_no_configuration():
+    with pytest.raises(ValueError, match='no configuration'):
+        compare_parsers(ADDRESSES, candidate=f'{__name__}:flaky_parse', workers=1, candidate_config={})
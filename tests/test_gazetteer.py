@@ -0,0 +1,86 @@
+import struct
+from bisect import bisect_left
+
+import pytest
+
+from addressScraper import parse_address
+from addressScraper.config import compile_config
+from addressScraper.gazetteer import _INDEX_STEP, StreetGazetteer, build_gazetteer, street_key
+
+STREETS = ['N Broadway', 'Avenue of the Americas', 'Main Street', 'Cedar Place Court', 'West End Avenue']
+UNLISTED = ['1234 Elm Street Apt 5', '55 W Wacker Drive Suite 201', '9 Oak Ln', 'PO Box 12']
+
+
+@pytest.fixture
+def gazetteer_path(tmp_path):
+    path = str(tmp_path / 'streets.gaz')
+    build_gazetteer(STREETS, path)
+    return path
+
+
+def test_street_keys_use_usps_street_types():
+    assert street_key('Avenue of the Americas') == 'AVE OF THE AMERICAS'
+    assert street_key('Cedar Place Court') == street_key('CEDAR PL CT') == 'CEDAR PL CT'
+    assert street_key('') is None and street_key(None) is None
+
+
+def test_file_format(gazetteer_path):
+    with open(gazetteer_path, 'rb') as f:
+        data = f.read()
+    magic, count = struct.unpack_from('<8sQ', data)
+    assert magic == b'ASGAZET1' and count == len(STREETS)
+    offsets = struct.unpack_from(f'<{count + 1}Q', data, 16)
+    start = 16 + (count + 1) * 8
+    keys = [data[start + a:start + b] for a, b in zip(offsets, offsets[1:])]
+    assert keys == sorted(street_key(street).encode('utf-8') for street in STREETS)
+    assert len(data) == start + offsets[-1]
+
+
+def test_rejects_other_and_truncated_files(tmp_path, gazetteer_path):
+    other = tmp_path / 'other.gaz'
+    other.write_bytes(b'not a gazetteer at all')
+    with pytest.raises(ValueError, match='not a street gazetteer'):
+        len(StreetGazetteer(str(other)))
+    truncated = tmp_path / 'truncated.gaz'
+    with open(gazetteer_path, 'rb') as f:
+        truncated.write_bytes(f.read()[:-3])
+    with pytest.raises(ValueError, match='truncated'):
+        len(StreetGazetteer(str(truncated)))
+
+
+def test_search_matches_a_full_bisect(tmp_path):
+    # Enough keys for several index blocks, so every block boundary is searched
+    names = [f'{i:04d} ST' for i in range(0, _INDEX_STEP * 5, 2)]
+    path = str(tmp_path / 'numbered.gaz')
+    build_gazetteer(names, path)
+    gazetteer = StreetGazetteer(path)
+    keys = sorted(name.encode('utf-8') for name in names)
+    probes = [b'', b'0', b'9999 ST'] + keys + [f'{i:04d} ST'.encode('utf-8') for i in range(1, _INDEX_STEP * 5, 2)]
+    for probe in probes:
+        assert gazetteer._search(probe) == bisect_left(keys, probe), probe
+    gazetteer.close()
+
+
+def test_longest_match(gazetteer_path):
+    gazetteer = StreetGazetteer(gazetteer_path)
+    assert gazetteer.longest_match(['300', 'AVE', 'OF', 'THE', 'AMERICAS'], 1) == 5
+    assert gazetteer.longest_match(['601', 'N', 'BROADWAY', 'FL', '15'], 1) == 3
+    assert gazetteer.longest_match(['1', 'MAIN', 'ST', 'STE', '2'], 1) == 3
+    # A word prefix of a known street is not a match
+    assert gazetteer.longest_match(['1', 'MAIN'], 1) is None
+    assert gazetteer.longest_match(['1', 'MAINE', 'ST'], 1) is None
+    assert gazetteer.longest_match(['1', 'AAA'], 1) is None
+    assert 'Cedar Pl Ct' in gazetteer and 'Cedar' not in gazetteer
+
+
+def test_known_streets_set_street_bounds(gazetteer_path):
+    config = compile_config(gazetteer=gazetteer_path)
+    result = parse_address('601 N Broadway FL 15', config=config)
+    assert (result['streetName'], result['streetDirectionPrefix'], result['unitNumber']) == ('N BROADWAY', None, 'FL 15')
+    result = parse_address('300 Avenue of the Americas', config=config)
+    assert (result['streetName'], result['streetType'], result['unitNumber']) == ('AVENUE OF THE AMERICAS', None, None)
+
+
+@pytest.mark.parametrize('address', UNLISTED)
+def test_unlisted_streets_parse_unchanged(gazetteer_path, address):
+    assert parse_address(address, config=compile_config(gazetteer=gazetteer_path)) == parse_address(address)
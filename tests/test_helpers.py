@@ -0,0 +1,45 @@
+import pytest
+
+from addressScraper import (
+    get_address_with_unit,
+    get_street_name,
+    get_street_number,
+    get_street_prefix,
+    get_street_suffix,
+    get_street_type,
+    get_unit_info,
+    get_unit_info_stripped,
+    is_complete,
+    normalize_address,
+)
+
+HELPERS = [
+    normalize_address,
+    get_unit_info,
+    get_unit_info_stripped,
+    get_street_number,
+    get_street_name,
+    get_street_type,
+    get_address_with_unit,
+    get_street_prefix,
+    get_street_suffix,
+]
+
+
+@pytest.mark.parametrize('helper', HELPERS)
+@pytest.mark.parametrize('address', [None, 1234, ['1234 Main St'], '', '   '])
+def test_helpers_return_none_for_unparseable_input(helper, address):
+    assert helper(address) is None
+
+
+@pytest.mark.parametrize('address', [None, 1234, '', '   '])
+def test_is_complete_is_false_for_unparseable_input(address):
+    assert is_complete(address) is False
+
+
+def test_helpers_read_parsed_fields():
+    assert normalize_address('1234 Main Street, Unit 5') == '1234 MAIN ST'
+    assert get_unit_info('1234 Main Street, Unit 5') == 'UNIT 5'
+    assert get_unit_info_stripped('1234 Main Street, Unit 5') == '5'
+    assert get_street_prefix('1234 North Main St') == 'N'
+    assert is_complete('1234 Main Street, Unit 5') is True
@@ -0,0 +1,56 @@
+import pytest
+
+from addressScraper.membership import AddressBloomFilter
+
+MASTER = ['1234 Main Street', '55 W Wacker Drive Suite 201', '9 Oak Ln']
+
+
+def test_build_and_contains():
+    bloom = AddressBloomFilter.build(MASTER, false_positive_rate=0.001)
+    assert bloom.count == 3
+    # Lookups are normalized as the master list was
+    assert bloom.contains_many(['1234 MAIN ST', '55 West Wacker Dr Suite 201', '9 Oak Lane', None]) == [True, True, True, False]
+    assert '77 Elm St' not in bloom
+
+
+def test_unit_key_field():
+    bloom = AddressBloomFilter.build(MASTER, field='addressUnit')
+    assert bloom.contains_many(['55 W Wacker Dr Suite 201', '55 W Wacker Dr Suite 202', '1234 Main St']) == [True, False, True]
+    with pytest.raises(ValueError, match='Key field'):
+        AddressBloomFilter(10, field='street')
+
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_save_and_load(tmp_path, use_mmap):
+    bloom = AddressBloomFilter.build(MASTER)
+    path = str(tmp_path / 'master.bloom')
+    bloom.save(path)
+    loaded = AddressBloomFilter.load(path, use_mmap=use_mmap)
+    assert (loaded.bit_count, loaded.hash_count, loaded.count, loaded.field) == (
+        bloom.bit_count, bloom.hash_count, bloom.count, bloom.field)
+    addresses = MASTER + ['77 Elm St', '1 Fifth Ave']
+    assert loaded.contains_many(addresses) == bloom.contains_many(addresses)
+    if use_mmap:
+        with pytest.raises(TypeError, match='read-only'):
+            loaded.add_many(['77 Elm St'])
+    else:
+        assert loaded.add_many(['77 Elm St']) == 1 and '77 Elm St' in loaded
+    loaded.close()
+
+
+def test_closed_filter_raises(tmp_path):
+    path = str(tmp_path / 'master.bloom')
+    AddressBloomFilter.build(MASTER).save(path)
+    with AddressBloomFilter.load(path) as loaded:
+        assert '9 Oak Ln' in loaded
+    for lookup in (lambda: loaded.contains_many(['9 Oak Ln']), lambda: '9 Oak Ln' in loaded,
+                   lambda: loaded.contains_normalized('9 OAK LN'), lambda: loaded.add_many(['9 Oak Ln'])):
+        with pytest.raises(ValueError, match='filter is closed'):
+            lookup()
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.bloom'
+    path.write_bytes(b'not a filter')
+    with pytest.raises(ValueError, match='not an address Bloom filter'):
+        AddressBloomFilter.load(str(path))
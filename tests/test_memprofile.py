@@ -0,0 +1,18 @@
+import tracemalloc
+
+import pytest
+
+from addressScraper.memprofile import PROFILE_STEPS, profile_memory
+
+
+def test_profile_memory_reports_steps_and_chunks():
+    profile = profile_memory(['1234 Main St', '55 W Wacker Dr Ste 201', None], chunk_size=2, fingerprintBits=64)
+    assert profile.records == 3
+    assert set(profile.steps) == set(PROFILE_STEPS)
+    assert [chunk['records'] for chunk in profile.chunks] == [2, 1]
+
+
+def test_profile_memory_needs_reset_peak(monkeypatch):
+    monkeypatch.delattr(tracemalloc, 'reset_peak')
+    with pytest.raises(RuntimeError, match='Python 3.9'):
+        profile_memory(['1234 Main St'])
@@ -0,0 +1,49 @@
+import pytest
+
+from addressScraper import parse_address
+
+
+def fields(address, *names):
+    result = parse_address(address)
+    return tuple(result[name] for name in names)
+
+
+@pytest.mark.parametrize('address, expected', [
+    ('123 Broadway #5', ('BROADWAY', '# 5', '123 BROADWAY', '123 BROADWAY # 5')),
+    ('123 Broadway # 5B', ('BROADWAY', '# 5B', '123 BROADWAY', '123 BROADWAY # 5B')),
+    ('123 Broadway Suite #100', ('BROADWAY', 'SUITE 100', '123 BROADWAY', '123 BROADWAY SUITE 100')),
+    ('123 Main St #4', ('MAIN', '# 4', '123 MAIN ST', '123 MAIN ST # 4')),
+])
+def test_hash_unit_stays_out_of_the_street(address, expected):
+    assert fields(address, 'streetName', 'unitNumber', 'address', 'addressUnit') == expected
+
+
+def test_hash_unit_after_po_box():
+    assert fields('PO Box #12', 'streetName', 'unitNumber', 'unitNumberStripped', 'address') == (
+        'PO BOX', '# 12', '12', 'PO BOX')
+
+
+@pytest.mark.parametrize('address, expected', [
+    ('55 County Rd', ('COUNTY', 'RD', 'COUNTY RD', None, True)),
+    ('1 State Road Apt 2', ('STATE', 'RD', 'STATE RD', 'APT 2', True)),
+    ('100 State Road 7', (None, 'STATE RD 7', 'STATE RD 7', None, True)),
+    ('12 US Highway 19 N Ste 4', (None, 'US HWY 19', 'US HWY 19', 'STE 4', True)),
+])
+def test_route_phrases_need_a_route_number(address, expected):
+    assert fields(address, 'streetName', 'streetType', 'street', 'unitNumber', 'isComplete') == expected
+
+
+@pytest.mark.parametrize('address, expected', [
+    ('123 #Main St', ('MAIN', 'MAIN ST', None, '123 MAIN ST', None)),
+    ('123 Main # St', ('MAIN', 'MAIN ST', None, '123 MAIN ST', None)),
+    ('1 Main St # 4', ('MAIN', 'MAIN ST', '# 4', '1 MAIN ST', '1 MAIN ST # 4')),
+    ('#5 123 Main St', ('MAIN', 'MAIN ST', '# 5', '123 MAIN ST', '123 MAIN ST # 5')),
+])
+def test_hash_is_never_part_of_the_street(address, expected):
+    assert fields(address, 'streetName', 'street', 'unitNumber', 'address', 'addressUnit') == expected
+
+
+def test_hash_before_a_street_type_is_dropped():
+    result = parse_address('1/2 APT 12 # AVE')
+    assert '#' not in (result['streetName'] or '') + (result['street'] or '') + result['address']
+    assert result['isComplete'] is False
@@ -0,0 +1,18 @@
+from addressScraper.addressScraper import _preprocess, preprocess_addresses
+
+
+def test_mixed_batch_matches_per_row_preprocessing():
+    addresses = [
+        '1234 Main Street, Unit 5',
+        '1 First St & Main St',
+        '  12 Calle Peña Apt #3 ',
+        '55 W Wacker Dr\nSte 201',
+        '123 Broadway #5',
+        None,
+        '   ',
+        'x' * 2000,
+        "402 E Maple STREET Unit #200",
+    ]
+    expected = [_preprocess(address) if isinstance(address, str) and address.strip() and len(address) <= 1000 else None
+                for address in addresses]
+    assert preprocess_addresses(addresses) == expected
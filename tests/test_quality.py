@@ -0,0 +1,34 @@
+from addressScraper import parse_address, parse_addresses
+from addressScraper.quality import QualityStats
+
+
+def test_assumed_street_type_matches_the_parser_for_hash_units():
+    stats = QualityStats()
+    for address in ['123 Broadway #5', '456 Broadway # 7', '9 Elm Xyz']:
+        stats.update(address, parse_address(address))
+    assert stats.no_street_type == 3
+    assert dict(stats.unknown_street_types.counts) == {'BROADWAY': 2, 'XYZ': 1}
+
+
+def test_seeded_parallel_runs_are_reproducible():
+    # Mostly incomplete rows, so the bad-row sample has to choose
+    addresses = [f'{number} Elm Xyz' for number in range(400)] + ['1234 Main Street'] * 50
+
+    def sample(seed, mode):
+        stats = QualityStats(sample_size=5, seed=seed)
+        parse_addresses(addresses, mode=mode, workers=2, chunk_size=40, stats=stats)
+        return stats.rows, stats.bad_rows.items
+
+    first = sample(11, 'thread')
+    assert first[0] == len(addresses) and len(first[1]) == 5
+    assert sample(11, 'thread') == first
+    assert sample(11, 'process') == first
+    assert sample(12, 'thread') != first
+
+
+def test_empty_copies_get_their_own_seeds():
+    stats = QualityStats(top_k=3, sample_size=4, seed=5)
+    copies = [stats.empty_copy(i) for i in range(3)]
+    assert [copy.seed for copy in copies] == [6, 7, 8]
+    assert (copies[0].unknown_street_types.capacity, copies[0].bad_rows.size) == (3, 4)
+    assert QualityStats().empty_copy(2).seed is None
@@ -0,0 +1,79 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from addressScraper import parse_address
+from addressScraper.serve import make_server
+
+
+@pytest.fixture
+def server():
+    server = make_server(port=0, max_wait_ms=0)
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def request(server, method, path, body=None):
+    connection = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+    try:
+        data = body if body is None or isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        connection.request(method, path, body=data, headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_single_and_batch_parse(server):
+    status, body = request(server, 'POST', '/parse', {'address': '1234 Main Street'})
+    assert status == 200 and body == {'result': parse_address('1234 Main Street')}
+    addresses = ['55 W Wacker Drive Suite 201', None, '1234 Main Street']
+    status, body = request(server, 'POST', '/parse', {'addresses': addresses})
+    assert status == 200 and body == {'results': [parse_address(address) for address in addresses]}
+
+
+@pytest.mark.parametrize('body, error', [
+    (b'', 'request body is empty'),
+    (b'{not json', 'request body is not valid JSON'),
+    ([], 'expected a JSON object'),
+    ({'street': '1 Main St'}, "expected an 'address' or 'addresses' field"),
+    ({'address': 12}, "'address' must be a string"),
+    ({'addresses': '1 Main St'}, "'addresses' must be a list of strings"),
+    ({'addresses': ['1 Main St', 2]}, "'addresses' must be a list of strings"),
+])
+def test_invalid_payloads_are_rejected(server, body, error):
+    assert request(server, 'POST', '/parse', body) == (400, {'error': error})
+    assert request(server, 'GET', '/metrics')[1]['errors'] == 1
+
+
+def test_metrics_count_cache_hits(server):
+    request(server, 'POST', '/parse', {'addresses': ['1234 Main Street', '9 Oak Ln', '1234 Main Street']})
+    request(server, 'POST', '/parse', {'address': '9 Oak Ln'})
+    status, metrics = request(server, 'GET', '/metrics')
+    assert status == 200
+    assert metrics['requests'] == 2 and metrics['addresses'] == 4
+    # The repeat within the first batch is deduplicated; the second request is a cache hit
+    assert metrics['deduplicated'] == 1
+    assert metrics['cache'] == {'size': 2, 'hits': 1, 'misses': 2, 'hitRate': 0.3333}
+
+
+def test_unknown_paths_and_health(server):
+    assert request(server, 'GET', '/health') == (200, {'status': 'ok'})
+    assert request(server, 'GET', '/parse')[0] == 404
+    assert request(server, 'POST', '/metrics', {'address': '1 Main St'})[0] == 404
+
+
+def test_server_close_stops_the_coalescer():
+    server = make_server(port=0)
+    coalescer = server.coalescer
+    assert coalescer._thread.is_alive()
+    server.server_close()
+    assert not coalescer._thread.is_alive()
+    with pytest.raises(RuntimeError, match='stopped'):
+        coalescer.submit(['1234 Main Street'])
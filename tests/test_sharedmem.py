@@ -0,0 +1,39 @@
+from array import array
+
+import pytest
+
+from addressScraper import parse_addresses
+from addressScraper import sharedmem
+from addressScraper.sharedmem import decode_results, encode_results
+
+ADDRESSES = ['1234 Main Street', None, '55 W Wacker Drive Suite 201', 'Élan Ct 5', '', '1 Fifth Ave #4B'] * 3
+
+
+def test_encoded_results_round_trip():
+    results = parse_addresses(ADDRESSES)
+    reasons = [None, 'not a string'] + [None] * (len(results) - 2)
+    header, text = encode_results(results, reasons)
+    rejected = []
+    decoded = decode_results(array('I', header), text.decode('utf-8'), rejected)
+    assert decoded == results
+    assert rejected == [(1, 'not a string')]
+
+
+@pytest.mark.parametrize('overflow', [False, True])
+def test_shared_memory_mode_matches_serial(monkeypatch, overflow):
+    if overflow:
+        # No room for any text, so every chunk is re-parsed by the parent
+        monkeypatch.setattr(sharedmem, 'OUTPUT_BYTES_PER_INPUT_BYTE', 0)
+    reparsed = []
+    isolated = sharedmem.parse_isolated
+    monkeypatch.setattr(sharedmem, 'parse_isolated', lambda address, *args, **kwargs: (
+        reparsed.append(address), isolated(address, *args, **kwargs))[1])
+    serial_rejects, shared_rejects = [], []
+    serial = parse_addresses(ADDRESSES, mode='serial', rejects=serial_rejects, fingerprintBits=64)
+    shared = parse_addresses(ADDRESSES, mode='shared_memory', workers=2, chunk_size=4, rejects=shared_rejects,
+                             fingerprintBits=64)
+    assert shared == serial
+    assert shared_rejects == serial_rejects
+    assert [index for index, _, _ in shared_rejects] == [1, 4, 7, 10, 13, 16]
+    # Workers parse in their own processes; only the fallback parses here
+    assert reparsed == (ADDRESSES if overflow else [])
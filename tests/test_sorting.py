@@ -0,0 +1,29 @@
+from addressScraper import parse_address
+from addressScraper.sorting import external_sort, sort_key, sort_key_bytes
+
+
+def test_byte_keys_follow_tuple_order_for_oversize_numbers():
+    addresses = [
+        '99999999999999999999999 Main St',
+        '200 Main St',
+        '1000 Main St',
+        '18446744073709551616 Main St',
+        '200 Main St Apt 99999999999999999999999',
+        '200 Main St Apt 10',
+        '200 Main St Apt 9',
+        '1 ' + '9' * 400 + '/1 Main St',
+    ]
+    results = [parse_address(address) for address in addresses]
+    by_tuple = sorted(range(len(results)), key=lambda i: sort_key(results[i]))
+    by_bytes = sorted(range(len(results)), key=lambda i: sort_key_bytes(results[i]))
+    assert by_tuple == by_bytes
+    assert [addresses[i] for i in by_bytes[:3]] == ['200 Main St', '200 Main St Apt 9', '200 Main St Apt 10']
+
+
+def test_external_sort_survives_oversize_street_numbers(tmp_path):
+    source = tmp_path / 'input.txt'
+    source.write_text('99999999999999999999999 Main St\n1000 Main St\n200 Main St\n', encoding='utf-8')
+    output = tmp_path / 'sorted.txt'
+    external_sort(str(source), str(output), chunk_rows=2)
+    assert output.read_text(encoding='utf-8').splitlines() == [
+        '200 Main St', '1000 Main St', '99999999999999999999999 Main St']
@@ -0,0 +1,15 @@
+import io
+import json
+
+from addressScraper.stream import stream_addresses
+
+
+def test_warnings_go_to_stderr_not_the_results(capsys):
+    output = io.StringIO()
+    stream_addresses(['1234 Main Street', 'No address provided'], output, warningsEnabled=True)
+    lines = output.getvalue().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])['streetName'] == 'MAIN'
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert 'AddressScraper Warning' in captured.err
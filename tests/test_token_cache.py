@@ -0,0 +1,12 @@
+from addressScraper import clear_token_cache, parse_address, token_cache_info
+
+
+def test_plain_numbers_are_not_counted_as_lookups():
+    clear_token_cache()
+    parse_address('1234 MAIN ST')
+    info = token_cache_info()
+    assert info['digits'] == 1
+    assert info['lookups'] == 2
+    assert info['hits'] + info['misses'] == info['lookups']
+    clear_token_cache()
+    assert token_cache_info()['digits'] == 0
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from addressScraper.typeahead import _BRANCH, TypeaheadIndex, completion_key
+
+STREETS = ['MAIN ST', 'MAPLE AVE', 'N MAIN ST', 'NORMANDY RD', 'NE MARKET ST', 'OAK LN']
+
+
+@pytest.fixture(scope='module')
+def counts():
+    # Distinct counts, so the expected order is unambiguous; enough keys for a tree of several levels
+    rng = random.Random(7)
+    addresses = [f'{number} {street}' for number in range(1000, 1100) for street in STREETS]
+    return dict(zip(addresses, rng.sample(range(1, 10 * len(addresses)), len(addresses))))
+
+
+@pytest.fixture(scope='module')
+def index(counts):
+    return TypeaheadIndex.from_counts(counts)
+
+
+def brute_force(counts, prefixes, k):
+    matches = [(address, count) for address, count in counts.items() if address.startswith(prefixes)]
+    return sorted(matches, key=lambda match: -match[1])[:k]
+
+
+def test_index_has_several_tree_levels(index, counts):
+    assert len(index) == len(counts)
+    assert len(index._levels) > 2 and len(index._levels[-1]) <= _BRANCH
+
+
+@pytest.mark.parametrize('prefix', ['1', '10', '105', '1050 ', '1050 MA', '1099 N', '2'])
+@pytest.mark.parametrize('k', [1, 5, 50, 1000])
+def test_top_k_matches_brute_force(index, counts, prefix, k):
+    expected = brute_force(counts, (prefix,), k)
+    assert index.complete(prefix, k) == expected
+
+
+def test_ranked_by_count():
+    index = TypeaheadIndex.from_counts({'1 MAIN ST': 3, '1 MAPLE AVE': 10, '1 MARKET ST': 1, '2 MAIN ST': 50})
+    assert index.complete('1 MA') == [('1 MAPLE AVE', 10), ('1 MAIN ST', 3), ('1 MARKET ST', 1)]
+    assert index.complete('1 MA', k=2) == [('1 MAPLE AVE', 10), ('1 MAIN ST', 3)]
+    assert index.complete('1 MA', k=0) == [] and index.complete(None) == []
+
+
+def test_keys_and_queries_are_abbreviated():
+    index = TypeaheadIndex.from_counts({'1234 North Main Street': 2, '1234 N MAIN ST': 3, '1234 Normandy Road': 1})
+    assert completion_key('1234 North Main Street') == '1234 N MAIN ST'
+    assert index.complete('1234 North Ma') == [('1234 N MAIN ST', 5)]
+    assert index.complete('1234 NOR') == [('1234 N MAIN ST', 5), ('1234 NORMANDY RD', 1)]
+    assert index.complete('1234 NORTH ') == [('1234 N MAIN ST', 5)]
+
+
+@pytest.mark.parametrize('typed', ['1234 MAIN STR', '1234 MAIN STRE', '1234 MAIN STREET', '1234 MAIN ST'])
+def test_partial_street_types_complete_to_their_abbreviation(typed):
+    index = TypeaheadIndex.from_counts({'1234 MAIN ST': 4, '1234 MAIN ST APT 2': 1, '1234 MAIN STRAVENUE': 1})
+    assert index.complete(typed)[0] == ('1234 MAIN ST', 4)
+
+
+def test_partial_directionals_complete_to_their_abbreviation():
+    index = TypeaheadIndex.from_counts({'1234 N MAIN ST': 4, '1234 NE OAK AVE': 2, '1234 S ELM ST': 1})
+    assert index.complete('1234 NOR') == [('1234 N MAIN ST', 4), ('1234 NE OAK AVE', 2)]
+    assert index.complete('1234 SOUTH') == [('1234 S ELM ST', 1)]
+
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_save_and_load(tmp_path, index, counts, use_mmap):
+    path = str(tmp_path / 'addresses.typeahead')
+    index.save(path)
+    with TypeaheadIndex.load(path, use_mmap=use_mmap) as loaded:
+        assert len(loaded) == len(index) and loaded.nbytes() == index.nbytes()
+        for prefix in ['1', '1050 MA', '1099 N', '1234 MAIN STR', '2']:
+            assert loaded.complete(prefix, 20) == index.complete(prefix, 20)
+    # Closing releases the map of a mapped index; a read index keeps its copy
+    assert (loaded.complete('1') == []) == use_mmap
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.typeahead'
+    path.write_bytes(b'not a typeahead index')
+    with pytest.raises(ValueError, match='not a typeahead index'):
+        TypeaheadIndex.load(str(path))